@@ -0,0 +1,207 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Battery Dispatch
+Hourly self-consumption / TOU arbitrage dispatch for many PV + storage systems at once
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_STRATEGIES = ('self_consumption', 'tou_arbitrage')
+DISPATCH_CHUNK_SIZE = 1024  # systems advanced together through the 8760 hours
+
+@dataclass(frozen=True)
+class BatterySpec:
+    """Usable energy and continuous power of one battery product"""
+    name: str
+    capacity_kwh: float
+    power_kw: float
+    round_trip_efficiency: float  # 0-1, AC to AC
+    reserve: float = 0.0          # fraction of capacity held back (backup reserve)
+
+# Manufacturer datasheet figures
+BATTERY_PRESETS: Dict[str, BatterySpec] = {
+    'tesla_powerwall_2': BatterySpec('Tesla Powerwall 2', capacity_kwh=13.5, power_kw=5.0,
+                                     round_trip_efficiency=0.90),
+    'enphase_iq_battery_10': BatterySpec('Enphase IQ Battery 10', capacity_kwh=10.08, power_kw=3.84,
+                                         round_trip_efficiency=0.89),
+    'enphase_iq_battery_5p': BatterySpec('Enphase IQ Battery 5P', capacity_kwh=5.0, power_kw=3.84,
+                                         round_trip_efficiency=0.90),
+}
+
+@dataclass
+class DispatchResults:
+    """Annual totals per system (kWh), plus hourly (systems, hours) float32 series when kept"""
+    grid_import: np.ndarray
+    grid_export: np.ndarray
+    battery_charge: np.ndarray     # energy into the battery (AC side)
+    battery_discharge: np.ndarray  # energy out of the battery (AC side)
+    self_consumption: np.ndarray   # fraction of PV used on site (directly or via the battery)
+    self_sufficiency: np.ndarray   # fraction of load not imported
+    equivalent_cycles: np.ndarray  # discharge / usable capacity
+    hourly: Optional[Dict[str, np.ndarray]] = None  # 'grid_import', 'grid_export', 'soc'
+
+def battery_columns(batteries: Sequence[Union[BatterySpec, str]]) -> Dict[str, np.ndarray]:
+    """Per-system parameter columns from specs or preset names (a stack of N units: 'name*N')"""
+    rows = []
+    for battery in batteries:
+        units = 1
+        if isinstance(battery, str):
+            name, _, count = battery.partition('*')
+            battery = BATTERY_PRESETS[name]
+            units = int(count) if count else 1
+        rows.append((battery.capacity_kwh * units, battery.power_kw * units,
+                     battery.round_trip_efficiency, battery.reserve))
+    table = np.array(rows, dtype=np.float64).reshape(-1, 4)
+    return {
+        'capacity_kwh': table[:, 0],
+        'power_kw': table[:, 1],
+        'round_trip_efficiency': table[:, 2],
+        'reserve': table[:, 3]
+    }
+
+def _rows(values, n: int, hours: int) -> np.ndarray:
+    """(hours,) or (systems, hours) series as (systems, hours)"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.broadcast_to(values.reshape(-1, hours) if values.ndim > 1 else values[None, :], (n, hours))
+
+def simulate_dispatch(pv,
+                      load,
+                      capacity_kwh,
+                      power_kw,
+                      round_trip_efficiency=0.9,
+                      reserve=0.0,
+                      strategy: str = 'self_consumption',
+                      grid_charge_hours: Optional[np.ndarray] = None,
+                      discharge_hours: Optional[np.ndarray] = None,
+                      initial_soc: float = 0.0,
+                      chunk_size: int = DISPATCH_CHUNK_SIZE,
+                      keep_hourly: bool = False) -> DispatchResults:
+    """
+    Hourly battery dispatch for many systems
+
+    ``pv`` and ``load`` are AC kW per hour as (hours,) or (systems, hours);
+    battery parameters are scalars or (systems,) arrays (see battery_columns),
+    so one generation/load pair can be swept across many battery sizes.
+
+    'self_consumption' charges from PV surplus and discharges to cover load.
+    'tou_arbitrage' additionally charges from the grid in ``grid_charge_hours``
+    and only discharges in ``discharge_hours`` (boolean (hours,) masks, e.g.
+    off-peak and peak from a compiled tariff; by default every hour that is
+    not a grid-charge hour). Battery energy is never
+    exported. Efficiency losses are split evenly between charge and discharge.
+
+    Hours are stepped in sequence (state of charge carries over) but every
+    system of a chunk advances together as one state vector; ``chunk_size``
+    bounds the working set.
+    """
+    if strategy not in DISPATCH_STRATEGIES:
+        raise ValueError(f"Unknown dispatch strategy '{strategy}', expected one of {DISPATCH_STRATEGIES}")
+    if strategy == 'tou_arbitrage' and grid_charge_hours is None:
+        raise ValueError("tou_arbitrage needs grid_charge_hours")
+
+    pv = np.asarray(pv, dtype=np.float64)
+    load = np.asarray(load, dtype=np.float64)
+    hours = pv.shape[-1]
+    params = {
+        'capacity_kwh': np.asarray(capacity_kwh, dtype=np.float64).reshape(-1),
+        'power_kw': np.asarray(power_kw, dtype=np.float64).reshape(-1),
+        'round_trip_efficiency': np.asarray(round_trip_efficiency, dtype=np.float64).reshape(-1),
+        'reserve': np.asarray(reserve, dtype=np.float64).reshape(-1)
+    }
+    n = max([len(v) for v in params.values()]
+            + [pv.shape[0] if pv.ndim > 1 else 1, load.shape[0] if load.ndim > 1 else 1])
+    params = {name: np.broadcast_to(value, (n,)) for name, value in params.items()}
+    pv, load = _rows(pv, n, hours), _rows(load, n, hours)
+
+    grid_charge = np.zeros(hours, dtype=bool) if grid_charge_hours is None else np.asarray(grid_charge_hours, dtype=bool)
+    if strategy == 'self_consumption':
+        grid_charge = np.zeros(hours, dtype=bool)
+    # Discharging in a grid-charge hour would just cycle grid energy through the losses
+    discharge_ok = ~grid_charge if discharge_hours is None else np.asarray(discharge_hours, dtype=bool)
+    any_grid_charge = bool(grid_charge.any())
+
+    totals = {name: np.empty(n) for name in ('grid_import', 'grid_export', 'battery_charge', 'battery_discharge')}
+    hourly = {name: np.empty((n, hours), dtype=np.float32) for name in ('grid_import', 'grid_export', 'soc')} if keep_hourly else None
+
+    for start in range(0, n, chunk_size):
+        rows = slice(start, min(start + chunk_size, n))
+        # (hours, systems) so each hour is one contiguous vector
+        pv_t = np.ascontiguousarray(pv[rows].T)
+        load_t = np.ascontiguousarray(load[rows].T)
+
+        capacity = params['capacity_kwh'][rows]
+        power = params['power_kw'][rows]
+        eta = np.sqrt(params['round_trip_efficiency'][rows])
+        floor = capacity * params['reserve'][rows]
+        soc = np.maximum(capacity * initial_soc, floor)
+
+        imports = np.zeros_like(capacity)
+        exports = np.zeros_like(capacity)
+        charged = np.zeros_like(capacity)
+        discharged = np.zeros_like(capacity)
+        if keep_hourly:
+            import_t = np.empty((hours, len(capacity)), dtype=np.float32)
+            export_t = np.empty_like(import_t)
+            soc_t = np.empty_like(import_t)
+
+        for h in range(hours):
+            net = pv_t[h] - load_t[h]
+            surplus = np.maximum(net, 0.0)
+            deficit = np.maximum(-net, 0.0)
+
+            charge = np.minimum(np.minimum(surplus, power), (capacity - soc) / eta)
+            soc = soc + charge * eta
+            from_grid = 0.0
+            if any_grid_charge and grid_charge[h]:
+                from_grid = np.minimum(power - charge, (capacity - soc) / eta)
+                soc = soc + from_grid * eta
+                charge = charge + from_grid
+
+            if discharge_ok[h]:
+                discharge = np.minimum(np.minimum(deficit, power), (soc - floor) * eta)
+                soc = soc - discharge / eta
+            else:
+                discharge = 0.0
+
+            hour_import = deficit - discharge + from_grid
+            hour_export = surplus - (charge - from_grid)
+            imports += hour_import
+            exports += hour_export
+            charged += charge
+            discharged += discharge
+            if keep_hourly:
+                import_t[h] = hour_import
+                export_t[h] = hour_export
+                soc_t[h] = soc
+
+        totals['grid_import'][rows] = imports
+        totals['grid_export'][rows] = exports
+        totals['battery_charge'][rows] = charged
+        totals['battery_discharge'][rows] = discharged
+        if keep_hourly:
+            hourly['grid_import'][rows] = import_t.T
+            hourly['grid_export'][rows] = export_t.T
+            hourly['soc'][rows] = soc_t.T
+
+    pv_total = pv.sum(axis=1)
+    load_total = load.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        self_consumption = np.where(pv_total > 0, 1 - totals['grid_export'] / pv_total, 0.0)
+        self_sufficiency = np.where(load_total > 0, 1 - totals['grid_import'] / load_total, 0.0)
+        cycles = np.where(params['capacity_kwh'] > 0, totals['battery_discharge'] / params['capacity_kwh'], 0.0)
+
+    return DispatchResults(
+        grid_import=totals['grid_import'],
+        grid_export=totals['grid_export'],
+        battery_charge=totals['battery_charge'],
+        battery_discharge=totals['battery_discharge'],
+        self_consumption=self_consumption,
+        self_sufficiency=np.clip(self_sufficiency, None, 1.0),
+        equivalent_cycles=cycles,
+        hourly=hourly
+    )
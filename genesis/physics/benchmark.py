@@ -0,0 +1,224 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Physics Benchmarks
+Throughput and latency benchmarks for the physics engine with JSON regression baselines
+
+Usage:
+    python -m genesis.physics.benchmark --save-baseline physics_baseline.json
+    python -m genesis.physics.benchmark --baseline physics_baseline.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZES = (1, 100, 1000, 10000)
+DEFAULT_THRESHOLD = 0.2  # fail when throughput drops by more than 20%
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Cold-start scripts, each run in a fresh interpreter
+STARTUP_SCRIPTS = {
+    'startup_import': "import genesis.physics.solar_engine",
+    'startup_first_simulation': (
+        "import asyncio\n"
+        "from genesis.physics.benchmark import _reference_config\n"
+        "from genesis.physics.solar_engine import get_physics_engine\n"
+        "async def main():\n"
+        "    engine = await get_physics_engine()\n"
+        "    await engine.run_solar_simulation(_reference_config())\n"
+        "asyncio.run(main())\n"
+    )
+}
+
+def _reference_config():
+    from .solar_engine import SolarSystemConfig
+
+    return SolarSystemConfig(
+        system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+        ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0
+    )
+
+def _configs(count: int, offset: int = 0) -> List[Any]:
+    """Distinct configs so no cache layer can short-circuit the measurement"""
+    base = _reference_config()
+    return [replace(base, tilt=10.0 + ((offset + i) % 400) * 0.1, system_capacity=3.0 + (i % 50) * 0.5)
+            for i in range(count)]
+
+async def _measure(fn: Callable[[int], Awaitable[Any]],
+                   items_per_call: int,
+                   min_iterations: int = 5,
+                   min_seconds: float = 0.5) -> Dict[str, float]:
+    """Call fn(i) repeatedly; report items/second and per-call latency percentiles"""
+    await fn(-1)  # warm-up
+    latencies = []
+    started = time.perf_counter()
+    i = 0
+    while i < min_iterations or time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        await fn(i)
+        latencies.append(time.perf_counter() - t0)
+        i += 1
+    latencies = np.array(latencies)
+    return {
+        'throughput': items_per_call * len(latencies) / latencies.sum(),
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'iterations': len(latencies),
+        'batch_size': items_per_call
+    }
+
+def measure_startup(repeats: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Wall time of a fresh interpreter importing the engine, and running its first
+    simulation (interpreter start-up included). Throughput is starts/second.
+    """
+    results = {}
+    for name, script in STARTUP_SCRIPTS.items():
+        timings = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, '-c', script], cwd=PROJECT_ROOT, check=True, capture_output=True)
+            timings.append(time.perf_counter() - t0)
+        timings = np.array(timings)
+        results[name] = {
+            'throughput': float(len(timings) / timings.sum()),
+            'p50_ms': float(np.percentile(timings, 50) * 1000),
+            'p99_ms': float(np.percentile(timings, 99) * 1000),
+            'iterations': len(timings),
+            'batch_size': 1
+        }
+    return results
+
+async def run_benchmarks(batch_sizes=DEFAULT_BATCH_SIZES, min_seconds: float = 0.5) -> Dict[str, Any]:
+    """Run every benchmark and return a baseline-shaped report"""
+    from .financial import DEFAULT_FINANCIAL_PARAMS, evaluate_cash_flows
+    from .solar_engine import PhysicsEngine
+
+    results: Dict[str, Dict[str, float]] = measure_startup()
+    skipped: List[str] = []
+
+    engine = PhysicsEngine()
+
+    async def fallback_single(i):
+        await engine._fallback_simulation(_configs(1, offset=i)[0])
+    results['fallback_simulation'] = await _measure(fallback_single, 1, min_seconds=min_seconds)
+
+    for size in batch_sizes:
+        configs = _configs(size)
+
+        async def batch(i, configs=configs):
+            await engine.run_batch_simulation(configs)
+        results[f'batch_simulation[{size}]'] = await _measure(batch, size, min_iterations=3, min_seconds=min_seconds)
+
+    if engine.pysam_available:
+        async def pysam_single(i):
+            # The energy and financial stages run_solar_simulation uses, minus its caches
+            results, gen, _ = engine._simulate_pysam_energy(_configs(1, offset=i)[0])
+            engine._run_financial_model(results, DEFAULT_FINANCIAL_PARAMS, gen)
+        results['pysam_simulation'] = await _measure(pysam_single, 1, min_iterations=3, min_seconds=min_seconds)
+    else:
+        skipped.append('pysam_simulation')
+
+    ranges = {'tilt': (10.0, 40.0), 'losses': (8.0, 20.0), 'dc_ac_ratio': (1.0, 1.5), 'inv_eff': (94.0, 98.0)}
+
+    async def sensitivity(i):
+        engine.generation_cache.clear()
+        await engine.run_sensitivity_analysis(_reference_config(), ranges)
+    results['sensitivity_analysis'] = await _measure(sensitivity, 1, min_iterations=3, min_seconds=min_seconds)
+
+    async def monte_carlo(i):
+        await engine.run_monte_carlo(_reference_config(), samples=10_000, seed=i + 1)
+    results['monte_carlo[10000]'] = await _measure(monte_carlo, 10_000, min_seconds=min_seconds)
+
+    for size in batch_sizes:
+        energy = np.linspace(5000, 15000, size)
+        capacity = np.linspace(3, 10, size)
+        rates = np.linspace(0.1, 0.4, size)
+
+        async def finance(i, energy=energy, capacity=capacity, rates=rates):
+            evaluate_cash_flows(energy, capacity, {'electricity_rate': rates})
+        results[f'financial_analysis[{size}]'] = await _measure(finance, size, min_seconds=min_seconds)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'pysam': engine.pysam_available
+        },
+        'results': results,
+        'skipped': skipped
+    }
+
+def compare_to_baseline(report: Dict[str, Any],
+                        baseline: Dict[str, Any],
+                        threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Names of benchmarks whose throughput fell more than ``threshold`` below baseline"""
+    regressions = []
+    for name, reference in baseline.get('results', {}).items():
+        current = report['results'].get(name)
+        if current is None:
+            continue
+        floor = reference['throughput'] * (1 - threshold)
+        if current['throughput'] < floor:
+            regressions.append(
+                f"{name}: {current['throughput']:.1f}/s vs baseline {reference['throughput']:.1f}/s "
+                f"(-{(1 - current['throughput'] / reference['throughput']) * 100:.0f}%)"
+            )
+    return regressions
+
+def _print_report(report: Dict[str, Any]):
+    print(f"{'benchmark':<32}{'items/s':>14}{'p50 ms':>12}{'p99 ms':>12}")
+    for name, r in report['results'].items():
+        print(f"{name:<32}{r['throughput']:>14.1f}{r['p50_ms']:>12.3f}{r['p99_ms']:>12.3f}")
+    for name in report['skipped']:
+        print(f"{name:<32}{'skipped':>14}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the GENESIS physics engine")
+    parser.add_argument('--baseline', help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', help="Write this run as a baseline JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional throughput drop before failing")
+    parser.add_argument('--batch-sizes', default=','.join(str(s) for s in DEFAULT_BATCH_SIZES))
+    parser.add_argument('--min-seconds', type=float, default=0.5, help="Minimum time per benchmark")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    batch_sizes = [int(s) for s in args.batch_sizes.split(',') if s]
+    report = asyncio.run(run_benchmarks(batch_sizes, min_seconds=args.min_seconds))
+    _print_report(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print("Throughput regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} of baseline")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
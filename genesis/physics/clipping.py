@@ -0,0 +1,71 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Inverter Clipping Sweep
+Energy and clipping loss across many DC/AC ratios from one hourly DC profile
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .financial import FinancialResults
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DC_AC_RATIOS = np.round(np.arange(0.8, 2.0001, 0.05), 2)
+
+@dataclass
+class ClippingSweep:
+    """Per-ratio results, shape (ratios,)"""
+    dc_ac_ratio: np.ndarray
+    ac_rating: np.ndarray          # kW AC
+    annual_energy: np.ndarray      # kWh AC after clipping
+    clipped_energy: np.ndarray     # kWh lost to clipping
+    clipping_loss: np.ndarray      # fraction of unclipped AC energy
+    clipped_hours: np.ndarray      # hours at the AC rating
+    energy_per_kw_ac: np.ndarray   # kWh per kW of inverter rating
+    finance: Optional[FinancialResults] = None  # per-ratio cash-flow metrics when requested
+
+    def optimal_ratio(self, max_clipping_loss: float = 0.02) -> float:
+        """Highest swept ratio whose clipping loss stays within ``max_clipping_loss``"""
+        allowed = self.dc_ac_ratio[self.clipping_loss <= max_clipping_loss]
+        return float(allowed.max()) if len(allowed) else float(self.dc_ac_ratio.min())
+
+def clipping_sweep(dc_hourly: np.ndarray,
+                   system_capacity: float,
+                   dc_ac_ratios=DEFAULT_DC_AC_RATIOS,
+                   inv_eff: float = 96.0) -> ClippingSweep:
+    """
+    Clipped AC energy for every ratio in ``dc_ac_ratios`` from one hourly DC
+    profile (kW after system losses)
+
+    The profile is sorted once; each ratio's AC rating is then broadcast
+    against it with searchsorted, so an AC total is a prefix-sum lookup
+    (hours below the rating pass through, the rest clip) and the whole curve
+    costs O(hours log hours + ratios log hours) - no per-ratio simulation.
+    """
+    ratios = np.asarray(dc_ac_ratios, dtype=np.float64).reshape(-1)
+    ac = np.asarray(dc_hourly, dtype=np.float64) * (inv_eff / 100)
+    ac_sorted = np.sort(ac[ac > 0])
+    prefix = np.concatenate([[0.0], np.cumsum(ac_sorted)])
+    unclipped = prefix[-1]
+
+    rating = system_capacity / ratios
+    below = np.searchsorted(ac_sorted, rating, side='right')
+    clipped_hours = len(ac_sorted) - below
+    energy = prefix[below] + rating * clipped_hours
+    clipped = unclipped - energy
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        loss = np.where(unclipped > 0, clipped / unclipped, 0.0)
+        per_kw = np.where(rating > 0, energy / rating, 0.0)
+    return ClippingSweep(
+        dc_ac_ratio=ratios,
+        ac_rating=rating,
+        annual_energy=energy,
+        clipped_energy=clipped,
+        clipping_loss=loss,
+        clipped_hours=clipped_hours,
+        energy_per_kw_ac=per_kw
+    )
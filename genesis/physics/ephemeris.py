@@ -0,0 +1,131 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Solar Ephemeris Cache
+Hourly sun-position arrays per (lat, lon, tz, year), memoized as float32 in memory and on disk
+"""
+
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .result_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+EPHEMERIS_GRID = 0.01  # degrees; lat/lon are snapped to this grid before lookup
+EPHEMERIS_FIELDS = ('zenith', 'azimuth', 'declination', 'dni_extra')
+
+EphemerisKey = Tuple[int, int, float, int, int]
+
+class EphemerisCache:
+    """
+    Memoized hourly solar position for a location's year
+
+    Positions depend only on (lat, lon, tz, year) for a sequential hourly year,
+    so every simulation and sweep at one site shares one computation. Lat/lon
+    are snapped to ``grid`` degrees (positions are computed at the snapped
+    point) so nearby requests share an entry. Arrays are stored read-only as
+    float32, in an LRU of ``max_entries`` locations and, with ``disk_dir``, as
+    .npz files that survive restarts.
+    """
+
+    def __init__(self,
+                 max_entries: int = 64,
+                 grid: float = EPHEMERIS_GRID,
+                 disk_dir: Optional[str] = None):
+        self.grid = grid
+        self.memory = LRUCache(max_entries)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {'computed': 0, 'disk_hits': 0, 'disk_writes': 0}
+
+    def key(self, lat: float, lon: float, tz: float, year: Optional[int], n_hours: int) -> EphemerisKey:
+        return (int(round(lat / self.grid)), int(round(lon / self.grid)),
+                round(float(tz), 2), int(year or 0), int(n_hours))
+
+    def get(self,
+            lat: float, lon: float, tz: float, year: Optional[int], n_hours: int,
+            compute: Callable[[float, float, float], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """
+        Cached position arrays; ``compute(lat, lon, tz)`` is called with the
+        snapped location on a miss and returns arrays keyed by EPHEMERIS_FIELDS
+        """
+        key = self.key(lat, lon, tz, year, n_hours)
+        arrays = self.memory.get(key)
+        if arrays is not None:
+            return arrays
+
+        arrays = self._read_disk(key)
+        if arrays is None:
+            computed = compute(key[0] * self.grid, key[1] * self.grid, key[2])
+            arrays = {}
+            for name in EPHEMERIS_FIELDS:
+                array = np.ascontiguousarray(computed[name], dtype=np.float32)
+                array.flags.writeable = False
+                arrays[name] = array
+            self.stats['computed'] += 1
+            self._write_disk(key, arrays)
+
+        self.memory.put(key, arrays)
+        return arrays
+
+    # ---- disk tier ------------------------------------------------------
+
+    def _path(self, key: EphemerisKey) -> Path:
+        lat, lon, tz, year, n_hours = key
+        return self.disk_dir / f"ephemeris_{self.grid:g}_{lat}_{lon}_{tz:g}_{year}_{n_hours}.npz"
+
+    def _read_disk(self, key: EphemerisKey) -> Optional[Dict[str, np.ndarray]]:
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in EPHEMERIS_FIELDS}
+        except Exception as e:
+            logger.warning(f"Discarding unreadable ephemeris {path}: {e}")
+            return None
+        for array in arrays.values():
+            array.flags.writeable = False
+        self.stats['disk_hits'] += 1
+        return arrays
+
+    def _write_disk(self, key: EphemerisKey, arrays: Dict[str, np.ndarray]):
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            tmp_path.replace(path)
+            self.stats['disk_writes'] += 1
+        except Exception as e:
+            logger.warning(f"Could not persist ephemeris {path}: {e}")
+
+    def clear(self, disk: bool = False):
+        self.memory.clear()
+        if disk and self.disk_dir:
+            for path in self.disk_dir.glob('ephemeris_*.npz'):
+                path.unlink()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.memory.stats, **self.stats, 'entries': len(self.memory)}
+
+_ephemeris_cache = EphemerisCache()
+
+def ephemeris_cache() -> EphemerisCache:
+    """The process-wide ephemeris cache"""
+    return _ephemeris_cache
+
+def configure_ephemeris_cache(max_entries: int = 64,
+                              grid: float = EPHEMERIS_GRID,
+                              disk_dir: Optional[str] = None) -> EphemerisCache:
+    """Replace the process-wide ephemeris cache (e.g. to add a disk tier or change the grid)"""
+    global _ephemeris_cache
+    _ephemeris_cache = EphemerisCache(max_entries=max_entries, grid=grid, disk_dir=disk_dir)
+    return _ephemeris_cache
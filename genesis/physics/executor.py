@@ -0,0 +1,139 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Simulation Executor
+Process pool for running blocking PySAM simulations off the event loop
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Per-process engine, built once by the worker initializer
+_worker_engine = None
+
+def _warm_worker():
+    """Worker initializer: import PySAM once and keep a ready engine for this process"""
+    global _worker_engine
+    if _worker_engine is not None:
+        return
+
+    from .solar_engine import PhysicsEngine
+    _worker_engine = PhysicsEngine()
+    _worker_engine.warm_up()
+    if _worker_engine.fallback_mode:
+        logger.warning(f"PySAM not available in worker {os.getpid()}")
+
+def _worker_ready() -> int:
+    """No-op task used to force worker start-up during warm-up"""
+    _warm_worker()
+    return os.getpid()
+
+def run_pysam_energy_in_worker(config, weather=None, shading=None):
+    """Energy stage only: (results, hourly AC generation, hourly unclipped DC)"""
+    _warm_worker()
+    if _worker_engine.fallback_mode:
+        raise RuntimeError("PySAM not available in worker process")
+    return _worker_engine._simulate_pysam_energy(config, weather, shading)
+
+def run_pysam_financial_in_worker(results, financial_params, gen):
+    """Financial stage only, against a previously computed generation profile"""
+    _warm_worker()
+    return _worker_engine._run_financial_model(results, financial_params, gen)
+
+class SimulationExecutor:
+    """
+    Bounded process pool for CPU-heavy simulations
+
+    At most ``max_in_flight`` tasks are handed to the pool at once; further
+    callers wait on the event loop without blocking it. Cancelling an awaiting
+    caller drops its task if it has not started yet; a task already running in
+    a worker finishes and its result is discarded.
+    """
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 max_in_flight: Optional[int] = None,
+                 mp_context=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.max_workers * 2
+        self.mp_context = mp_context
+
+        self._pool = None
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._pending: Set[Future] = set()
+
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0
+        }
+
+    def start(self):
+        """Create the worker pool (idempotent)"""
+        if self._pool is None:
+            # multiprocessing is only imported once a pool is actually needed
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_warm_worker
+            )
+            logger.info(f"Simulation executor started with {self.max_workers} workers")
+
+    async def warm_up(self) -> int:
+        """
+        Start the workers now so the first simulations don't pay PySAM import cost.
+        Returns the number of distinct worker processes that answered.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*[
+            loop.run_in_executor(self._pool, _worker_ready) for _ in range(self.max_workers)
+        ])
+        return len(set(pids))
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run ``fn(*args)`` in a worker once an in-flight slot is free"""
+        self.start()
+        async with self._slots:
+            future = self._pool.submit(fn, *args)
+            self._pending.add(future)
+            self.stats['submitted'] += 1
+            try:
+                result = await asyncio.wrap_future(future)
+                self.stats['completed'] += 1
+                return result
+            except asyncio.CancelledError:
+                future.cancel()
+                self.stats['cancelled'] += 1
+                raise
+            except Exception:
+                self.stats['failed'] += 1
+                raise
+            finally:
+                self._pending.discard(future)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def cancel_pending(self) -> int:
+        """Cancel every task that has not started running; returns how many were cancelled"""
+        cancelled = sum(1 for future in list(self._pending) if future.cancel())
+        if cancelled:
+            logger.info(f"Cancelled {cancelled} pending simulations")
+        return cancelled
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True):
+        """Stop the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=cancel_pending)
+            self._pool = None
+            logger.info("Simulation executor shut down")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, 'in_flight': self.in_flight, 'max_in_flight': self.max_in_flight}
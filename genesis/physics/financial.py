@@ -0,0 +1,263 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Financial Engine
+Vectorized cash-flow model: NPV, IRR, real LCOE and payback for many scenarios at once
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Defaults mirror the PySAM Cashloan inputs set in PhysicsEngine._run_financial_model
+DEFAULT_FINANCIAL_PARAMS: Dict[str, Any] = {
+    'analysis_period': 25,          # years
+    'debt_fraction': 60.0,          # % of installed cost
+    'federal_tax_rate': 21.0,       # %
+    'state_tax_rate': 0.0,          # %
+    'real_discount_rate': 6.4,      # %
+    'inflation_rate': 2.5,          # %
+    'installed_cost_per_watt': 2.5, # $/W DC
+    'electricity_rate': 0.12,       # $/kWh in year one
+    'rate_escalation': None,        # %/yr, defaults to inflation_rate
+    'loan_rate': 7.0,               # % nominal
+    'loan_term': 20,                # years
+    'om_cost_per_kw': 0.0,          # $/kW-yr in year one
+    'degradation': 0.5,             # %/yr module output
+    'availability': 100.0,          # % of production delivered every year
+    'inverter_lifetime': 0,         # years between inverter replacements (0 = never)
+    'inverter_degradation': 0.0,    # %/yr inverter efficiency since last replacement
+    'inverter_replacement_downtime': 0.0  # days lost in each replacement year
+}
+
+TAX_RATE_PARAMS = ('federal_tax_rate', 'state_tax_rate')
+IRR_BRACKET = (-0.99, 1.0)
+IRR_ITERATIONS = 100
+IRR_TOLERANCE = 1e-10
+DAYS_PER_YEAR = 365.0
+
+@dataclass
+class FinancialResults:
+    """Per-scenario financial metrics, shape (scenarios,)"""
+    npv: np.ndarray                 # $ at the nominal discount rate
+    irr: np.ndarray                 # % on equity cash flows (NaN when undefined)
+    lcoe_real: np.ndarray           # $/kWh
+    lcoe_nominal: np.ndarray        # $/kWh
+    payback_period: np.ndarray      # years, simple (inf if never)
+    discounted_payback: np.ndarray  # years (inf if never)
+    cash_flows: np.ndarray          # (scenarios, years + 1) after-tax equity cash flows
+
+def scenario_column(value, n: int) -> np.ndarray:
+    """Scalar or (scenarios,) parameter as a (scenarios, 1) column"""
+    return np.broadcast_to(np.asarray(value, dtype=np.float64).reshape(-1, 1), (n, 1))
+
+def _schedule(value, n: int, years: int) -> np.ndarray:
+    """
+    Tax-rate style parameter as (scenarios, years): scalars are constant,
+    1-D sequences are per-year schedules (PySAM style), 2-D are per scenario
+    """
+    value = np.asarray(value, dtype=np.float64)
+    if value.ndim == 0:
+        return np.full((n, years), float(value))
+    if value.ndim == 1:
+        schedule = np.resize(value, years) if len(value) < years else value[:years]
+        return np.broadcast_to(schedule[None, :], (n, years))
+    return np.broadcast_to(value[:, :years], (n, years))
+
+def scenario_count(params: Dict[str, Any]) -> int:
+    """Number of scenarios implied by the (scenarios,) arrays in params"""
+    n = 1
+    for name, value in params.items():
+        if name in TAX_RATE_PARAMS or value is None:
+            continue
+        size = np.size(value)
+        if size > 1:
+            if n > 1 and size != n:
+                raise ValueError(f"Parameter '{name}' has {size} scenarios, expected {n}")
+            n = size
+    return n
+
+def _payback(cash_flows: np.ndarray) -> np.ndarray:
+    """Years until cumulative cash flow turns non-negative, interpolated within the year"""
+    cumulative = np.cumsum(cash_flows, axis=1)
+    recovered = cumulative >= 0
+    first = np.argmax(recovered, axis=1)
+    never = ~recovered.any(axis=1)
+
+    rows = np.arange(len(cash_flows))
+    prev = cumulative[rows, np.maximum(first - 1, 0)]
+    flow = cash_flows[rows, first]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(flow > 0, -prev / flow, 0.0)
+    years = np.where(first == 0, 0.0, first - 1 + np.clip(fraction, 0, 1))
+    return np.where(never, np.inf, years)
+
+def lifetime_factors(params: Dict[str, Any], n: int, years: int) -> np.ndarray:
+    """
+    (scenarios, years) multiplier on year-one production
+
+    Module output falls by ``degradation`` %/yr. Inverter efficiency falls by
+    ``inverter_degradation`` %/yr since the inverter was installed; every
+    ``inverter_lifetime`` years (0 = never) it is replaced at the start of the
+    year, resetting that drift and losing ``inverter_replacement_downtime``
+    days of the replacement year. ``availability`` (%) scales every year.
+    """
+    year_index = np.arange(years)[None, :]  # years since commissioning
+
+    degradation = scenario_column(params['degradation'], n) / 100
+    module = (1 - degradation) ** year_index
+
+    lifetime = scenario_column(params['inverter_lifetime'], n)
+    replaces = lifetime > 0
+    safe_lifetime = np.where(replaces, lifetime, 1.0)
+    age = np.where(replaces, year_index % safe_lifetime, year_index)
+    replaced = replaces & (year_index >= safe_lifetime) & (age == 0)
+    downtime = scenario_column(params['inverter_replacement_downtime'], n) / DAYS_PER_YEAR
+    inverter = (1 - scenario_column(params['inverter_degradation'], n) / 100) ** age
+    inverter = inverter * np.where(replaced, 1 - np.clip(downtime, 0.0, 1.0), 1.0)
+
+    availability = scenario_column(params['availability'], n) / 100
+    return module * inverter * availability
+
+def irr(cash_flows: np.ndarray) -> np.ndarray:
+    """
+    Vectorized IRR: Newton steps safeguarded by a shrinking sign-change bracket
+    (bisection whenever Newton leaves it or stalls); NaN where there is no sign change
+    """
+    years = np.arange(cash_flows.shape[1])[None, :]
+
+    def npv_at(flows, rate):
+        return (flows * np.exp(-np.log1p(rate)[:, None] * years)).sum(axis=1)
+
+    n = len(cash_flows)
+    lo = np.full(n, IRR_BRACKET[0])
+    hi = np.full(n, IRR_BRACKET[1])
+    f_lo = npv_at(cash_flows, lo)
+    valid = np.sign(f_lo) != np.sign(npv_at(cash_flows, hi))
+
+    rate = np.full(n, 0.1)
+    last_step = hi - lo
+    # Only rows that haven't converged are iterated
+    active = np.nonzero(valid)[0]
+    for _ in range(IRR_ITERATIONS):
+        if not len(active):
+            break
+        flows, r = cash_flows[active], rate[active]
+        discount = np.exp(-np.log1p(r)[:, None] * years)
+        f = (flows * discount).sum(axis=1)
+        df = -(flows * years * discount).sum(axis=1) / (1 + r)
+
+        # Keep [lo, hi] bracketing the root
+        same = np.sign(f) == np.sign(f_lo[active])
+        lo[active] = np.where(same, r, lo[active])
+        f_lo[active] = np.where(same, f, f_lo[active])
+        hi[active] = np.where(same, hi[active], r)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = r - f / df
+            # Bisect when Newton leaves the bracket or isn't at least halving the step (rtsafe)
+            fast = np.abs(2 * f) <= np.abs(last_step[active] * df)
+        use_newton = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active]) & fast
+        new_rate = np.where(use_newton, newton, (lo[active] + hi[active]) / 2)
+        last_step[active] = new_rate - r
+        rate[active] = new_rate
+        active = active[np.abs(new_rate - r) >= IRR_TOLERANCE]
+
+    return np.where(valid, rate * 100, np.nan)
+
+def evaluate_cash_flows(annual_energy,
+                        system_capacity,
+                        financial_params: Optional[Dict[str, Any]] = None) -> FinancialResults:
+    """
+    Cash-flow analysis for every scenario in one pass
+
+    ``annual_energy`` is year-one kWh as (scenarios,) — projected with
+    lifetime_factors (degradation, inverter replacement,
+    availability) — or explicit production as (scenarios, years) or
+    lifetime_production's (scenarios, years, 12). ``system_capacity`` is kW DC. Every financial_params entry may be a
+    scalar or a (scenarios,) array; tax rates may also be per-year schedules.
+    Interest and O&M are deducted at the combined federal/state tax rate.
+    """
+    params = {**DEFAULT_FINANCIAL_PARAMS, **(financial_params or {})}
+    energy = np.asarray(annual_energy, dtype=np.float64)
+    n = max(scenario_count(params), energy.shape[0] if energy.ndim else 1, np.size(system_capacity))
+
+    period = np.asarray(params['analysis_period'], dtype=np.int64).reshape(-1)
+    years = int(period.max())
+    year = np.arange(1, years + 1)[None, :]
+    in_period = year <= scenario_column(period, n)
+
+    inflation = scenario_column(params['inflation_rate'], n) / 100
+    real_discount = scenario_column(params['real_discount_rate'], n) / 100
+    nominal_discount = (1 + real_discount) * (1 + inflation) - 1
+    escalation = params['rate_escalation']
+    escalation = inflation if escalation is None else scenario_column(escalation, n) / 100
+
+    # Production by year
+    if energy.ndim == 3:
+        energy = energy.sum(axis=2)
+    if energy.ndim == 2:
+        production = np.zeros((n, years))
+        production[:, :min(years, energy.shape[1])] = energy[:, :years]
+    else:
+        production = np.broadcast_to(energy.reshape(-1, 1), (n, 1)) * lifetime_factors(params, n, years)
+    production = production * in_period
+
+    capacity = scenario_column(system_capacity, n)
+    capex = scenario_column(params['installed_cost_per_watt'], n) * capacity * 1000
+    debt = capex * scenario_column(params['debt_fraction'], n) / 100
+    equity = capex - debt
+
+    # Level loan payments over the loan term
+    loan_rate = scenario_column(params['loan_rate'], n) / 100
+    loan_term = scenario_column(params['loan_term'], n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = np.where(loan_rate > 0,
+                           debt * loan_rate / (1 - (1 + loan_rate) ** -loan_term),
+                           debt / np.maximum(loan_term, 1))
+    in_loan = (year <= loan_term) & in_period
+    balance_start = np.where(
+        loan_rate > 0,
+        debt * (1 + loan_rate) ** (year - 1) - payment * (((1 + loan_rate) ** (year - 1) - 1) / np.where(loan_rate > 0, loan_rate, 1)),
+        debt - payment * (year - 1)
+    )
+    interest = np.where(in_loan, np.maximum(balance_start, 0) * loan_rate, 0.0)
+    loan_payments = np.where(in_loan, payment, 0.0)
+
+    savings = production * scenario_column(params['electricity_rate'], n) * (1 + escalation) ** (year - 1)
+    om = np.where(in_period, scenario_column(params['om_cost_per_kw'], n) * capacity * (1 + inflation) ** (year - 1), 0.0)
+
+    federal = _schedule(params['federal_tax_rate'], n, years) / 100
+    state = _schedule(params['state_tax_rate'], n, years) / 100
+    tax_rate = state + federal * (1 - state)
+    tax_savings = (interest + om) * tax_rate
+
+    cash_flows = np.concatenate([-equity, savings - om - loan_payments + tax_savings], axis=1)
+
+    discount = (1 + nominal_discount) ** -np.arange(years + 1)[None, :]
+    discounted = cash_flows * discount
+    npv = discounted.sum(axis=1)
+
+    # LCOE: after-tax cost stream at the nominal rate over energy at the real/nominal rate
+    costs = np.concatenate([equity, om + loan_payments - tax_savings], axis=1)
+    pv_costs = (costs * discount).sum(axis=1)
+    pv_energy_real = (production * (1 + real_discount) ** -year).sum(axis=1)
+    pv_energy_nominal = (production * discount[:, 1:]).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lcoe_real = np.where(pv_energy_real > 0, pv_costs / pv_energy_real, np.inf)
+        lcoe_nominal = np.where(pv_energy_nominal > 0, pv_costs / pv_energy_nominal, np.inf)
+
+    # Simple payback compares installed cost with undiscounted savings
+    simple_flows = np.concatenate([-capex, savings - om], axis=1)
+
+    return FinancialResults(
+        npv=npv,
+        irr=irr(cash_flows),
+        lcoe_real=lcoe_real,
+        lcoe_nominal=lcoe_nominal,
+        payback_period=_payback(simple_flows),
+        discounted_payback=_payback(discounted),
+        cash_flows=cash_flows
+    )
@@ -0,0 +1,313 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Fleet Simulation Pipeline
+Streams site configs through the PhysicsEngine in bounded chunks into resumable columnar output
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import logging
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '_manifest.json'
+OUTPUT_FORMATS = ('parquet', 'arrow', 'npz')
+RESULT_COLUMNS = ('annual_energy', 'capacity_factor', 'lcoe_real', 'npv', 'payback_period', 'irr')
+
+def read_site_configs(path) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per site from a CSV or NDJSON file without loading it whole"""
+    path = Path(path)
+    if path.suffix.lower() in ('.ndjson', '.jsonl', '.json'):
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    else:
+        with open(path, 'r', newline='') as f:
+            yield from csv.DictReader(f)
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        return None
+
+class FleetSimulator:
+    """
+    Bounded-memory fleet runs
+
+    Sites are pulled from the input iterator ``chunk_size`` at a time, simulated
+    with the vectorized batch engine (or ``run_solar_simulation`` per site when
+    ``mode='simulate'``), and each chunk is written as its own columnar part
+    file. A part is only recorded in the manifest after it is fully written, so
+    a restarted run skips the committed sites and continues from the next chunk.
+    Parquet/Arrow output needs pyarrow; without it parts are written as .npz.
+    Sites with lat/lon columns get their nearest station's weather when the
+    engine has a weather library attached (unless ``weather_for_site`` is given).
+
+    In batch mode a chunk's parsing, weather lookup and physics run through
+    ``run_blocking`` (a worker thread by default) and part files are written
+    on a thread too, so the event loop stays free and the next chunk is
+    simulated while the previous one is being written.
+    """
+
+    def __init__(self,
+                 engine,
+                 output_dir,
+                 chunk_size: int = 5000,
+                 output_format: str = 'parquet',
+                 mode: str = 'batch',
+                 defaults: Optional[Dict[str, Any]] = None,
+                 weather_for_site: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 max_concurrency: int = 8,
+                 run_blocking: Optional[Callable[..., Awaitable[Any]]] = None):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+        if output_format != 'npz' and _pyarrow() is None:
+            logger.warning("pyarrow not available - writing fleet parts as .npz")
+            output_format = 'npz'
+
+        self.engine = engine
+        self.output_dir = Path(output_dir)
+        self.chunk_size = chunk_size
+        self.output_format = output_format
+        self.mode = mode
+        self.defaults = defaults or {}
+        self.weather_for_site = weather_for_site
+        self.max_concurrency = max_concurrency
+        self.run_blocking = run_blocking or asyncio.to_thread
+
+    # ---- manifest -------------------------------------------------------
+
+    def _manifest_path(self) -> Path:
+        return self.output_dir / MANIFEST_NAME
+
+    def load_manifest(self) -> Dict[str, Any]:
+        path = self._manifest_path()
+        if path.exists():
+            with open(path, 'r') as f:
+                return json.load(f)
+        return {'chunk_size': self.chunk_size, 'format': self.output_format, 'rows': 0, 'parts': []}
+
+    def _commit(self, manifest: Dict[str, Any]):
+        tmp_path = self._manifest_path().with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        tmp_path.replace(self._manifest_path())
+
+    # ---- pipeline -------------------------------------------------------
+
+    async def run(self, sites: Iterable[Dict[str, Any]], weather=None) -> Dict[str, Any]:
+        """Simulate every site, resuming after the last committed chunk"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.load_manifest()
+        if manifest['parts'] and manifest['chunk_size'] != self.chunk_size:
+            raise ValueError(f"Existing run used chunk_size={manifest['chunk_size']}; resume with the same value")
+        self.output_format = manifest.get('format', self.output_format)
+
+        skipped = manifest['rows']
+        if skipped:
+            logger.info(f"Resuming fleet run after {skipped} committed sites")
+        remaining = itertools.islice(sites, skipped, None)
+
+        index = len(manifest['parts'])
+        writing: Optional[asyncio.Task] = None
+        try:
+            for chunk in _chunks(remaining, self.chunk_size):
+                columns = await self._simulate_chunk(chunk, weather)
+                # Parts are committed in order; chunk N+1 was simulated while chunk N was written
+                if writing is not None:
+                    await writing
+                writing = asyncio.create_task(self._store_chunk(manifest, index, columns, len(chunk)))
+                index += 1
+            if writing is not None:
+                await writing
+        except BaseException:
+            if writing is not None:
+                # A chunk that was already simulated still gets committed
+                await asyncio.gather(writing, return_exceptions=True)
+            raise
+
+        return manifest
+
+    async def _store_chunk(self, manifest: Dict[str, Any], index: int, columns: Dict[str, np.ndarray], rows: int):
+        part_name = await asyncio.to_thread(self._write_part, index, columns)
+        manifest['parts'].append({'index': index, 'file': part_name, 'rows': rows})
+        manifest['rows'] += rows
+        self._commit(manifest)
+        logger.info(f"Fleet chunk {index} committed ({manifest['rows']} sites total)")
+
+    def _site_config(self, site: Dict[str, Any]):
+        from .solar_engine import SolarSystemConfig
+
+        values = {}
+        for field in fields(SolarSystemConfig):
+            raw = site.get(field.name, self.defaults.get(field.name))
+            if raw is None or raw == '':
+                raise ValueError(f"Site {site.get('site_id', '?')} is missing '{field.name}'")
+            values[field.name] = int(float(raw)) if field.type is int else float(raw)
+        return SolarSystemConfig(**values)
+
+    async def _simulate_chunk(self, chunk: List[Dict[str, Any]], weather) -> Dict[str, np.ndarray]:
+        if self.mode != 'simulate':
+            return await self.run_blocking(self._simulate_batch_chunk, chunk, weather)
+
+        configs, columns, monthly, groups = self._prepare_chunk(chunk, weather)
+        for rows, group_weather in groups:
+            results = await self._simulate_each([configs[i] for i in rows], group_weather)
+            for name in RESULT_COLUMNS:
+                columns[name][rows] = [getattr(r, name) for r in results]
+            monthly[rows] = [r.monthly_energy for r in results]
+        return self._with_monthly(columns, monthly)
+
+    def _simulate_batch_chunk(self, chunk: List[Dict[str, Any]], weather) -> Dict[str, np.ndarray]:
+        """Blocking batch-mode chunk"""
+        configs, columns, monthly, groups = self._prepare_chunk(chunk, weather)
+        for rows, group_weather in groups:
+            batch = self.engine.simulate_batch([configs[i] for i in rows], group_weather)
+            for name in RESULT_COLUMNS:
+                columns[name][rows] = getattr(batch, name)
+            monthly[rows] = batch.monthly_energy
+        return self._with_monthly(columns, monthly)
+
+    def _prepare_chunk(self, chunk: List[Dict[str, Any]], weather) -> Tuple[list, Dict[str, np.ndarray], np.ndarray, list]:
+        """(configs, empty result columns, monthly buffer, [(rows, weather)] groups)"""
+        from .solar_engine import pack_configs
+
+        configs = [self._site_config(site) for site in chunk]
+        n = len(configs)
+        columns: Dict[str, np.ndarray] = {
+            'site_id': np.array([str(site.get('site_id', i)) for i, site in enumerate(chunk)])
+        }
+        columns.update(pack_configs(configs))
+        for name in RESULT_COLUMNS:
+            columns[name] = np.empty(n)
+        monthly = np.empty((n, 12))
+
+        # Sites sharing a weather source are simulated together
+        groups: Dict[int, List[int]] = {}
+        site_weather: Dict[int, Any] = {}
+        for i, site in enumerate(chunk):
+            w = self.weather_for_site(site) if self.weather_for_site else self._station_weather(site)
+            w = weather if w is None else w
+            groups.setdefault(id(w), []).append(i)
+            site_weather[id(w)] = w
+
+        return configs, columns, monthly, [(rows, site_weather[key]) for key, rows in groups.items()]
+
+    @staticmethod
+    def _with_monthly(columns: Dict[str, np.ndarray], monthly: np.ndarray) -> Dict[str, np.ndarray]:
+        for month in range(12):
+            columns[f'monthly_energy_{month + 1:02d}'] = monthly[:, month]
+        return columns
+
+    def _station_weather(self, site: Dict[str, Any]):
+        """Nearest library station for sites that carry lat/lon (see PhysicsEngine.attach_weather_library)"""
+        lat, lon = site.get('lat', site.get('latitude')), site.get('lon', site.get('longitude'))
+        if lat in (None, '') or lon in (None, '') or getattr(self.engine, 'station_index', None) is None:
+            return None
+        return self.engine.weather_for_location(float(lat), float(lon))
+
+    async def _simulate_each(self, configs, weather) -> List[Any]:
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def simulate(config):
+            async with slots:
+                return await self.engine.run_solar_simulation(config, weather)
+
+        return await asyncio.gather(*[simulate(config) for config in configs])
+
+    def _write_part(self, index: int, columns: Dict[str, np.ndarray]) -> str:
+        suffix = {'parquet': 'parquet', 'arrow': 'arrow', 'npz': 'npz'}[self.output_format]
+        name = f"part-{index:05d}.{suffix}"
+        path = self.output_dir / name
+        tmp_path = self.output_dir / f".{name}.tmp"
+
+        if self.output_format == 'npz':
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **columns)
+        else:
+            pa = _pyarrow()
+            table = pa.table({key: pa.array(value) for key, value in columns.items()})
+            if self.output_format == 'parquet':
+                import pyarrow.parquet as pq
+                pq.write_table(table, tmp_path)
+            else:
+                import pyarrow.ipc as ipc
+                with pa.OSFile(str(tmp_path), 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        tmp_path.replace(path)
+        return name
+
+def read_fleet_results(output_dir) -> Dict[str, np.ndarray]:
+    """Concatenate the committed parts of a fleet run into NumPy columns"""
+    output_dir = Path(output_dir)
+    with open(output_dir / MANIFEST_NAME, 'r') as f:
+        manifest = json.load(f)
+
+    parts: List[Dict[str, np.ndarray]] = []
+    for part in manifest['parts']:
+        path = output_dir / part['file']
+        if manifest['format'] == 'npz':
+            with np.load(path) as data:
+                parts.append({key: data[key] for key in data.files})
+        elif manifest['format'] == 'parquet':
+            import pyarrow.parquet as pq
+            table = pq.read_table(path)
+            parts.append({name: table.column(name).to_numpy() for name in table.column_names})
+        else:
+            import pyarrow.ipc as ipc
+            table = ipc.open_file(str(path)).read_all()
+            parts.append({name: table.column(name).to_numpy() for name in table.column_names})
+
+    if not parts:
+        return {}
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+async def run_fleet_simulation(source, output_dir, engine=None, weather_library=None, **kwargs) -> Dict[str, Any]:
+    """Stream a CSV/NDJSON site file through the fleet pipeline"""
+    if engine is None:
+        from .solar_engine import get_physics_engine
+        engine = await get_physics_engine()
+    if weather_library:
+        engine.attach_weather_library(weather_library)
+    simulator = FleetSimulator(engine, output_dir, **kwargs)
+    return await simulator.run(read_site_configs(source))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a resumable fleet simulation")
+    parser.add_argument('source', help="CSV or NDJSON file of site configs")
+    parser.add_argument('output_dir', help="Directory for part files and the manifest")
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='parquet')
+    parser.add_argument('--mode', choices=('batch', 'simulate'), default='batch')
+    parser.add_argument('--weather-library', help="Directory of TMY3/EPW files; sites use their nearest station")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    manifest = asyncio.run(run_fleet_simulation(
+        args.source, args.output_dir, weather_library=args.weather_library,
+        chunk_size=args.chunk_size, output_format=args.format, mode=args.mode
+    ))
+    print(f"{manifest['rows']} sites in {len(manifest['parts'])} parts")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Hourly Irradiance Model
+Vectorized 8760 solar position, plane-of-array transposition, cell temperature and inverter model
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+from .ephemeris import ephemeris_cache
+from .shading import weather_shade_masks
+
+logger = logging.getLogger(__name__)
+
+SOLAR_CONSTANT = 1367.0  # W/m²
+ALBEDO = 0.2
+IAM_B0 = 0.05  # ASHRAE incidence angle modifier coefficient
+TRACKER_MAX_ROTATION = 45.0  # degrees
+MIN_COS_ZENITH = 0.0872  # cos(85°) - caps beam/diffuse ratios near the horizon
+
+# Power temperature coefficient (1/°C) indexed by module_type: standard, premium, thin film
+TEMP_COEFFICIENTS = np.array([-0.0047, -0.0035, -0.0020])
+
+# Sandia cell temperature model, open rack glass/cell/glass (a, b, deltaT)
+SAPM_OPEN_RACK = (-3.56, -0.075, 3.0)
+
+MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+@dataclass
+class SolarPosition:
+    """Hourly sun position for one location (all angles in degrees)"""
+    zenith: np.ndarray
+    azimuth: np.ndarray      # clockwise from north
+    declination: np.ndarray
+    dni_extra: np.ndarray    # extraterrestrial normal irradiance, W/m²
+
+    @property
+    def cos_zenith(self) -> np.ndarray:
+        return np.cos(np.radians(self.zenith))
+
+    def take(self, hours: np.ndarray) -> 'SolarPosition':
+        """Subset of hours (index or boolean mask)"""
+        return SolarPosition(
+            zenith=self.zenith[hours],
+            azimuth=self.azimuth[hours],
+            declination=self.declination[hours],
+            dni_extra=self.dni_extra[hours]
+        )
+
+@dataclass
+class HourlyProduction:
+    """Hourly model outputs, shape (configs, hours)"""
+    poa: np.ndarray          # plane-of-array irradiance, W/m²
+    beam: np.ndarray         # beam component of poa after IAM, W/m²
+    cell_temp: np.ndarray    # °C
+    dc: np.ndarray           # DC output after system losses, kW
+    ac: np.ndarray           # AC output after inverter and clipping, kW
+    clipped: np.ndarray      # AC energy lost to inverter clipping, kW
+
+def hourly_index(n_hours: int):
+    """Day of year (1-based) and hour of day for a sequential hourly year"""
+    index = np.arange(n_hours)
+    return index // 24 + 1, index % 24
+
+def month_of_hour(n_hours: int) -> np.ndarray:
+    """Calendar month (1-12) of each hour in a non-leap hourly year"""
+    month = np.repeat(np.arange(1, 13), MONTH_DAYS * 24)
+    if n_hours > len(month):
+        month = np.concatenate([month, np.full(n_hours - len(month), 12)])
+    return month[:n_hours]
+
+def solar_position(lat: float, lon: float, tz: float,
+                   day_of_year: np.ndarray, hour: np.ndarray) -> SolarPosition:
+    """
+    Sun position at the middle of each hour (local standard time)
+    using Spencer's declination and equation of time
+    """
+    day_angle = 2 * np.pi * (np.asarray(day_of_year, dtype=np.float64) - 1) / 365
+    declination = (0.006918 - 0.399912 * np.cos(day_angle) + 0.070257 * np.sin(day_angle)
+                   - 0.006758 * np.cos(2 * day_angle) + 0.000907 * np.sin(2 * day_angle)
+                   - 0.002697 * np.cos(3 * day_angle) + 0.00148 * np.sin(3 * day_angle))
+    eot = 229.18 * (0.000075 + 0.001868 * np.cos(day_angle) - 0.032077 * np.sin(day_angle)
+                    - 0.014615 * np.cos(2 * day_angle) - 0.040849 * np.sin(2 * day_angle))
+    dni_extra = SOLAR_CONSTANT * (1.00011 + 0.034221 * np.cos(day_angle) + 0.00128 * np.sin(day_angle)
+                                  + 0.000719 * np.cos(2 * day_angle) + 0.000077 * np.sin(2 * day_angle))
+
+    solar_time = np.asarray(hour, dtype=np.float64) + 0.5 + (4 * (lon - 15 * tz) + eot) / 60
+    hour_angle = np.radians(15 * (solar_time - 12))
+    phi = np.radians(lat)
+
+    cos_zenith = np.sin(phi) * np.sin(declination) + np.cos(phi) * np.cos(declination) * np.cos(hour_angle)
+    zenith = np.arccos(np.clip(cos_zenith, -1, 1))
+    azimuth = np.arctan2(
+        np.sin(hour_angle),
+        np.cos(hour_angle) * np.sin(phi) - np.tan(declination) * np.cos(phi)
+    ) + np.pi
+
+    return SolarPosition(
+        zenith=np.degrees(zenith),
+        azimuth=np.degrees(azimuth) % 360,
+        declination=np.degrees(declination),
+        dni_extra=dni_extra
+    )
+
+def weather_solar_position(weather) -> SolarPosition:
+    """
+    Solar position for every hour of a WeatherData
+
+    A sequential hourly year depends only on location, so it is served from the
+    process-wide ephemeris cache (float32, lat/lon snapped to its grid).
+    """
+    n_hours = len(weather.gh)
+    day_of_year, hour_of_day = hourly_index(n_hours)
+    hour = np.asarray(weather.hour, dtype=np.float64)
+    if not np.array_equal(hour, hour_of_day):
+        return solar_position(weather.lat, weather.lon, weather.tz, day_of_year, hour)
+
+    def compute(lat, lon, tz):
+        return asdict(solar_position(lat, lon, tz, day_of_year, hour_of_day))
+
+    arrays = ephemeris_cache().get(weather.lat, weather.lon, weather.tz,
+                                   getattr(weather, 'year', None), n_hours, compute)
+    return SolarPosition(**arrays)
+
+def incidence(position: SolarPosition,
+              tilt: np.ndarray,
+              azimuth: np.ndarray,
+              array_type: np.ndarray,
+              lat: float):
+    """
+    Cosine of the angle of incidence and of the surface tilt for each config and hour
+
+    ``tilt``, ``azimuth`` and ``array_type`` are (configs,) arrays; cos_aoi is
+    (configs, hours) and cos_tilt broadcasts against it. Single-axis trackers
+    rotate about an axis with the config's tilt and azimuth (no backtracking);
+    azimuth-axis trackers keep their tilt and follow the sun's azimuth; seasonal
+    tilt follows latitude minus declination.
+    """
+    zen = np.radians(position.zenith)[None, :]
+    sun_az = np.radians(position.azimuth)[None, :]
+    sin_zen, cos_zen = np.sin(zen), np.cos(zen)
+    sx, sy, sz = sin_zen * np.sin(sun_az), sin_zen * np.cos(sun_az), cos_zen
+
+    t = np.radians(np.asarray(tilt, dtype=np.float64))[:, None]
+    a = np.radians(np.asarray(azimuth, dtype=np.float64))[:, None]
+    kind = np.asarray(array_type).astype(np.int64)
+    kinds = np.unique(kind)
+
+    n_configs, n_hours = len(kind), zen.shape[1]
+    cos_aoi = np.empty((n_configs, n_hours))
+    column_tilt = len(kinds) == 1 and kinds[0] in (0, 3)
+    if column_tilt:
+        # Fixed tilt for every row - keep cos_tilt as a (configs, 1) column
+        cos_tilt = np.cos(t)
+    else:
+        cos_tilt = np.empty((n_configs, n_hours))
+
+    for array_kind in kinds:
+        rows = kind == array_kind
+        tr, ar = t[rows], a[rows]
+
+        if array_kind == 1:
+            # Rotation about the tilted axis: normal = N0 cos θ + E sin θ
+            n0 = (np.sin(ar) * np.sin(tr), np.cos(ar) * np.sin(tr), np.cos(tr))
+            e = (-np.cos(ar), np.sin(ar))
+            s_n0 = sx * n0[0] + sy * n0[1] + sz * n0[2]
+            s_e = sx * e[0] + sy * e[1]
+            limit = np.radians(TRACKER_MAX_ROTATION)
+            theta = np.clip(np.arctan2(s_e, s_n0), -limit, limit)
+            cos_theta = np.cos(theta)
+            cos_aoi[rows] = cos_theta * s_n0 + np.sin(theta) * s_e
+            cos_tilt[rows] = np.cos(tr) * cos_theta
+        elif array_kind == 2:
+            cos_aoi[rows] = 1.0
+            cos_tilt[rows] = np.maximum(cos_zen, 0.0)
+        elif array_kind == 3:
+            cos_aoi[rows] = np.sin(tr) * sin_zen + np.cos(tr) * cos_zen
+            if not column_tilt:
+                cos_tilt[rows] = np.cos(tr)
+        else:
+            if array_kind == 4:
+                seasonal = np.radians(np.clip(np.abs(lat - position.declination), 0, 90))[None, :]
+                tr = np.broadcast_to(seasonal, (rows.sum(), n_hours))
+            cos_aoi[rows] = np.sin(tr) * sin_zen * np.cos(sun_az - ar) + np.cos(tr) * cos_zen
+            if not column_tilt:
+                cos_tilt[rows] = np.cos(tr)
+
+    return cos_aoi, cos_tilt
+
+def plane_of_array(position: SolarPosition,
+                   dni: np.ndarray, dhi: np.ndarray, ghi: np.ndarray,
+                   cos_aoi: np.ndarray, cos_tilt: np.ndarray,
+                   albedo: float = ALBEDO,
+                   beam_shade=1.0, diffuse_shade=1.0):
+    """
+    Hay-Davies transposition; returns (poa_total, poa_beam) after incidence angle losses
+
+    ``beam_shade`` / ``diffuse_shade`` are unshaded fractions (see shading.py)
+    applied to beam plus circumsolar and to isotropic sky diffuse.
+    """
+    cos_zenith = position.cos_zenith[None, :]
+    sun_up = cos_zenith > 0
+    dni, dhi, ghi = dni[None, :], dhi[None, :], ghi[None, :]
+
+    cos_aoi_pos = np.maximum(cos_aoi, 0.0)
+    cos_aoi_pos *= sun_up
+    with np.errstate(divide='ignore', invalid='ignore'):
+        iam = np.clip(1 - IAM_B0 * (1 / cos_aoi_pos - 1), 0, 1)
+    beam = dni * cos_aoi_pos * iam * beam_shade
+
+    anisotropy = np.clip(dni / position.dni_extra[None, :], 0, 1)
+    ratio = cos_aoi_pos / np.maximum(cos_zenith, MIN_COS_ZENITH)
+    sky = dhi * (anisotropy * ratio * beam_shade + (1 - anisotropy) * (1 + cos_tilt) / 2 * diffuse_shade)
+    ground = ghi * albedo * (1 - cos_tilt) / 2
+
+    return beam + sky + ground, beam
+
+def cell_temperature(poa: np.ndarray, tdry: np.ndarray, wspd: np.ndarray,
+                     model=SAPM_OPEN_RACK) -> np.ndarray:
+    """Sandia module/cell temperature from plane-of-array irradiance, air temperature and wind"""
+    a, b, delta_t = model
+    module_temp = poa * np.exp(a + b * wspd[None, :]) + tdry[None, :]
+    return module_temp + poa / 1000.0 * delta_t
+
+def module_temperature_coefficient(module_type: np.ndarray) -> np.ndarray:
+    module_type = np.asarray(module_type).astype(np.int64)
+    known = (module_type >= 0) & (module_type < len(TEMP_COEFFICIENTS))
+    return np.where(known, TEMP_COEFFICIENTS[np.where(known, module_type, 0)], TEMP_COEFFICIENTS[0])
+
+def dc_power(poa: np.ndarray, cell_temp: np.ndarray,
+             capacity: np.ndarray, module_type: np.ndarray, losses: np.ndarray) -> np.ndarray:
+    """PVWatts-style DC output in kW from irradiance and cell temperature"""
+    gamma = module_temperature_coefficient(module_type)[:, None]
+    derate = (1 - np.asarray(losses, dtype=np.float64) / 100)[:, None]
+    dc = np.asarray(capacity, dtype=np.float64)[:, None] * (poa / 1000.0) * (1 + gamma * (cell_temp - 25.0)) * derate
+    return np.maximum(dc, 0.0)
+
+def inverter_output(dc: np.ndarray, capacity: np.ndarray, dc_ac_ratio: np.ndarray, inv_eff: np.ndarray):
+    """AC output and clipped power for inverters rated at capacity / dc_ac_ratio"""
+    ac_rating = (np.asarray(capacity, dtype=np.float64) / np.asarray(dc_ac_ratio, dtype=np.float64))[:, None]
+    ac_unclipped = dc * (np.asarray(inv_eff, dtype=np.float64) / 100)[:, None]
+    ac = np.minimum(ac_unclipped, ac_rating)
+    return ac, ac_unclipped - ac
+
+def simulate_hourly(arrays: Dict[str, np.ndarray], weather,
+                    position: Optional[SolarPosition] = None,
+                    hours: Optional[np.ndarray] = None,
+                    shading=None) -> HourlyProduction:
+    """
+    Run the hourly model for packed config columns against one WeatherData
+
+    ``hours`` restricts the run to a subset of hours (e.g. daylight) when the
+    caller only needs totals; outputs then have one column per selected hour.
+    ``shading`` (a shading.SiteShading) applies the site's cached horizon and
+    row-to-row shade masks.
+    """
+    if position is None:
+        position = weather_solar_position(weather)
+    beam_shade, diffuse_shade = 1.0, 1.0
+    if shading is not None:
+        beam_shade, diffuse_shade = weather_shade_masks(weather, position, shading, arrays)
+        if hours is not None:
+            beam_shade = beam_shade[:, hours]
+
+    dni = np.asarray(weather.dn, dtype=np.float64)
+    dhi = np.asarray(weather.df, dtype=np.float64)
+    ghi = np.asarray(weather.gh, dtype=np.float64)
+    tdry = np.asarray(weather.tdry, dtype=np.float64)
+    wspd = np.asarray(weather.wspd, dtype=np.float64)
+    if hours is not None:
+        position = position.take(hours)
+        dni, dhi, ghi, tdry, wspd = dni[hours], dhi[hours], ghi[hours], tdry[hours], wspd[hours]
+
+    cos_aoi, cos_tilt = incidence(position, arrays['tilt'], arrays['azimuth'],
+                                  arrays['array_type'], weather.lat)
+    poa, beam = plane_of_array(position, dni, dhi, ghi, cos_aoi, cos_tilt,
+                               beam_shade=beam_shade, diffuse_shade=diffuse_shade)
+    t_cell = cell_temperature(poa, tdry, wspd)
+    dc = dc_power(poa, t_cell, arrays['system_capacity'], arrays['module_type'], arrays['losses'])
+    ac, clipped = inverter_output(dc, arrays['system_capacity'], arrays['dc_ac_ratio'], arrays['inv_eff'])
+
+    return HourlyProduction(poa=poa, beam=beam, cell_temp=t_cell, dc=dc, ac=ac, clipped=clipped)
+
+def monthly_totals(hourly: np.ndarray, month) -> np.ndarray:
+    """Sum a (configs, hours) array into (configs, 12) calendar months"""
+    month = np.asarray(month).astype(np.int64)
+    onehot = np.zeros((len(month), 12))
+    onehot[np.arange(len(month)), np.clip(month, 1, 12) - 1] = 1.0
+    return hourly @ onehot
+
+@lru_cache(maxsize=16)
+def synthetic_weather(lat: float, lon: float, tz: float, year: int = 2020,
+                      annual_ghi: float = 1800.0, elev: float = 0.0):
+    """
+    Clear-sky-shaped hourly year scaled to ``annual_ghi`` kWh/m²
+
+    Haurwitz clear-sky GHI, Erbs diffuse split and sinusoidal temperature; used
+    when a simulation has no weather so orientation still matters.
+    """
+    from .solar_engine import WeatherData
+
+    n_hours = 8760
+    day_of_year, hour = hourly_index(n_hours)
+    position = solar_position(lat, lon, tz, day_of_year, hour)
+    cos_zenith = position.cos_zenith
+
+    sun_up = cos_zenith > 0
+    with np.errstate(divide='ignore', over='ignore'):
+        ghi = np.where(sun_up, 1098.0 * cos_zenith * np.exp(-0.059 / np.where(sun_up, cos_zenith, 1.0)), 0.0)
+    ghi *= annual_ghi * 1000.0 / ghi.sum()
+
+    # Erbs diffuse fraction from the clearness index
+    extra_horizontal = position.dni_extra * np.maximum(cos_zenith, MIN_COS_ZENITH)
+    kt = np.clip(ghi / extra_horizontal, 0, 1)
+    diffuse_fraction = np.where(
+        kt <= 0.22, 1 - 0.09 * kt,
+        np.where(kt <= 0.8,
+                 0.9511 - 0.1604 * kt + 4.388 * kt ** 2 - 16.638 * kt ** 3 + 12.336 * kt ** 4,
+                 0.165))
+    dhi = ghi * diffuse_fraction
+    dni = np.where(cos_zenith > MIN_COS_ZENITH, (ghi - dhi) / np.maximum(cos_zenith, MIN_COS_ZENITH), 0.0)
+
+    season = np.sign(lat) if lat else 1.0
+    tdry = (17.0 + 9.0 * season * np.cos(2 * np.pi * (day_of_year - 200) / 365)
+            + 5.0 * np.cos(2 * np.pi * (hour - 15) / 24))
+
+    weather = WeatherData.from_arrays(
+        lat=lat, lon=lon, tz=tz, elev=elev, year=year,
+        month=month_of_hour(n_hours), hour=hour,
+        dn=dni, df=dhi, gh=ghi, wspd=np.full(n_hours, 3.0), tdry=tdry
+    )
+    for name in ('month', 'hour', 'dn', 'df', 'gh', 'wspd', 'tdry'):
+        getattr(weather, name).flags.writeable = False
+    return weather
@@ -0,0 +1,387 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Simulation Job Queue
+Submit/poll/cancel background PhysicsEngine work with priorities and SQLite-persisted, chunk-checkpointed results
+"""
+
+import asyncio
+import functools
+import logging
+import pickle
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'completed', 'failed', 'cancelled')
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+BATCH_JOB_CHUNK_SIZE = 1000
+POLL_INTERVAL = 0.05  # seconds between status checks in JobQueue.wait
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params BLOB NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    chunks_total INTEGER,
+    result BLOB,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created);
+CREATE TABLE IF NOT EXISTS job_chunks (
+    job_id TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    result BLOB NOT NULL,
+    PRIMARY KEY (job_id, chunk)
+);
+"""
+
+@dataclass
+class JobStatus:
+    job_id: str
+    kind: str
+    status: str
+    priority: int
+    created: float
+    started: Optional[float]
+    finished: Optional[float]
+    chunks_done: int
+    chunks_total: Optional[int]
+    error: Optional[str]
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+class JobStore:
+    """
+    SQLite persistence for jobs and their chunk checkpoints
+
+    Params and results are pickled, so the database must only be shared with
+    trusted processes (it is a local work store, not an exchange format).
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path), isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+
+    def add(self, kind: str, params: Dict[str, Any], priority: int) -> str:
+        job_id = uuid.uuid4().hex
+        self.db.execute(
+            'INSERT INTO jobs (job_id, kind, params, priority, status, created) VALUES (?, ?, ?, ?, ?, ?)',
+            (job_id, kind, pickle.dumps(params), priority, 'queued', time.time())
+        )
+        return job_id
+
+    def claim(self) -> Optional[tuple]:
+        """
+        Mark the highest-priority queued job running; (job_id, kind, params) or None
+
+        One UPDATE picks and flips the row, so two workers (or processes sharing
+        the database) can never claim the same job.
+        """
+        rows = self.db.execute(
+            "UPDATE jobs SET status = 'running', started = ? WHERE status = 'queued' AND job_id = ("
+            "SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY priority DESC, created LIMIT 1"
+            ") RETURNING job_id, kind, params", (time.time(),)
+        ).fetchall()
+        if len(rows) != 1:
+            return None
+        job_id, kind, params = rows[0]
+        return job_id, kind, pickle.loads(params)
+
+    def requeue_running(self) -> int:
+        """Put jobs left running (crashed or stopped worker) back in the queue; checkpoints are kept"""
+        return self.db.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'").rowcount
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        self.db.execute(
+            'UPDATE jobs SET status = ?, finished = ?, result = ?, error = ? WHERE job_id = ?',
+            (status, time.time(), None if result is None else pickle.dumps(result), error, job_id)
+        )
+
+    def cancel_queued(self, job_id: str) -> bool:
+        return self.db.execute(
+            "UPDATE jobs SET status = 'cancelled', finished = ? WHERE job_id = ? AND status = 'queued'",
+            (time.time(), job_id)
+        ).rowcount > 0
+
+    def status(self, job_id: str) -> Optional[JobStatus]:
+        row = self.db.execute(
+            'SELECT job_id, kind, status, priority, created, started, finished, chunks_done, chunks_total, error '
+            'FROM jobs WHERE job_id = ?', (job_id,)
+        ).fetchone()
+        return JobStatus(*row) if row else None
+
+    def result(self, job_id: str) -> Any:
+        row = self.db.execute('SELECT result FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return pickle.loads(row[0]) if row and row[0] is not None else None
+
+    def list(self, status: Optional[str] = None) -> List[JobStatus]:
+        ids = self.db.execute(
+            'SELECT job_id FROM jobs' + (' WHERE status = ?' if status else '') + ' ORDER BY created',
+            (status,) if status else ()
+        ).fetchall()
+        return [self.status(job_id) for (job_id,) in ids]
+
+    # ---- chunk checkpoints ---------------------------------------------
+
+    def set_total(self, job_id: str, total: int):
+        self.db.execute('UPDATE jobs SET chunks_total = ? WHERE job_id = ?', (total, job_id))
+
+    def save_chunk(self, job_id: str, chunk: int, result: Any):
+        with self.db:
+            self.db.execute('BEGIN')
+            self.db.execute('INSERT OR REPLACE INTO job_chunks (job_id, chunk, result) VALUES (?, ?, ?)',
+                            (job_id, chunk, pickle.dumps(result)))
+            self.db.execute('UPDATE jobs SET chunks_done = (SELECT COUNT(*) FROM job_chunks WHERE job_id = ?) '
+                            'WHERE job_id = ?', (job_id, job_id))
+
+    def chunks(self, job_id: str) -> Dict[int, Any]:
+        rows = self.db.execute('SELECT chunk, result FROM job_chunks WHERE job_id = ?', (job_id,)).fetchall()
+        return {chunk: pickle.loads(blob) for chunk, blob in rows}
+
+    def close(self):
+        self.db.close()
+
+class JobContext:
+    """Handed to job handlers for progress, chunk checkpoints and off-loop compute"""
+
+    def __init__(self, store: JobStore, job_id: str, threads: Optional[ThreadPoolExecutor] = None):
+        self.store = store
+        self.job_id = job_id
+        self.threads = threads
+
+    async def run_blocking(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run CPU-bound ``fn`` on the queue's compute threads so the event loop
+        stays responsive (NumPy releases the GIL in its heavy kernels). A
+        cancelled job stops waiting at once; the call itself runs to completion.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.threads, functools.partial(fn, *args, **kwargs))
+
+    def set_total(self, chunks: int):
+        self.store.set_total(self.job_id, chunks)
+
+    def completed_chunks(self) -> Dict[int, Any]:
+        """Chunk results already committed (by this run or one that crashed)"""
+        return self.store.chunks(self.job_id)
+
+    def checkpoint(self, chunk: int, result: Any):
+        self.store.save_chunk(self.job_id, chunk, result)
+
+JobHandler = Callable[[Any, Dict[str, Any], JobContext], Awaitable[Any]]
+
+def concat_batch_results(parts: List[Any]):
+    """One BatchSimulationResults from consecutive chunk results"""
+    from .solar_engine import BatchSimulationResults
+
+    values = {}
+    for field in fields(BatchSimulationResults):
+        if field.name == 'messages':
+            values[field.name] = list(dict.fromkeys(m for part in parts for m in part.messages))
+        else:
+            values[field.name] = np.concatenate([getattr(part, field.name) for part in parts])
+    return BatchSimulationResults(**values)
+
+async def _off_loop(engine, context, call, params: Dict[str, Any]):
+    """
+    Await an engine coroutine, on its own event loop in a compute thread when
+    its simulations would run in-process (fallback mode, or PySAM without an
+    executor). With an executor the PySAM runs already leave the loop, and the
+    executor's in-flight semaphore belongs to this loop, so the call stays here.
+    """
+    if engine.fallback_mode or engine.executor is None:
+        return await context.run_blocking(lambda: asyncio.run(call(**params)))
+    return await call(**params)
+
+async def _simulate_job(engine, params, context):
+    return await _off_loop(engine, context, engine.run_solar_simulation, params)
+
+async def _batch_job(engine, params, context):
+    params = dict(params)
+    configs = list(params.pop('configs'))
+    chunk_size = params.pop('chunk_size', BATCH_JOB_CHUNK_SIZE)
+    starts = range(0, len(configs), chunk_size)
+    context.set_total(len(starts))
+
+    done = context.completed_chunks()
+    if done:
+        logger.info(f"Job {context.job_id}: resuming batch after {len(done)} committed chunks")
+    for index, start in enumerate(starts):
+        if index not in done:
+            done[index] = await context.run_blocking(engine.simulate_batch, configs[start:start + chunk_size], **params)
+            context.checkpoint(index, done[index])
+    return concat_batch_results([done[i] for i in range(len(starts))])
+
+async def _monte_carlo_job(engine, params, context):
+    params = dict(params)
+    run = {name: params.pop(name) for name in ('samples', 'seed', 'chunk_size', 'keep_samples') if name in params}
+    simulator = await engine.monte_carlo_simulator(**params)
+    return await context.run_blocking(simulator.run, **run)
+
+async def _sensitivity_job(engine, params, context):
+    return await _off_loop(engine, context, engine.run_sensitivity_analysis, params)
+
+async def _optimize_job(engine, params, context):
+    return await _off_loop(engine, context, engine.optimize_design, params)
+
+async def _fleet_job(engine, params, context):
+    # The fleet manifest already commits each chunk, so a rerun resumes after the last one
+    from .fleet import run_fleet_simulation
+    return await _off_loop(engine, context, run_fleet_simulation, {**params, 'engine': engine})
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    'simulate': _simulate_job,
+    'batch': _batch_job,
+    'monte_carlo': _monte_carlo_job,
+    'sensitivity': _sensitivity_job,
+    'optimize': _optimize_job,
+    'fleet': _fleet_job,
+}
+
+def register_job_kind(kind: str, handler: JobHandler):
+    """Add a job kind; ``handler(engine, params, context)`` is awaited by a worker"""
+    JOB_HANDLERS[kind] = handler
+
+class JobQueue:
+    """
+    Background job runner around a PhysicsEngine
+
+    submit() stores a job and returns its ID immediately; up to
+    ``max_workers`` jobs run at once, highest priority first (ties in
+    submission order). Jobs are coordinated on the event loop, which only does
+    the SQLite status and checkpoint writes: batch chunks and Monte Carlo
+    sampling run on a pool of ``max_workers`` compute threads, and the other
+    kinds run on their own event loop in one of those threads unless the
+    engine's executor already takes their PySAM runs. Status, chunk
+    checkpoints and results live in SQLite at ``path``, so they outlive the
+    process: on start(), jobs that were running when a previous process died
+    are queued again and skip the chunks they had already committed.
+
+    Job kinds: 'simulate', 'batch' (configs=[...], checkpointed per
+    ``chunk_size`` configs), 'monte_carlo', 'sensitivity', 'optimize' and
+    'fleet' (resumes from its own manifest); params are the keyword arguments
+    of the matching PhysicsEngine / run_fleet_simulation call.
+    """
+
+    def __init__(self, engine, path: Union[str, Path] = 'genesis_jobs.sqlite', max_workers: int = 2):
+        self.engine = engine
+        self.store = JobStore(path)
+        self.max_workers = max_workers
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+
+    async def start(self) -> 'JobQueue':
+        """Recover interrupted jobs and start the workers (idempotent)"""
+        if self._workers:
+            return self
+        recovered = self.store.requeue_running()
+        if recovered:
+            logger.info(f"Re-queued {recovered} interrupted jobs")
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='genesis-job')
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+        return self
+
+    def submit(self, kind: str, priority: int = 0, **params) -> str:
+        """Queue a job; returns its ID"""
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind '{kind}', expected one of {sorted(JOB_HANDLERS)}")
+        job_id = self.store.add(kind, params, priority)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    def poll(self, job_id: str) -> Optional[JobStatus]:
+        return self.store.status(job_id)
+
+    def result(self, job_id: str) -> Any:
+        """Result of a completed job (raises if it failed, was cancelled or is unfinished)"""
+        status = self.poll(job_id)
+        if status is None:
+            raise KeyError(job_id)
+        if status.status != 'completed':
+            raise RuntimeError(f"Job {job_id} is {status.status}" + (f": {status.error}" if status.error else ''))
+        return self.store.result(job_id)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """Wait for a job to finish and return its result"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.poll(job_id).done:
+            if deadline is not None and time.monotonic() > deadline:
+                raise asyncio.TimeoutError(f"Job {job_id} still running after {timeout}s")
+            await asyncio.sleep(POLL_INTERVAL)
+        return self.result(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if it already finished"""
+        if self.store.cancel_queued(job_id):
+            return True
+        task = self._running.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def list_jobs(self, status: Optional[str] = None) -> List[JobStatus]:
+        return self.store.list(status)
+
+    async def shutdown(self):
+        """Stop the workers; running jobs go back to the queue for the next start()"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # Compute already handed to a thread finishes in the background; its result is dropped
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self.store.requeue_running()
+
+    async def _worker(self):
+        while True:
+            claimed = self.store.claim()
+            if claimed is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            job_id, kind, params = claimed
+            context = JobContext(self.store, job_id, self._threads)
+            task = asyncio.create_task(JOB_HANDLERS[kind](self.engine, params, context))
+            self._running[job_id] = task
+            try:
+                result = await asyncio.shield(task)
+                self.store.finish(job_id, 'completed', result=result)
+                logger.info(f"Job {job_id} ({kind}) completed")
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    # The worker itself is being stopped: the job stays 'running' until requeued
+                    task.cancel()
+                    raise
+                self.store.finish(job_id, 'cancelled')
+                logger.info(f"Job {job_id} ({kind}) cancelled")
+            except Exception as e:
+                self.store.finish(job_id, 'failed', error=f"{type(e).__name__}: {e}")
+                logger.error(f"Job {job_id} ({kind}) failed: {e}")
+            finally:
+                self._running.pop(job_id, None)
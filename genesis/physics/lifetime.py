@@ -0,0 +1,35 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Lifetime Production
+(years x 12) production over the analysis period with degradation, inverter replacement and availability
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .financial import DEFAULT_FINANCIAL_PARAMS, lifetime_factors, scenario_column, scenario_count
+
+logger = logging.getLogger(__name__)
+
+def lifetime_production(monthly_energy, financial_params: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """
+    Year-by-month production over the analysis period in one array pass
+
+    ``monthly_energy`` is year-one kWh as (12,) or (scenarios, 12). Returns
+    (years, 12) or (scenarios, years, 12); months past a scenario's own
+    ``analysis_period`` are zero. ``result.sum(axis=-1)`` is the (scenarios,
+    years) production evaluate_cash_flows accepts directly.
+    """
+    params = {**DEFAULT_FINANCIAL_PARAMS, **(financial_params or {})}
+    monthly = np.asarray(monthly_energy, dtype=np.float64)
+    single = monthly.ndim == 1
+    monthly = monthly.reshape(-1, 12)
+    n = max(scenario_count(params), len(monthly))
+
+    period = scenario_column(params['analysis_period'], n)
+    years = int(period.max())
+    factors = lifetime_factors(params, n, years) * (np.arange(1, years + 1)[None, :] <= period)
+
+    production = np.broadcast_to(monthly, (n, 12))[:, None, :] * factors[:, :, None]
+    return production[0] if single and n == 1 else production
@@ -0,0 +1,121 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - PySAM Model Pool
+Warm, pre-configured Pvsamv1 models reused across simulations
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import Any, Dict, List
+
+from .result_cache import weather_digest
+
+logger = logging.getLogger(__name__)
+
+# Default location used when no weather is supplied (see PhysicsEngine._configure_default_weather)
+DEFAULT_LOCATION = (35.0, -119.0)
+
+class PooledModel:
+    """A Pvsamv1 instance plus the design values currently applied to it"""
+
+    def __init__(self, model):
+        self.model = model
+        self.applied: Dict[str, Any] = {}
+        self.runs = 0
+
+    def apply(self, config) -> int:
+        """Set only the SystemDesign values that differ from the last run; returns how many changed"""
+        changed = 0
+        for field in fields(config):
+            value = getattr(config, field.name)
+            if self.applied.get(field.name) != value:
+                setattr(self.model.SystemDesign, field.name, value)
+                self.applied[field.name] = value
+                changed += 1
+        return changed
+
+    def clear_outputs(self):
+        """Unassign the last run's outputs so the next user can't read them back"""
+        for name in self.model.Outputs.export():
+            self.model.unassign(name)
+
+class PvsamModelPool:
+    """
+    Pool of Pvsamv1 models keyed by weather (or the default location)
+
+    A pooled model has its solar resource and detailed losses configured once.
+    Each use applies just the SystemDesign fields that differ from the previous
+    run on that model, so repeat sweeps over one site skip the full setup.
+    Outputs are cleared when a model comes back, and models whose run raises
+    are discarded instead of returned to the pool.
+    """
+
+    def __init__(self, engine, max_idle_per_key: int = 4, max_keys: int = 32):
+        self.engine = engine
+        self.max_idle_per_key = max_idle_per_key
+        self.max_keys = max_keys
+        self._idle: "OrderedDict[str, List[PooledModel]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0, 'fields_applied': 0}
+
+    @staticmethod
+    def pool_key(weather=None) -> str:
+        if weather is None:
+            return "default:{}:{}".format(*DEFAULT_LOCATION)
+        return f"weather:{weather_digest(weather)}"
+
+    @contextmanager
+    def model(self, config, weather=None):
+        """Check out a configured model for ``config``; returned to the pool on success"""
+        key = self.pool_key(weather)
+        pooled = self._acquire(key, weather, config)
+        self.stats['fields_applied'] += pooled.apply(config)
+        try:
+            yield pooled.model
+        except Exception:
+            self.stats['discarded'] += 1
+            raise
+        else:
+            pooled.runs += 1
+            pooled.clear_outputs()
+            self._release(key, pooled)
+
+    def _acquire(self, key: str, weather, config) -> PooledModel:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self._idle.move_to_end(key)
+                self.stats['reused'] += 1
+                return idle.pop()
+
+        model = self.engine.pv.new()
+        if weather is not None:
+            self.engine._configure_weather_data(model, weather)
+        else:
+            self.engine._configure_default_weather(model, *DEFAULT_LOCATION)
+        self.engine._configure_system_losses(model, config)
+
+        pooled = PooledModel(model)
+        pooled.applied['losses'] = config.losses
+        self.stats['created'] += 1
+        return pooled
+
+    def _release(self, key: str, pooled: PooledModel):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            self._idle.move_to_end(key)
+            if len(idle) < self.max_idle_per_key:
+                idle.append(pooled)
+            while len(self._idle) > self.max_keys:
+                self._idle.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            idle = sum(len(models) for models in self._idle.values())
+        return {**self.stats, 'idle_models': idle, 'keys': len(self._idle)}
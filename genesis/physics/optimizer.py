@@ -0,0 +1,274 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Design Optimizer
+Memoized derivative-free (Nelder-Mead) search over array orientation and sizing parameters
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .financial import DEFAULT_FINANCIAL_PARAMS
+from .model_pool import DEFAULT_LOCATION
+from .result_cache import simulation_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Search bounds for the tunable design parameters (azimuth: northern hemisphere,
+# see equator_facing_azimuth_bounds)
+DEFAULT_BOUNDS: Dict[str, Tuple[float, float]] = {
+    'tilt': (0.0, 60.0),
+    'azimuth': (90.0, 270.0),
+    'dc_ac_ratio': (1.0, 1.5),
+    'ground_coverage_ratio': (0.2, 0.7)
+}
+
+# Evaluations are memoized on values rounded to these decimal places
+PARAMETER_DECIMALS: Dict[str, int] = {
+    'tilt': 1,
+    'azimuth': 1,
+    'dc_ac_ratio': 3,
+    'ground_coverage_ratio': 3
+}
+
+# objective -> (SolarResults attribute, sign that turns it into a minimisation)
+OBJECTIVES: Dict[str, Tuple[str, float]] = {
+    'energy': ('annual_energy', -1.0),
+    'lcoe': ('lcoe_real', 1.0)
+}
+
+def equator_facing_azimuth_bounds(lat: float) -> Tuple[float, float]:
+    """
+    Azimuth window (degrees clockwise from north) centred on the equator-facing
+    direction: south in the northern hemisphere, north (-90..90, wrapped into
+    0..360 when applied) in the southern
+    """
+    return (90.0, 270.0) if lat >= 0 else (-90.0, 90.0)
+
+@dataclass
+class OptimizationResult:
+    """Best design found by a DesignOptimizer run"""
+    best_config: Any
+    best_results: Any
+    objective: str
+    best_value: float
+    evaluations: int           # distinct designs simulated during this run
+    cache_hits: int            # evaluations served from the memo
+    iterations: int
+    converged: bool
+    history: List[Dict[str, Any]] = field(default_factory=list)
+
+class DesignOptimizer:
+    """
+    Maximise annual energy or minimise real LCOE over design parameters
+
+    Uses Nelder-Mead in the unit cube spanned by ``bounds`` (points are clipped
+    to the bounds), so no derivatives are needed and a 4-parameter search
+    typically converges in a few tens of simulations. Every evaluation is
+    memoized by design (parameter values rounded to ``PARAMETER_DECIMALS``),
+    weather and financial parameters; the memo lives on the optimizer, so
+    repeated runs from other starting points or with the other objective reuse
+    earlier simulations.
+
+    Without explicit ``bounds``, the azimuth window is centred on the
+    equator-facing direction at the site's latitude (the weather's, or the
+    default location's); azimuth bounds may run below 0 and are wrapped into
+    0..360 when a design is built.
+    """
+
+    def __init__(self,
+                 engine,
+                 objective: str = 'energy',
+                 bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+                 max_evaluations: int = 60,
+                 x_tolerance: float = 0.005,
+                 f_tolerance: float = 1e-4,
+                 initial_step: float = 0.15,
+                 max_concurrency: int = 8):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}', expected one of {tuple(OBJECTIVES)}")
+        self.engine = engine
+        self.objective = objective
+        self.bounds = dict(bounds or DEFAULT_BOUNDS)
+        self.site_azimuth = not bounds
+        self.parameters = list(self.bounds)
+        self.max_evaluations = max_evaluations
+        self.x_tolerance = x_tolerance
+        self.f_tolerance = f_tolerance
+        self.initial_step = initial_step
+        self.max_concurrency = max_concurrency
+
+        self._memo: Dict[str, asyncio.Future] = {}
+        self.stats = {'requested': 0, 'simulated': 0, 'memo_hits': 0}
+
+    # ---- evaluation -----------------------------------------------------
+
+    def site_bounds(self, weather=None) -> Dict[str, Tuple[float, float]]:
+        """Search bounds at the site of ``weather`` (default location without one)"""
+        if not self.site_azimuth:
+            return self.bounds
+        lat = float(weather.lat) if weather is not None else DEFAULT_LOCATION[0]
+        return {**self.bounds, 'azimuth': equator_facing_azimuth_bounds(lat)}
+
+    def _config_at(self, base_config, x: np.ndarray, lower: np.ndarray, span: np.ndarray):
+        values = lower + np.clip(x, 0.0, 1.0) * span
+        updates = {}
+        for param, value in zip(self.parameters, values):
+            decimals = PARAMETER_DECIMALS.get(param)
+            updates[param] = round(float(value), decimals) if decimals is not None else float(value)
+        if 'azimuth' in updates:
+            updates['azimuth'] %= 360.0  # rounding can land on 360
+        return replace(base_config, **updates)
+
+    def _start_point(self, base_config, lower: np.ndarray, span: np.ndarray) -> np.ndarray:
+        """``base_config`` in the unit cube, with azimuth unwrapped into its window"""
+        values = np.array([getattr(base_config, p) for p in self.parameters], dtype=np.float64)
+        if 'azimuth' in self.parameters:
+            i = self.parameters.index('azimuth')
+            values[i] = lower[i] + (values[i] - lower[i]) % 360.0
+        return np.clip((values - lower) / np.where(span > 0, span, 1.0), 0.0, 1.0)
+
+    def _financial_params(self, financial_params: Optional[Dict]) -> Optional[Dict]:
+        # LCOE needs the financial stage to run even without explicit parameters
+        if self.objective == 'lcoe' and not financial_params:
+            return dict(DEFAULT_FINANCIAL_PARAMS)
+        return financial_params
+
+    async def _evaluate(self, config, weather, financial_params, slots) -> Tuple[float, Any]:
+        mode = 'fallback' if self.engine.fallback_mode else 'pysam'
+        key = simulation_cache_key(config, weather, financial_params, mode=mode)
+        self.stats['requested'] += 1
+        future = self._memo.get(key)
+        if future is not None:
+            self.stats['memo_hits'] += 1
+            results = await asyncio.shield(future)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._memo[key] = future
+            self.stats['simulated'] += 1
+            try:
+                async with slots:
+                    results = await self.engine.run_solar_simulation(config, weather, financial_params)
+            except BaseException as e:
+                # Failed designs are not memoized
+                del self._memo[key]
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # retrieved here; the error propagates to this caller
+                raise
+            future.set_result(results)
+
+        attribute, sign = OBJECTIVES[self.objective]
+        value = sign * float(getattr(results, attribute))
+        return (value if np.isfinite(value) else np.inf), results
+
+    # ---- search ---------------------------------------------------------
+
+    async def optimize(self,
+                       base_config,
+                       weather=None,
+                       financial_params: Optional[Dict] = None) -> OptimizationResult:
+        """Search from ``base_config`` (clipped to the bounds); other fields stay fixed"""
+        financial_params = self._financial_params(financial_params)
+        bounds = self.site_bounds(weather)
+        lower = np.array([bounds[p][0] for p in self.parameters], dtype=np.float64)
+        span = np.array([bounds[p][1] - bounds[p][0] for p in self.parameters], dtype=np.float64)
+        slots = asyncio.Semaphore(self.max_concurrency)
+        stats_before = dict(self.stats)
+        history: List[Dict[str, Any]] = []
+
+        async def evaluate_all(points: List[np.ndarray]) -> List[float]:
+            configs = [self._config_at(base_config, x, lower, span) for x in points]
+            outcomes = await asyncio.gather(*[
+                self._evaluate(config, weather, financial_params, slots) for config in configs
+            ])
+            _, sign = OBJECTIVES[self.objective]
+            for config, (value, _) in zip(configs, outcomes):
+                history.append({**{p: getattr(config, p) for p in self.parameters}, 'value': sign * value})
+            return [value for value, _ in outcomes]
+
+        def simulated() -> int:
+            return self.stats['simulated'] - stats_before['simulated']
+
+        start = self._start_point(base_config, lower, span)
+
+        # Initial simplex: a step along each axis, away from the nearer bound
+        simplex = [start]
+        for i in range(len(self.parameters)):
+            vertex = start.copy()
+            vertex[i] += self.initial_step if start[i] + self.initial_step <= 1.0 else -self.initial_step
+            simplex.append(vertex)
+        simplex = np.array(simplex)
+        values = np.array(await evaluate_all(list(simplex)))
+
+        iterations = 0
+        converged = False
+        while simulated() < self.max_evaluations:
+            order = np.argsort(values)
+            simplex, values = simplex[order], values[order]
+            spread = np.max(np.abs(simplex[1:] - simplex[0]))
+            f_scale = max(abs(values[0]), 1e-12)
+            if spread <= self.x_tolerance or (np.isfinite(values[-1]) and
+                                              (values[-1] - values[0]) / f_scale <= self.f_tolerance):
+                converged = True
+                break
+            iterations += 1
+
+            centroid = simplex[:-1].mean(axis=0)
+            worst = simplex[-1]
+            reflected = np.clip(centroid + (centroid - worst), 0.0, 1.0)
+            f_reflected, = await evaluate_all([reflected])
+
+            if f_reflected < values[0]:
+                expanded = np.clip(centroid + 2.0 * (centroid - worst), 0.0, 1.0)
+                f_expanded, = await evaluate_all([expanded])
+                if f_expanded < f_reflected:
+                    simplex[-1], values[-1] = expanded, f_expanded
+                else:
+                    simplex[-1], values[-1] = reflected, f_reflected
+                continue
+            if f_reflected < values[-2]:
+                simplex[-1], values[-1] = reflected, f_reflected
+                continue
+
+            # Contract towards the better of the worst and reflected points
+            if f_reflected < values[-1]:
+                contracted = centroid + 0.5 * (reflected - centroid)
+            else:
+                contracted = centroid + 0.5 * (worst - centroid)
+            f_contracted, = await evaluate_all([contracted])
+            if f_contracted < min(f_reflected, values[-1]):
+                simplex[-1], values[-1] = contracted, f_contracted
+                continue
+
+            # Shrink every vertex towards the best one
+            simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+            values[1:] = await evaluate_all(list(simplex[1:]))
+
+        cache_hits = self.stats['memo_hits'] - stats_before['memo_hits']
+        best = int(np.argmin(values))
+        best_config = self._config_at(base_config, simplex[best], lower, span)
+        best_value, best_results = await self._evaluate(best_config, weather, financial_params, slots)
+        _, sign = OBJECTIVES[self.objective]
+
+        logger.info(f"Design optimization ({self.objective}) finished after {simulated()} simulations, "
+                    f"{iterations} iterations")
+        return OptimizationResult(
+            best_config=best_config,
+            best_results=best_results,
+            objective=self.objective,
+            best_value=sign * best_value,
+            evaluations=simulated(),
+            cache_hits=cache_hits,
+            iterations=iterations,
+            converged=converged,
+            history=history
+        )
+
+    def clear(self):
+        """Drop memoized evaluations"""
+        self._memo.clear()
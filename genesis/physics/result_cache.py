@@ -0,0 +1,208 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Simulation Result Cache
+Content-addressed cache for SolarResults with in-memory LRU and on-disk tiers
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, astuple, replace
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when simulation semantics change so stale disk entries are ignored
+CACHE_VERSION = 4
+
+WEATHER_SERIES = ('month', 'hour', 'dn', 'df', 'gh', 'wspd', 'tdry')
+
+class LRUCache:
+    """Small ordered-dict LRU with hit/miss/eviction counters (thread-safe: job threads share it)"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._entries[key]
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def _canonical(value: Any) -> Any:
+    """Convert parameters into a JSON-stable form"""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return [_canonical(v) for v in value.tolist()]
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, float) and value.is_integer():
+        # 60 and 60.0 describe the same design
+        return int(value)
+    return value
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+def weather_digest(weather) -> str:
+    """
+    Stable hash of a WeatherData's location and hourly series
+
+    Memoized on the object for as long as it holds the same location and
+    series objects, so assigning a new series rehashes; a series edited in
+    place must be edited on a copy of the WeatherData.
+    """
+    location = (weather.lat, weather.lon, weather.tz, weather.elev, weather.year)
+    series = tuple(getattr(weather, name) for name in WEATHER_SERIES)
+    memo = getattr(weather, '_digest', None)
+    if memo and memo[0] == location and all(a is b for a, b in zip(memo[1], series)):
+        return memo[2]
+
+    h = hashlib.sha256()
+    h.update(json.dumps(_canonical(list(location))).encode())
+    for name, values in zip(WEATHER_SERIES, series):
+        h.update(name.encode())
+        h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    digest = h.hexdigest()
+    weather._digest = (location, series, digest)
+    return digest
+
+def simulation_cache_key(config,
+                         weather=None,
+                         financial_params: Optional[Dict] = None,
+                         mode: str = '') -> str:
+    """Content hash of one (config, weather, financial_params) simulation request"""
+    payload = {
+        'version': CACHE_VERSION,
+        'mode': mode,
+        'config': _canonical(astuple(config)),
+        'weather': weather_digest(weather) if weather is not None else None,
+        'financial': _canonical(financial_params) if financial_params else None
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def copy_results(results):
+    """Copy a SolarResults so callers can't mutate cached lists"""
+    return replace(
+        results,
+        monthly_energy=list(results.monthly_energy),
+        ac_monthly=list(results.ac_monthly),
+        poa_monthly=list(results.poa_monthly),
+        messages=list(results.messages)
+    )
+
+class SimulationResultCache:
+    """
+    Two-tier cache of SolarResults keyed by simulation_cache_key
+
+    The memory tier is an LRU of ``max_entries`` results. If ``disk_dir`` is
+    given, every stored result is also written there as JSON so the cache
+    survives restarts; disk hits are promoted back into memory.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None):
+        self.memory = LRUCache(max_entries)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {'hits': 0, 'misses': 0, 'disk_hits': 0, 'disk_writes': 0}
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str):
+        """Return a copy of the cached result, or None"""
+        results = self.memory.get(key)
+        if results is None and self.disk_dir:
+            results = self._read_disk(key)
+            if results is not None:
+                self.stats['disk_hits'] += 1
+                self.memory.put(key, results)
+
+        if results is None:
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return copy_results(results)
+
+    def put(self, key: str, results):
+        """Store a successful result in memory (and on disk when enabled)"""
+        if not results.success:
+            return
+        self.memory.put(key, copy_results(results))
+        if self.disk_dir:
+            self._write_disk(key, results)
+
+    def _read_disk(self, key: str):
+        from .solar_engine import SolarResults
+
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return SolarResults(**json.load(f))
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, results):
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(asdict(results), f, default=_json_default)
+            tmp_path.replace(path)
+            self.stats['disk_writes'] += 1
+        except Exception as e:
+            logger.warning(f"Could not persist cache entry {key}: {e}")
+
+    def clear(self, disk: bool = False):
+        self.memory.clear()
+        if disk and self.disk_dir:
+            for path in self.disk_dir.glob('*/*.json'):
+                path.unlink()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            'evictions': self.memory.stats['evictions'],
+            'entries': len(self.memory)
+        }
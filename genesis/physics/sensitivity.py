@@ -0,0 +1,193 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Sensitivity Engine
+Concurrent, deduplicated and adaptively refined parameter sweeps
+"""
+
+import asyncio
+import logging
+from dataclasses import astuple, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Config fields that only take whole-number values
+INTEGER_FIELDS = {'module_type', 'array_type'}
+
+class SensitivityEngine:
+    """
+    Sensitivity analysis over SolarSystemConfig parameters
+
+    Every sample point across all parameters is simulated concurrently (bounded
+    by ``max_concurrency``) and identical configs are simulated only once per
+    run; grid points that fail design validation are never simulated and are
+    listed under 'pruned' in the result instead. After
+    the initial ``initial_points`` grid, intervals around points where the
+    response bends away from a straight line by more than
+    ``curvature_tolerance`` (relative to the base value) get a midpoint sample,
+    for up to ``max_refinements`` rounds.
+    """
+
+    def __init__(self,
+                 engine,
+                 max_concurrency: int = 8,
+                 initial_points: int = 5,
+                 max_refinements: int = 3,
+                 curvature_tolerance: float = 0.01,
+                 metric: str = 'annual_energy'):
+        self.engine = engine
+        self.max_concurrency = max_concurrency
+        self.initial_points = max(initial_points, 2)
+        self.max_refinements = max_refinements
+        self.curvature_tolerance = curvature_tolerance
+        self.metric = metric
+
+    async def run(self,
+                  base_config,
+                  parameter_ranges: Dict[str, Tuple[float, float]],
+                  weather=None,
+                  financial_params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Run the full sweep and return base case, per-parameter curves and tornado summary"""
+        slots = asyncio.Semaphore(self.max_concurrency)
+        tasks: Dict[tuple, asyncio.Task] = {}
+        stats = {'requested': 0, 'simulated': 0, 'deduplicated': 0, 'refinement_points': 0, 'pruned': 0}
+
+        async def simulate(config):
+            async with slots:
+                return await self.engine.run_solar_simulation(config, weather, financial_params)
+
+        def evaluate(config) -> asyncio.Task:
+            key = astuple(config)
+            stats['requested'] += 1
+            if key in tasks:
+                stats['deduplicated'] += 1
+            else:
+                tasks[key] = asyncio.ensure_future(simulate(config))
+                stats['simulated'] += 1
+            return tasks[key]
+
+        try:
+            base_task = evaluate(base_config)
+            candidates = [(param, value, self._with_value(base_config, param, value))
+                          for param, (min_val, max_val) in parameter_ranges.items()
+                          for value in self._initial_values(param, min_val, max_val)]
+            # Physically invalid sample points are reported rather than simulated
+            validation = self.engine.validate_designs([config for _, _, config in candidates])
+            stats['pruned'] = int(np.count_nonzero(~validation.valid))
+
+            samples: Dict[str, Dict[float, asyncio.Task]] = {param: {} for param in parameter_ranges}
+            pruned: Dict[str, List[Dict[str, Any]]] = {param: [] for param in parameter_ranges}
+            for i, (param, value, config) in enumerate(candidates):
+                if validation.valid[i]:
+                    samples[param][value] = evaluate(config)
+                else:
+                    pruned[param].append({'parameter_value': value, 'errors': validation.describe(i)['errors']})
+
+            base_case = await base_task
+            base_metric = getattr(base_case, self.metric)
+
+            for _ in range(self.max_refinements):
+                await asyncio.gather(*[t for points in samples.values() for t in points.values()],
+                                     return_exceptions=True)
+
+                added = 0
+                for param, points in samples.items():
+                    for value in self._refinement_values(param, points, base_metric):
+                        points[value] = evaluate(self._with_value(base_config, param, value))
+                        added += 1
+                if not added:
+                    break
+                stats['refinement_points'] += added
+
+            sensitivities = {}
+            for param, points in samples.items():
+                sensitivities[param] = await self._collect(param, points)
+
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        return {
+            'base_case': base_case,
+            'sensitivities': sensitivities,
+            'tornado': self._tornado(sensitivities, base_metric),
+            'pruned': pruned,
+            'evaluations': stats
+        }
+
+    def _initial_values(self, param: str, min_val: float, max_val: float) -> List[float]:
+        values = np.linspace(min_val, max_val, self.initial_points)
+        if param in INTEGER_FIELDS:
+            values = np.unique(np.round(values))
+        return [float(v) for v in values]
+
+    @staticmethod
+    def _with_value(base_config, param: str, value: float):
+        if param in INTEGER_FIELDS:
+            return replace(base_config, **{param: int(round(value))})
+        return replace(base_config, **{param: value})
+
+    def _refinement_values(self, param: str, points: Dict[float, asyncio.Task], base_metric: float) -> List[float]:
+        """Midpoints of intervals adjacent to points where the curve bends"""
+        xs, ys = [], []
+        for value in sorted(points):
+            task = points[value]
+            if task.done() and not task.cancelled() and task.exception() is None:
+                xs.append(value)
+                ys.append(getattr(task.result(), self.metric))
+        if len(xs) < 3:
+            return []
+
+        x = np.array(xs)
+        y = np.array(ys)
+        # Deviation of each interior point from the chord between its neighbours
+        t = (x[1:-1] - x[:-2]) / (x[2:] - x[:-2])
+        chord = y[:-2] + t * (y[2:] - y[:-2])
+        scale = max(abs(base_metric), 1e-9)
+        bent = np.abs(y[1:-1] - chord) / scale > self.curvature_tolerance
+
+        min_width = 2.0 if param in INTEGER_FIELDS else 0.0
+        new_values = set()
+        for i in np.nonzero(bent)[0] + 1:
+            for lo, hi in ((x[i - 1], x[i]), (x[i], x[i + 1])):
+                if hi - lo < min_width or hi - lo <= 1e-9 * max(abs(hi), 1.0):
+                    continue
+                mid = (lo + hi) / 2
+                if param in INTEGER_FIELDS:
+                    mid = float(round(mid))
+                if mid not in points:
+                    new_values.add(float(mid))
+        return sorted(new_values)
+
+    async def _collect(self, param: str, points: Dict[float, asyncio.Task]) -> List[Dict[str, Any]]:
+        param_results = []
+        for value in sorted(points):
+            try:
+                result = await points[value]
+                param_results.append({
+                    'parameter_value': value,
+                    'annual_energy': result.annual_energy,
+                    'capacity_factor': result.capacity_factor,
+                    'lcoe': result.lcoe_real,
+                    self.metric: getattr(result, self.metric)
+                })
+            except Exception as e:
+                logger.error(f"Sensitivity analysis error for {param}={value}: {e}")
+        return param_results
+
+    def _tornado(self, sensitivities: Dict[str, List[Dict[str, Any]]], base_metric: float) -> List[Dict[str, Any]]:
+        """Per-parameter swing of the metric, largest first"""
+        bars = []
+        for param, points in sensitivities.items():
+            if not points:
+                continue
+            values = [p[self.metric] for p in points]
+            bars.append({
+                'parameter': param,
+                'low': min(values),
+                'high': max(values),
+                'swing': max(values) - min(values),
+                'base': base_metric
+            })
+        return sorted(bars, key=lambda bar: bar['swing'], reverse=True)
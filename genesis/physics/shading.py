@@ -0,0 +1,155 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Shading Masks
+Horizon and row-to-row shade factors over a site's hourly sun positions, precomputed and cached per design
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .result_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+ROW_SHADING_ARRAY_TYPES = (0,)  # fixed racks; trackers are assumed to backtrack
+MASKING_SAMPLES = 16            # points up the module slant when averaging diffuse masking
+HORIZON_SAMPLES = 360           # azimuth steps when integrating the horizon's sky view
+
+@dataclass(frozen=True)
+class SiteShading:
+    """
+    Shading of one site: a horizon profile (elevation in degrees at each
+    azimuth, clockwise from north, interpolated around the circle) and whether
+    rows of a fixed array shade each other at the design's ground coverage ratio
+    """
+    horizon_azimuth: Tuple[float, ...] = ()
+    horizon_elevation: Tuple[float, ...] = ()
+    row_shading: bool = True
+
+    @classmethod
+    def from_horizon(cls, profile: Dict[float, float], row_shading: bool = True) -> 'SiteShading':
+        """From an {azimuth: elevation} mapping"""
+        azimuths = sorted(profile)
+        return cls(tuple(float(a) for a in azimuths), tuple(float(profile[a]) for a in azimuths), row_shading)
+
+    @property
+    def key(self) -> str:
+        """Short stable identifier (used in simulation cache keys)"""
+        return f"h{list(zip(self.horizon_azimuth, self.horizon_elevation))}r{int(self.row_shading)}"
+
+    def horizon_at(self, azimuth: np.ndarray) -> np.ndarray:
+        if not self.horizon_azimuth:
+            return np.zeros_like(azimuth, dtype=np.float64)
+        return np.interp(azimuth, self.horizon_azimuth, self.horizon_elevation, period=360)
+
+@dataclass
+class ShadeMask:
+    """Multipliers for one design at one site"""
+    beam: np.ndarray   # (hours,) float32 in [0, 1]: unshaded fraction of beam (and circumsolar) irradiance
+    diffuse: float     # unshaded fraction of isotropic sky diffuse
+
+def row_shaded_fraction(sun_elevation: np.ndarray, sun_azimuth: np.ndarray,
+                        tilt: float, azimuth: float, gcr: float) -> np.ndarray:
+    """
+    Shaded fraction of a row's slant height cast by the row in front, from the
+    sun's profile angle: 1 - sin(p) / (gcr * sin(p + tilt)), zero with the sun
+    behind the array
+    """
+    if tilt <= 0 or gcr <= 0:
+        return np.zeros_like(sun_elevation, dtype=np.float64)
+    elevation = np.radians(sun_elevation)
+    facing = np.cos(np.radians(sun_azimuth - azimuth))
+    profile = np.arctan2(np.sin(elevation), np.cos(elevation) * np.maximum(facing, 1e-9))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shaded = 1 - np.sin(profile) / (gcr * np.sin(profile + np.radians(tilt)))
+    return np.where((facing > 0) & (sun_elevation > 0), np.clip(shaded, 0.0, 1.0), 0.0)
+
+def row_diffuse_loss(tilt: float, gcr: float) -> float:
+    """
+    Fraction of sky diffuse blocked by the row in front (Passias:
+    sin^2(masking angle / 2)), averaged over the module's slant height
+    """
+    if tilt <= 0 or gcr <= 0:
+        return 0.0
+    beta = np.radians(tilt)
+    # Distance below the row's top edge, as a fraction of its slant height
+    depth = (np.arange(MASKING_SAMPLES) + 0.5) / MASKING_SAMPLES
+    masking = np.arctan2(depth * np.sin(beta), 1 / gcr - depth * np.cos(beta))
+    return float(np.mean(np.sin(masking / 2) ** 2))
+
+def horizon_sky_view(shading: SiteShading) -> float:
+    """Fraction of isotropic sky left above the horizon profile"""
+    if not shading.horizon_azimuth:
+        return 1.0
+    elevation = np.radians(np.clip(shading.horizon_at(np.arange(HORIZON_SAMPLES) * 360 / HORIZON_SAMPLES), 0, 90))
+    return float(1 - np.mean(np.sin(elevation) ** 2))
+
+def compute_shade_mask(position, shading: SiteShading,
+                       tilt: float, azimuth: float, gcr: float, array_type: int) -> ShadeMask:
+    """ShadeMask for one design over every hour of ``position`` (a SolarPosition)"""
+    sun_elevation = 90 - np.asarray(position.zenith, dtype=np.float64)
+    sun_azimuth = np.asarray(position.azimuth, dtype=np.float64)
+
+    beam = (sun_elevation > shading.horizon_at(sun_azimuth)).astype(np.float64)
+    diffuse = horizon_sky_view(shading)
+    if shading.row_shading and array_type in ROW_SHADING_ARRAY_TYPES:
+        beam *= 1 - row_shaded_fraction(sun_elevation, sun_azimuth, tilt, azimuth, gcr)
+        diffuse *= 1 - row_diffuse_loss(tilt, gcr)
+
+    beam = beam.astype(np.float32)
+    beam.flags.writeable = False
+    return ShadeMask(beam=beam, diffuse=float(diffuse))
+
+class ShadingCache:
+    """
+    Shade masks per (site, shading, design geometry)
+
+    A mask depends only on the site's sun positions, its shading profile and
+    the design's tilt, azimuth, ground coverage ratio and array type, so
+    repeat simulations of the same roof reuse it and shading costs one array
+    multiply per run.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.memory = LRUCache(max_entries)
+
+    def mask(self, site_key, position, shading: SiteShading,
+             tilt: float, azimuth: float, gcr: float, array_type: int) -> ShadeMask:
+        key = (site_key, shading, float(tilt), float(azimuth), float(gcr), int(array_type))
+        mask = self.memory.get(key)
+        if mask is None:
+            mask = compute_shade_mask(position, shading, tilt, azimuth, gcr, array_type)
+            self.memory.put(key, mask)
+        return mask
+
+    def masks(self, site_key, position, shading: SiteShading,
+              arrays: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """(configs, hours) beam and (configs, 1) diffuse factors for packed config columns"""
+        designs = np.stack([arrays['tilt'], arrays['azimuth'], arrays['ground_coverage_ratio'],
+                            arrays['array_type']], axis=1).astype(np.float64)
+        unique, inverse = np.unique(designs, axis=0, return_inverse=True)
+        found = [self.mask(site_key, position, shading, *row[:3], int(row[3])) for row in unique]
+        beam = np.stack([m.beam for m in found])[inverse.reshape(-1)]
+        diffuse = np.array([m.diffuse for m in found])[inverse.reshape(-1)][:, None]
+        return beam, diffuse
+
+    def clear(self):
+        self.memory.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.memory.stats, 'entries': len(self.memory)}
+
+_shading_cache = ShadingCache()
+
+def shading_cache() -> ShadingCache:
+    """The process-wide shade mask cache"""
+    return _shading_cache
+
+def weather_shade_masks(weather, position, shading: SiteShading,
+                        arrays: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Cached shade factors for packed configs at a WeatherData's site"""
+    site_key = (round(float(weather.lat), 4), round(float(weather.lon), 4), float(weather.tz),
+                int(getattr(weather, 'year', 0) or 0), len(weather.gh))
+    return shading_cache().masks(site_key, position, shading, arrays)
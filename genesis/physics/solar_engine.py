@@ -4,13 +4,35 @@ NREL PySAM Integration for Ground Truth Solar Calculations
 """
 
 import asyncio
+import importlib
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+import time
+from typing import Dict, List, Optional, Tuple, Any, Sequence
+from dataclasses import dataclass, fields
 import numpy as np
 from datetime import datetime, timedelta
 
+from .battery import DispatchResults, battery_columns, simulate_dispatch
+from .clipping import DEFAULT_DC_AC_RATIOS, ClippingSweep, clipping_sweep
+from .executor import SimulationExecutor, run_pysam_energy_in_worker, run_pysam_financial_in_worker
+from .financial import DEFAULT_FINANCIAL_PARAMS, FinancialResults, evaluate_cash_flows
+from .irradiance import (HourlyProduction, monthly_totals, simulate_hourly,
+                         synthetic_weather, weather_solar_position)
+from .lifetime import lifetime_production
+from .model_pool import DEFAULT_LOCATION, PvsamModelPool
+from .monte_carlo import MonteCarloResults, MonteCarloSimulator, STREAM_CHUNK_SIZE
+from .optimizer import DesignOptimizer, OptimizationResult
+from .result_cache import LRUCache, SimulationResultCache, copy_results, simulation_cache_key
+from .sensitivity import SensitivityEngine
+from .shading import SiteShading, weather_shade_masks
+from .station_index import StationIndex
+from .surrogate import SURROGATE_MESSAGE, SurrogateEstimate, SurrogateModel
+from .tariff import BillSavings, bill_savings, compile_tariff
+from .validation import DesignValidation, validate_designs
+from .weather_files import read_weather_file
+from .weather_store import WEATHER_COLUMNS, load_weather
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -28,20 +50,63 @@ class SolarSystemConfig:
     
 @dataclass 
 class WeatherData:
-    """Weather data for solar calculations"""
+    """
+    Weather data for solar calculations
+    
+    Hourly series may be Python lists or NumPy arrays (e.g. memory-mapped via
+    weather_store.load_weather); lists are only materialised for PySAM.
+    """
     lat: float
     lon: float
     tz: float
     elev: float
     year: int
-    month: List[int]
-    hour: List[int]
-    dn: List[float]      # Direct normal irradiance
-    df: List[float]      # Diffuse horizontal irradiance  
-    gh: List[float]      # Global horizontal irradiance
-    wspd: List[float]    # Wind speed
-    tdry: List[float]    # Dry bulb temperature
+    month: Sequence[int]
+    hour: Sequence[int]
+    dn: Sequence[float]      # Direct normal irradiance
+    df: Sequence[float]      # Diffuse horizontal irradiance  
+    gh: Sequence[float]      # Global horizontal irradiance
+    wspd: Sequence[float]    # Wind speed
+    tdry: Sequence[float]    # Dry bulb temperature
     
+    @classmethod
+    def from_arrays(cls, lat: float, lon: float, tz: float, elev: float, year: int,
+                    dtype=np.float32, **series) -> 'WeatherData':
+        """Build a compact NumPy-backed WeatherData from hourly series"""
+        columns = {name: np.ascontiguousarray(series[name], dtype=dtype) for name in WEATHER_COLUMNS}
+        return cls(lat=lat, lon=lon, tz=tz, elev=elev, year=year, **columns)
+        
+    @classmethod
+    def from_file(cls, path: str, cache_dir: Optional[str] = None) -> 'WeatherData':
+        """Load a TMY3/NSRDB CSV or EPW file (cached as a binary sidecar, see weather_files)"""
+        return read_weather_file(path, cache_dir=cache_dir)
+        
+    def column(self, name: str) -> np.ndarray:
+        """One hourly series as a float64 array"""
+        return np.asarray(getattr(self, name), dtype=np.float64)
+        
+    def to_resource_data(self) -> Dict[str, Any]:
+        """PySAM solar_resource_data dict (the only place series become lists)"""
+        n_hours = len(self.gh)
+        data = {
+            'lat': float(self.lat),
+            'lon': float(self.lon),
+            'tz': float(self.tz),
+            'elev': float(self.elev),
+            'year': [int(self.year)] * n_hours
+        }
+        for name in WEATHER_COLUMNS:
+            series = getattr(self, name)
+            data[name] = series.tolist() if isinstance(series, np.ndarray) else series
+        return data
+        
+    def __reduce_ex__(self, protocol):
+        # Memory-mapped weather crosses process boundaries as its file path
+        source = getattr(self, '_mmap_source', None)
+        if source:
+            return (load_weather, (source,))
+        return super().__reduce_ex__(protocol)
+        
 @dataclass
 class SolarResults:
     """Results from PySAM solar simulation"""
@@ -56,6 +121,82 @@ class SolarResults:
     poa_monthly: List[float]   # Plane of array irradiance monthly
     success: bool
     messages: List[str]
+    
+    def lifetime_energy(self, financial_params: Optional[Dict] = None) -> np.ndarray:
+        """(1, years, 12) kWh over the analysis period, ready for evaluate_cash_flows"""
+        return lifetime_production(np.reshape(self.monthly_energy, (1, 12)), financial_params)
+
+# Fallback model constants shared by the scalar and batch code paths
+FALLBACK_ANNUAL_IRRADIANCE = 1800.0  # kWh/m²/year, typical for good solar location
+FALLBACK_TZ = -8.0       # time zone of the default location
+BATCH_CHUNK_SIZE = 256   # configs per (configs x 8760) hourly block
+GENERATION_CACHE_SIZE = 128  # physical designs whose energy stage is kept for financial-only reruns
+PYSAM_MODULES = {
+    'pv': 'PySAM.Pvsamv1',
+    'grid': 'PySAM.Grid',
+    'ur': 'PySAM.Utilityrate5',
+    'cl': 'PySAM.Cashloan'
+}
+# (results, hourly AC generation, hourly unclipped DC) of an energy simulation
+EnergyStage = Tuple[SolarResults, Optional[np.ndarray], Optional[np.ndarray]]
+
+FALLBACK_MESSAGE = "Fallback physics simulation - estimates only (PySAM recommended for accuracy)"
+PYSAM_SHADING_FLAGS = ('subarray1_shading_en_timestep', 'subarray1_shading_en_diff')
+SHADING_SKIPPED_MESSAGE = "Shading skipped - PySAM runs need site weather (or a location) to place the shade masks"
+
+CONFIG_FIELDS = tuple(f.name for f in fields(SolarSystemConfig))
+
+def pack_configs(configs: Sequence[SolarSystemConfig]) -> Dict[str, np.ndarray]:
+    """
+    Pack a sequence of configs into one float64 column per SolarSystemConfig field.
+    Already-packed column dicts are passed through (as arrays) unchanged.
+    """
+    if isinstance(configs, dict):
+        return {name: np.asarray(configs[name], dtype=np.float64) for name in CONFIG_FIELDS}
+        
+    rows = np.array([[getattr(c, name) for name in CONFIG_FIELDS] for c in configs], dtype=np.float64)
+    rows = rows.reshape(len(configs), len(CONFIG_FIELDS))
+    return {name: rows[:, i] for i, name in enumerate(CONFIG_FIELDS)}
+
+@dataclass
+class BatchSimulationResults:
+    """Columnar results from a vectorized batch simulation (one row per config)"""
+    annual_energy: np.ndarray    # (n,) kWh/year
+    monthly_energy: np.ndarray   # (n, 12) kWh/month
+    capacity_factor: np.ndarray  # (n,) %
+    lcoe_real: np.ndarray        # (n,) $/kWh
+    npv: np.ndarray              # (n,) $
+    payback_period: np.ndarray   # (n,) years
+    irr: np.ndarray              # (n,) %
+    poa_monthly: np.ndarray      # (n, 12) kWh/m²/month
+    messages: List[str]
+    
+    def __len__(self) -> int:
+        return len(self.annual_energy)
+        
+    def lifetime_energy(self, financial_params: Optional[Dict] = None) -> np.ndarray:
+        """(n, years, 12) kWh over the analysis period, ready for evaluate_cash_flows"""
+        return lifetime_production(self.monthly_energy, financial_params)
+        
+    def to_results(self) -> List[SolarResults]:
+        """Expand into per-config SolarResults (for callers expecting the scalar API)"""
+        results = []
+        for i in range(len(self)):
+            monthly = self.monthly_energy[i].tolist()
+            results.append(SolarResults(
+                annual_energy=float(self.annual_energy[i]),
+                monthly_energy=monthly,
+                capacity_factor=float(self.capacity_factor[i]),
+                lcoe_real=float(self.lcoe_real[i]),
+                npv=float(self.npv[i]),
+                payback_period=float(self.payback_period[i]),
+                irr=float(self.irr[i]),
+                ac_monthly=list(monthly),
+                poa_monthly=self.poa_monthly[i].tolist(),
+                success=True,
+                messages=list(self.messages)
+            ))
+        return results
 
 class PhysicsEngine:
     """
@@ -63,95 +204,357 @@ class PhysicsEngine:
     Prevents hallucination by providing real solar calculations
     """
     
-    def __init__(self):
-        self.pysam_available = False
-        self.fallback_mode = True
-        self._initialize_pysam()
+    def __init__(self, executor: Optional[SimulationExecutor] = None):
+        self.executor = executor
+        self.result_cache: Optional[SimulationResultCache] = None
+        self.surrogate: Optional[SurrogateModel] = None
+        self.model_pool = PvsamModelPool(self)
+        self.generation_cache = LRUCache(GENERATION_CACHE_SIZE)
+        self.startup_timings: Dict[str, float] = {}
+        self.station_index: Optional[StationIndex] = None
+        self.max_station_distance_km: Optional[float] = None
+        # PySAM is imported on first use (see _initialize_pysam)
+        self._pysam_available: Optional[bool] = None
+        self._pysam_modules: Dict[str, Any] = {}
+        self._forced_fallback = False
+        
+    def _initialize_pysam(self) -> bool:
+        """Import PySAM on first use; Pvsamv1 decides whether it is available"""
+        if self._pysam_available is None:
+            started = time.perf_counter()
+            try:
+                self._pysam_modules['pv'] = importlib.import_module(PYSAM_MODULES['pv'])
+                self._pysam_available = True
+                logger.info("PySAM successfully initialized - Ground truth physics enabled")
+            except ImportError:
+                self._pysam_available = False
+                logger.warning("PySAM not available - Using fallback physics models")
+            self.startup_timings['pysam_import'] = time.perf_counter() - started
+        return self._pysam_available
+        
+    def _pysam_module(self, name: str):
+        """One PySAM module (pv, grid, ur, cl), imported the first time it is needed"""
+        module = self._pysam_modules.get(name)
+        if module is None:
+            if not self._initialize_pysam():
+                raise ImportError("PySAM not available")
+            module = self._pysam_modules[name] = importlib.import_module(PYSAM_MODULES[name])
+        return module
+        
+    @property
+    def pysam_available(self) -> bool:
+        return self._initialize_pysam()
+        
+    @property
+    def fallback_mode(self) -> bool:
+        return self._forced_fallback or not self._initialize_pysam()
+        
+    @fallback_mode.setter
+    def fallback_mode(self, value: bool):
+        self._forced_fallback = bool(value)
+        
+    @property
+    def pv(self):
+        return self._pysam_module('pv')
+        
+    @property
+    def grid(self):
+        return self._pysam_module('grid')
+        
+    @property
+    def ur(self):
+        return self._pysam_module('ur')
+        
+    @property
+    def cl(self):
+        return self._pysam_module('cl')
+        
+    def warm_up(self) -> Dict[str, float]:
+        """
+        Pay the one-off start-up costs now instead of on the first simulation:
+        PySAM imports plus a pooled model when available, otherwise the
+        fallback's default weather year. Returns the timings (seconds).
+        """
+        started = time.perf_counter()
+        if self.pysam_available:
+            self._pysam_module('cl')
+            with self.model_pool.model(SolarSystemConfig(
+                    system_capacity=1.0, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                    ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)):
+                pass
+        else:
+            weather_solar_position(self._resolve_fallback_weather(None))
+        self.startup_timings['warm_up'] = time.perf_counter() - started
+        return dict(self.startup_timings)
+        
+    def configure_executor(self,
+                           max_workers: Optional[int] = None,
+                           max_in_flight: Optional[int] = None) -> SimulationExecutor:
+        """
+        Run PySAM simulations in a process pool instead of on the event loop
+        """
+        self.shutdown_executor()
+        self.executor = SimulationExecutor(max_workers=max_workers, max_in_flight=max_in_flight)
+        self.executor.start()
+        return self.executor
+        
+    def shutdown_executor(self, wait: bool = True):
+        """Stop the process pool and cancel simulations that have not started"""
+        if self.executor:
+            self.executor.shutdown(wait=wait, cancel_pending=True)
+            self.executor = None
+            
+    def enable_result_cache(self,
+                            max_entries: int = 256,
+                            disk_dir: Optional[str] = None) -> SimulationResultCache:
+        """
+        Serve repeated (config, weather, financial_params) requests from a result cache
+        """
+        self.result_cache = SimulationResultCache(max_entries=max_entries, disk_dir=disk_dir)
+        return self.result_cache
+        
+    def disable_result_cache(self):
+        self.result_cache = None
+        
+    def enable_surrogate(self, kind: str = 'polynomial', tolerance: float = 0.02, **kwargs) -> SurrogateModel:
+        """
+        Answer run_solar_simulation from a regression fitted to earlier results
+        at the same location when it is confident to within ``tolerance``
+        (relative annual energy); see SurrogateModel. In PySAM mode, requests
+        with financial_params are always simulated, since Cashloan needs the
+        hourly generation profile a surrogate does not estimate.
+        """
+        self.surrogate = SurrogateModel(kind=kind, tolerance=tolerance, **kwargs)
+        return self.surrogate
+        
+    def disable_surrogate(self):
+        self.surrogate = None
+        
+    def attach_weather_library(self,
+                               directory: str,
+                               cache_dir: Optional[str] = None,
+                               max_distance_km: Optional[float] = None) -> StationIndex:
+        """
+        Resolve sites to their nearest weather station in an on-disk TMY3/EPW library
+        """
+        self.station_index = StationIndex.from_directory(directory, cache_dir=cache_dir)
+        self.max_station_distance_km = max_distance_km
+        return self.station_index
+        
+    def weather_for_location(self, lat: float, lon: float) -> Optional[WeatherData]:
+        """Nearest station's WeatherData, or None without a library or within max distance"""
+        if self.station_index is None:
+            return None
+        weather = self.station_index.nearest_weather(lat, lon, self.max_station_distance_km)
+        if weather is None:
+            logger.warning(f"No weather station within {self.max_station_distance_km} km of ({lat}, {lon})")
+        return weather
         
-    def _initialize_pysam(self):
-        """Initialize PySAM library"""
-        try:
-            import PySAM.Pvsamv1 as pv
-            import PySAM.Grid as grid
-            import PySAM.Utilityrate5 as ur
-            import PySAM.Cashloan as cl
-            
-            self.pv = pv
-            self.grid = grid 
-            self.ur = ur
-            self.cl = cl
-            self.pysam_available = True
-            self.fallback_mode = False
-            
-            logger.info("PySAM successfully initialized - Ground truth physics enabled")
-            
-        except ImportError:
-            logger.warning("PySAM not available - Using fallback physics models")
-            self.fallback_mode = True
-            
     async def run_solar_simulation(self, 
                                    config: SolarSystemConfig, 
                                    weather: Optional[WeatherData] = None,
-                                   financial_params: Optional[Dict] = None) -> SolarResults:
+                                   financial_params: Optional[Dict] = None,
+                                   location: Optional[Tuple[float, float]] = None,
+                                   shading: Optional[SiteShading] = None) -> SolarResults:
         """
         Run complete solar system simulation using PySAM
+        
+        Without ``weather``, a (lat, lon) ``location`` is resolved to the nearest
+        station of the attached weather library. ``shading`` applies the site's
+        horizon and row-to-row shade masks (see shading.py); PySAM runs without
+        weather skip it and say so in the messages. With a surrogate enabled,
+        designs it can estimate confidently skip the simulation; every
+        simulated result is added to its training set.
+        """
+        if weather is None and location is not None:
+            weather = self.weather_for_location(*location)
+            
+        mode = self._simulation_mode(shading)
+        key = None
+        if self.result_cache is not None:
+            key = simulation_cache_key(config, weather, financial_params, mode=mode)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+                
+        # Surrogate finance is the NumPy model, so it only stands in where that is what runs
+        if self.surrogate is not None and (self.fallback_mode or not financial_params):
+            estimate = self.surrogate.predict(config, weather, mode)
+            if estimate is not None:
+                return await self._surrogate_results(config, estimate, financial_params)
+                
+        results = await self._run_uncached_simulation(config, weather, financial_params, shading)
+        # A PySAM failure falls back internally; don't file those under the PySAM key
+        if not mode.startswith('pysam') or FALLBACK_MESSAGE not in results.messages:
+            if key is not None:
+                self.result_cache.put(key, results)
+            if self.surrogate is not None:
+                self.surrogate.observe(config, weather, results, mode)
+        return results
+        
+    def _simulation_mode(self, shading: Optional[SiteShading] = None) -> str:
+        """Cache-key mode: which physics ran, and under which shading"""
+        mode = 'fallback' if self.fallback_mode else 'pysam'
+        return mode if shading is None else f"{mode}:{shading.key}"
+        
+    async def _surrogate_results(self,
+                                 config: SolarSystemConfig,
+                                 estimate: SurrogateEstimate,
+                                 financial_params: Optional[Dict] = None) -> SolarResults:
+        """SolarResults from a surrogate estimate, with the vectorized financial model"""
+        monthly = estimate.monthly_energy.tolist()
+        annual_energy = float(estimate.monthly_energy.sum())
+        results = SolarResults(
+            annual_energy=annual_energy,
+            monthly_energy=monthly,
+            capacity_factor=annual_energy / (config.system_capacity * 8760) * 100,
+            lcoe_real=0.0,
+            npv=0.0,
+            payback_period=0.0,
+            irr=0.0,
+            ac_monthly=list(monthly),
+            poa_monthly=estimate.poa_monthly.tolist(),
+            success=True,
+            messages=[f"{SURROGATE_MESSAGE} (±{estimate.error * 100:.1f}%)"]
+        )
+        if financial_params:
+            results = await self._financial_stage(results, config, financial_params, None)
+        return results
+        
+    async def _run_uncached_simulation(self,
+                                       config: SolarSystemConfig,
+                                       weather: Optional[WeatherData] = None,
+                                       financial_params: Optional[Dict] = None,
+                                       shading: Optional[SiteShading] = None) -> SolarResults:
+        """
+        Energy stage then financial stage
+        
+        The generation profile is cached per physical design (config + weather),
+        so a request that only changes financial_params re-runs just the
+        financial stage.
+        """
+        energy_results, gen, _ = await self._cached_energy_stage(config, weather, shading)
+        results = copy_results(energy_results)
+        if financial_params:
+            results = await self._financial_stage(results, config, financial_params, gen)
+        return results
+        
+    async def _cached_energy_stage(self,
+                                   config: SolarSystemConfig,
+                                   weather: Optional[WeatherData] = None,
+                                   shading: Optional[SiteShading] = None) -> EnergyStage:
+        """_energy_stage through the generation cache"""
+        mode = self._simulation_mode(shading)
+        energy_key = simulation_cache_key(config, weather, None, mode=mode)
+        stage = self.generation_cache.get(energy_key)
+        if stage is None:
+            stage = await self._energy_stage(config, weather, shading)
+            # A PySAM failure falls back internally; don't file those under the PySAM key
+            if not mode.startswith('pysam') or FALLBACK_MESSAGE not in stage[0].messages:
+                self.generation_cache.put(energy_key, stage)
+        return stage
+        
+    async def _energy_stage(self,
+                            config: SolarSystemConfig,
+                            weather: Optional[WeatherData] = None,
+                            shading: Optional[SiteShading] = None) -> EnergyStage:
+        """
+        Energy simulation only: (results, hourly AC generation, hourly unclipped
+        DC), the profiles None for the fallback
         """
         if self.fallback_mode:
-            return await self._fallback_simulation(config, weather, financial_params)
+            return await self._fallback_simulation(config, weather, shading=shading), None, None
             
         try:
-            # Create PySAM model instances
-            system_model = self.pv.new()
-            grid_model = self.grid.new()
-            
-            # Configure solar resource (weather data)
-            if weather:
-                self._configure_weather_data(system_model, weather)
+            if self.executor:
+                # PySAM blocks for the whole run - keep it off the event loop
+                results, gen, dc = await self.executor.run(run_pysam_energy_in_worker, config, weather, shading)
             else:
-                # Use default weather data for simulation location
-                self._configure_default_weather(system_model, lat=35.0, lon=-119.0)
-            
-            # Configure system design
-            self._configure_system_design(system_model, config)
-            
-            # Configure losses and performance
-            self._configure_system_losses(system_model, config)
-            
-            # Execute simulation
-            system_model.execute()
-            
-            # Extract results
-            results = self._extract_simulation_results(system_model, config)
-            
-            # Add financial analysis if parameters provided
-            if financial_params:
-                results = await self._add_financial_analysis(results, financial_params, system_model)
-            
+                results, gen, dc = self._simulate_pysam_energy(config, weather, shading)
+                
             logger.info(f"PySAM simulation completed: {results.annual_energy:.1f} kWh/year, CF: {results.capacity_factor:.1f}%")
-            return results
+            return results, gen, dc
+            
+        except asyncio.CancelledError:
+            raise
             
         except Exception as e:
             logger.error(f"PySAM simulation error: {e}")
             # Fall back to simplified model
-            return await self._fallback_simulation(config, weather, financial_params)
+            return await self._fallback_simulation(config, weather, shading=shading), None, None
+            
+    async def _financial_stage(self,
+                               results: SolarResults,
+                               config: SolarSystemConfig,
+                               financial_params: Dict,
+                               gen: Optional[np.ndarray]) -> SolarResults:
+        """Financial analysis on top of an energy result"""
+        if gen is None:
+            # Fallback energy - use the vectorized cash-flow engine
+            finance = evaluate_cash_flows(results.annual_energy, config.system_capacity, financial_params)
+            results.lcoe_real = float(finance.lcoe_real[0])
+            results.npv = float(finance.npv[0])
+            results.payback_period = float(finance.payback_period[0])
+            results.irr = float(finance.irr[0])
+            return results
             
+        if self.executor:
+            return await self.executor.run(run_pysam_financial_in_worker, results, financial_params, gen)
+        return self._run_financial_model(results, financial_params, gen)
+        
+    def _simulate_pysam_energy(self,
+                               config: SolarSystemConfig,
+                               weather: Optional[WeatherData] = None,
+                               shading: Optional[SiteShading] = None) -> EnergyStage:
+        """Blocking Pvsamv1 run; returns results and the hourly AC generation and unclipped DC profiles"""
+        skip_shading = shading is not None and (weather is None or not len(weather.gh))
+        if skip_shading:
+            # PySAM's built-in resource year is not at a known site, so masks would be for the wrong sun
+            logger.warning(SHADING_SKIPPED_MESSAGE)
+            shading = None
+        # Pooled models already carry the weather and losses; only the design delta is applied
+        with self.model_pool.model(config, weather) as system_model:
+            if shading is not None:
+                self._configure_shading(system_model, config, weather, shading)
+            try:
+                # Execute simulation
+                system_model.execute()
+                
+                # Extract results
+                results = self._extract_simulation_results(system_model, config)
+                gen = np.asarray(system_model.Outputs.gen, dtype=np.float64)
+                # Inverter DC input, ahead of clipping
+                dc = np.asarray(system_model.Outputs.dc_net, dtype=np.float64)
+            finally:
+                if shading is not None:
+                    # Pooled models are reused by unshaded runs
+                    self._clear_shading(system_model)
+            
+        if skip_shading:
+            results.messages.append(SHADING_SKIPPED_MESSAGE)
+        return results, gen, dc
+        
+    def _configure_shading(self, model, config: SolarSystemConfig, weather: WeatherData, shading: SiteShading):
+        """Feed the cached shade masks to Pvsamv1 as timestep beam and diffuse shading losses (%)"""
+        beam, diffuse = weather_shade_masks(weather, weather_solar_position(weather), shading, pack_configs([config]))
+        model.Shading.subarray1_shading_timestep = [[float(loss)] for loss in (1 - beam[0]) * 100]
+        model.Shading.subarray1_shading_diff = float((1 - diffuse[0, 0]) * 100)
+        for flag in PYSAM_SHADING_FLAGS:
+            if hasattr(model.Shading, flag):
+                setattr(model.Shading, flag, 1)
+                
+    def _clear_shading(self, model):
+        n_hours = len(model.Shading.subarray1_shading_timestep)
+        model.Shading.subarray1_shading_timestep = [[0.0]] * n_hours
+        model.Shading.subarray1_shading_diff = 0.0
+        for flag in PYSAM_SHADING_FLAGS:
+            if hasattr(model.Shading, flag):
+                setattr(model.Shading, flag, 0)
+        
     def _configure_weather_data(self, model, weather: WeatherData):
         """Configure weather data in PySAM model"""
-        # Set location
-        model.SolarResource.solar_resource_data = {
-            'lat': weather.lat,
-            'lon': weather.lon, 
-            'tz': weather.tz,
-            'elev': weather.elev,
-            'year': [weather.year] * 8760,
-            'month': weather.month,
-            'hour': weather.hour,
-            'dn': weather.dn,
-            'df': weather.df,
-            'gh': weather.gh,
-            'wspd': weather.wspd,
-            'tdry': weather.tdry
-        }
+        # Set location and hourly resource
+        model.SolarResource.solar_resource_data = weather.to_resource_data()
         
     def _configure_default_weather(self, model, lat: float, lon: float):
         """Configure default weather data for location"""
@@ -222,6 +625,10 @@ class PhysicsEngine:
         
     async def _add_financial_analysis(self, results: SolarResults, financial_params: Dict, model) -> SolarResults:
         """Add financial analysis using PySAM financial models"""
+        return self._run_financial_model(results, financial_params, model.Outputs.gen)
+        
+    def _run_financial_model(self, results: SolarResults, financial_params: Dict, gen) -> SolarResults:
+        """Run the PySAM Cashloan model against an hourly generation profile"""
         try:
             # Create financial model
             cashflow = self.cl.new()
@@ -238,7 +645,7 @@ class PhysicsEngine:
             cashflow.SystemCosts.total_installed_cost = financial_params.get('installed_cost_per_watt', 2.5) * results.annual_energy / 1200 * 1000  # Rough estimate
             
             # System output (link to PV model)
-            cashflow.SystemOutput.gen = model.Outputs.gen
+            cashflow.SystemOutput.gen = gen.tolist() if isinstance(gen, np.ndarray) else gen
             
             # Execute financial analysis
             cashflow.execute()
@@ -260,145 +667,328 @@ class PhysicsEngine:
     async def _fallback_simulation(self, 
                                    config: SolarSystemConfig,
                                    weather: Optional[WeatherData] = None,
-                                   financial_params: Optional[Dict] = None) -> SolarResults:
+                                   financial_params: Optional[Dict] = None,
+                                   shading: Optional[SiteShading] = None) -> SolarResults:
         """
         Fallback simulation using simplified models when PySAM unavailable
         """
         logger.warning("Using fallback physics simulation - results are estimates only")
         
-        # Simplified solar calculation
-        # Base irradiance assumption (kWh/m²/year)
-        annual_irradiance = 1800.0  # Typical for good solar location
+        batch = self._fallback_batch(pack_configs([config]), weather, financial_params, shading=shading)
+        return batch.to_results()[0]
         
-        if weather and weather.gh:
-            # Use actual irradiance data if available
-            annual_irradiance = sum(weather.gh) / 1000.0  # Convert W/m² to kWh/m²
-            
-        # System performance calculation
-        system_efficiency = 0.15  # Typical panel efficiency
-        if config.module_type == 1:  # Premium modules
-            system_efficiency = 0.20
-        elif config.module_type == 2:  # Thin film
-            system_efficiency = 0.12
-            
-        # Calculate energy output
-        panel_area = config.system_capacity / (system_efficiency * 1000)  # m²
-        gross_energy = annual_irradiance * panel_area * system_efficiency
+    async def run_batch_simulation(self,
+                                   configs: Sequence[SolarSystemConfig],
+                                   weather: Optional[WeatherData] = None,
+                                   financial_params: Optional[Dict] = None,
+                                   chunk_size: int = BATCH_CHUNK_SIZE,
+                                   shading: Optional[SiteShading] = None) -> BatchSimulationResults:
+        """
+        Simulate many configs in one vectorized pass for portfolio screening.
         
-        # Apply losses
-        net_energy = gross_energy * (1 - config.losses / 100) * (config.inv_eff / 100)
+        Always uses the fallback physics (PySAM has no batch mode), so results are
+        screening estimates; promising designs should be re-run individually.
+        Accepts a sequence of SolarSystemConfig or a dict of packed columns.
+        """
+        return self.simulate_batch(configs, weather, financial_params, chunk_size, shading)
         
-        # Capacity factor
-        capacity_factor = (net_energy / (config.system_capacity * 8760)) * 100
+    def simulate_batch(self,
+                       configs: Sequence[SolarSystemConfig],
+                       weather: Optional[WeatherData] = None,
+                       financial_params: Optional[Dict] = None,
+                       chunk_size: int = BATCH_CHUNK_SIZE,
+                       shading: Optional[SiteShading] = None) -> BatchSimulationResults:
+        """Blocking body of run_batch_simulation, for callers running it off the event loop"""
+        arrays = pack_configs(configs)
+        batch = self._fallback_batch(arrays, weather, financial_params, chunk_size=chunk_size, shading=shading)
+        logger.info(f"Batch fallback simulation completed for {len(batch)} configs")
+        return batch
         
-        # Monthly distribution (simplified seasonal pattern)
-        monthly_factors = [0.8, 0.9, 1.1, 1.2, 1.3, 1.3, 1.3, 1.2, 1.1, 0.9, 0.8, 0.7]
-        monthly_energy = [(net_energy / 12) * factor for factor in monthly_factors]
+    def _resolve_fallback_weather(self, weather: Optional[WeatherData]) -> WeatherData:
+        """Weather for the hourly fallback model (synthetic year at the default location if none)"""
+        if weather is not None and len(weather.gh):
+            return weather
+        lat, lon = DEFAULT_LOCATION
+        return synthetic_weather(lat, lon, FALLBACK_TZ, annual_ghi=FALLBACK_ANNUAL_IRRADIANCE)
         
-        # Simple financial estimates
-        lcoe = 0.06  # $/kWh typical LCOE
-        payback = 8.0  # years typical payback
+    def _fallback_hourly(self,
+                         arrays: Dict[str, np.ndarray],
+                         weather: Optional[WeatherData] = None,
+                         shading: Optional[SiteShading] = None) -> HourlyProduction:
+        """Hourly fallback production for packed config columns (one block, no chunking)"""
+        weather = self._resolve_fallback_weather(weather)
+        return simulate_hourly(arrays, weather, shading=shading)
         
-        if financial_params:
-            installed_cost = financial_params.get('installed_cost_per_watt', 2.5) * config.system_capacity * 1000
-            annual_savings = net_energy * financial_params.get('electricity_rate', 0.12)
-            if annual_savings > 0:
-                payback = installed_cost / annual_savings
-                
-        return SolarResults(
+    def _fallback_batch(self,
+                        arrays: Dict[str, np.ndarray],
+                        weather: Optional[WeatherData] = None,
+                        financial_params: Optional[Dict] = None,
+                        chunk_size: int = BATCH_CHUNK_SIZE,
+                        shading: Optional[SiteShading] = None) -> BatchSimulationResults:
+        """Vectorized hourly fallback model over packed config columns"""
+        capacity = arrays['system_capacity']
+        n = len(capacity)
+        
+        weather = self._resolve_fallback_weather(weather)
+        position = weather_solar_position(weather)
+        n_hours = len(weather.gh)
+        
+        # Only totals are needed here, so skip hours with the sun below the horizon
+        daylight = np.nonzero(position.cos_zenith > 0)[0]
+        daylight_month = np.asarray(weather.month)[daylight]
+        
+        net_energy = np.empty(n)
+        monthly_energy = np.empty((n, 12))
+        poa_monthly = np.empty((n, 12))
+        
+        # Hourly blocks are (configs x hours), so bound memory by chunking configs
+        for start in range(0, n, chunk_size):
+            rows = slice(start, start + chunk_size)
+            chunk = {name: column[rows] for name, column in arrays.items()}
+            hourly = simulate_hourly(chunk, weather, position, hours=daylight, shading=shading)
+            monthly_energy[rows] = monthly_totals(hourly.ac, daylight_month)
+            poa_monthly[rows] = monthly_totals(hourly.poa, daylight_month) / 1000.0  # kWh/m²
+            net_energy[rows] = monthly_energy[rows].sum(axis=1)
+            
+        with np.errstate(divide='ignore', invalid='ignore'):
+            capacity_factor = (net_energy / (capacity * n_hours)) * 100
+            
+        # Vectorized cash-flow analysis (DEFAULT_FINANCIAL_PARAMS fill any gaps)
+        finance = evaluate_cash_flows(net_energy, capacity, financial_params)
+        
+        return BatchSimulationResults(
             annual_energy=net_energy,
             monthly_energy=monthly_energy,
             capacity_factor=capacity_factor,
-            lcoe_real=lcoe,
-            npv=0.0,
-            payback_period=payback,
-            irr=12.0,  # Typical IRR
-            ac_monthly=monthly_energy,
-            poa_monthly=[annual_irradiance / 12] * 12,
-            success=True,
-            messages=["Fallback physics simulation - estimates only (PySAM recommended for accuracy)"]
+            lcoe_real=finance.lcoe_real,
+            npv=finance.npv,
+            payback_period=finance.payback_period,
+            irr=finance.irr,
+            poa_monthly=poa_monthly,
+            messages=[FALLBACK_MESSAGE]
         )
         
+    async def run_financial_sweep(self,
+                                  annual_energy,
+                                  system_capacity,
+                                  scenarios: Optional[Dict[str, Any]] = None) -> FinancialResults:
+        """
+        Evaluate NPV, IRR, LCOE and payback for many financial scenarios in one pass
+        
+        ``scenarios`` is shaped like financial_params, with (n,) arrays for the
+        swept entries (tariffs, loan terms, discount rates...).
+        """
+        return evaluate_cash_flows(annual_energy, system_capacity, scenarios)
+        
     async def validate_system_design(self, config: SolarSystemConfig) -> Dict[str, Any]:
         """
         Validate system design parameters against physical constraints
         """
-        validation_results = {
-            'valid': True,
-            'warnings': [],
-            'errors': []
-        }
+        return validate_designs(pack_configs([config])).describe(0)
         
-        # Capacity validation
-        if config.system_capacity <= 0:
-            validation_results['errors'].append("System capacity must be positive")
-            validation_results['valid'] = False
-            
-        if config.system_capacity > 10000:  # 10 MW limit for this model
-            validation_results['warnings'].append("Large system size - consider utility-scale model")
-            
-        # Tilt validation
-        if config.tilt < 0 or config.tilt > 90:
-            validation_results['errors'].append("Tilt must be between 0 and 90 degrees")
-            validation_results['valid'] = False
-            
-        # Azimuth validation
-        if config.azimuth < 0 or config.azimuth >= 360:
-            validation_results['errors'].append("Azimuth must be between 0 and 360 degrees")
-            validation_results['valid'] = False
-            
-        # Efficiency validation
-        if config.inv_eff <= 0 or config.inv_eff > 100:
-            validation_results['errors'].append("Inverter efficiency must be between 0 and 100%")
-            validation_results['valid'] = False
-            
-        # DC/AC ratio validation
-        if config.dc_ac_ratio < 1.0:
-            validation_results['warnings'].append("DC/AC ratio below 1.0 may indicate undersized DC array")
-        elif config.dc_ac_ratio > 2.0:
-            validation_results['warnings'].append("High DC/AC ratio may cause clipping losses")
-            
-        return validation_results
+    def validate_designs(self, configs: Sequence[SolarSystemConfig]) -> DesignValidation:
+        """
+        Bitmask validation of many designs at once (configs or packed columns),
+        so sweep and optimizer candidates can be pruned before simulation
+        """
+        return validate_designs(pack_configs(configs))
         
     async def run_sensitivity_analysis(self, 
                                        base_config: SolarSystemConfig,
-                                       parameter_ranges: Dict[str, Tuple[float, float]]) -> Dict[str, Any]:
+                                       parameter_ranges: Dict[str, Tuple[float, float]],
+                                       weather: Optional[WeatherData] = None,
+                                       financial_params: Optional[Dict] = None,
+                                       max_concurrency: int = 8,
+                                       max_refinements: int = 3) -> Dict[str, Any]:
         """
         Run sensitivity analysis varying key parameters
+        
+        All sample points run concurrently, duplicate configs are simulated once and
+        the curves are refined where they bend (see SensitivityEngine).
         """
-        sensitivity_results = {
-            'base_case': await self.run_solar_simulation(base_config),
-            'sensitivities': {}
-        }
+        sensitivity_engine = SensitivityEngine(
+            self,
+            max_concurrency=max_concurrency,
+            max_refinements=max_refinements
+        )
+        return await sensitivity_engine.run(base_config, parameter_ranges, weather, financial_params)
         
-        for param, (min_val, max_val) in parameter_ranges.items():
-            param_results = []
-            
-            # Test parameter range
-            test_values = np.linspace(min_val, max_val, 5)
-            
-            for test_val in test_values:
-                test_config = SolarSystemConfig(**base_config.__dict__)
-                setattr(test_config, param, test_val)
-                
-                try:
-                    result = await self.run_solar_simulation(test_config)
-                    param_results.append({
-                        'parameter_value': test_val,
-                        'annual_energy': result.annual_energy,
-                        'capacity_factor': result.capacity_factor,
-                        'lcoe': result.lcoe_real
-                    })
-                except Exception as e:
-                    logger.error(f"Sensitivity analysis error for {param}={test_val}: {e}")
-                    
-            sensitivity_results['sensitivities'][param] = param_results
-            
-        return sensitivity_results
+    async def run_monte_carlo(self,
+                              config: SolarSystemConfig,
+                              weather: Optional[WeatherData] = None,
+                              samples: int = 10_000,
+                              seed: Optional[int] = None,
+                              uncertainty: Optional[Dict[str, float]] = None,
+                              financial_params: Optional[Dict] = None,
+                              chunk_size: int = STREAM_CHUNK_SIZE,
+                              keep_samples: bool = False) -> MonteCarloResults:
+        """
+        P50/P90/P99 yields from sampled irradiance, losses, inverter efficiency
+        and degradation (see MonteCarloSimulator)
+        
+        The design is simulated once; every sample is then evaluated in one
+        vectorized pass over its hourly DC profile. Degradation and the
+        analysis period come from financial_params (or the financial defaults).
+        """
+        simulator = await self.monte_carlo_simulator(config, weather, uncertainty, financial_params)
+        return simulator.run(samples, seed=seed, chunk_size=chunk_size, keep_samples=keep_samples)
+        
+    async def monte_carlo_simulator(self,
+                                    config: SolarSystemConfig,
+                                    weather: Optional[WeatherData] = None,
+                                    uncertainty: Optional[Dict[str, float]] = None,
+                                    financial_params: Optional[Dict] = None) -> MonteCarloSimulator:
+        """The design's MonteCarloSimulator; its blocking run() can then go off the event loop"""
+        params = {**DEFAULT_FINANCIAL_PARAMS, **(financial_params or {})}
+        return MonteCarloSimulator(
+            await self._hourly_dc(config, weather),
+            system_capacity=config.system_capacity,
+            dc_ac_ratio=config.dc_ac_ratio,
+            losses=config.losses,
+            inv_eff=config.inv_eff,
+            degradation=params['degradation'],
+            analysis_period=params['analysis_period'],
+            uncertainty=uncertainty
+        )
+        
+    async def _hourly_dc(self, config: SolarSystemConfig, weather: Optional[WeatherData] = None) -> np.ndarray:
+        """Hourly DC power (kW) before system losses and inverter clipping for one design"""
+        derate = max(1 - config.losses / 100, 1e-6)
+        if not self.fallback_mode:
+            _, _, dc = await self._cached_energy_stage(config, weather)
+            if dc is not None:
+                # Pvsamv1's inverter input is after losses; AC generation would already be clipped
+                return np.maximum(dc, 0.0) / derate
+        hourly = self._fallback_hourly(pack_configs([config]), weather)
+        return hourly.dc[0] / derate
+        
+    async def hourly_generation(self,
+                                config: SolarSystemConfig,
+                                weather: Optional[WeatherData] = None,
+                                shading: Optional[SiteShading] = None) -> np.ndarray:
+        """Hourly AC generation (kW) for one design"""
+        if not self.fallback_mode:
+            _, gen, _ = await self._cached_energy_stage(config, weather, shading)
+            if gen is not None:
+                return np.maximum(np.asarray(gen, dtype=np.float64), 0.0)
+        return self._fallback_hourly(pack_configs([config]), weather, shading).ac[0]
+        
+    async def run_battery_dispatch(self,
+                                   config: SolarSystemConfig,
+                                   load,
+                                   batteries: Sequence[Any],
+                                   weather: Optional[WeatherData] = None,
+                                   strategy: str = 'self_consumption',
+                                   grid_charge_hours: Optional[np.ndarray] = None,
+                                   discharge_hours: Optional[np.ndarray] = None,
+                                   keep_hourly: bool = False) -> DispatchResults:
+        """
+        Dispatch many battery options (BatterySpec or preset names such as
+        'tesla_powerwall_2*2') against one design's hourly generation and a
+        (hours,) or (batteries, hours) load profile; see simulate_dispatch.
+        """
+        columns = battery_columns(batteries)
+        return simulate_dispatch(
+            await self.hourly_generation(config, weather),
+            load,
+            strategy=strategy,
+            grid_charge_hours=grid_charge_hours,
+            discharge_hours=discharge_hours,
+            keep_hourly=keep_hourly,
+            **columns
+        )
+        
+    async def run_bill_savings(self,
+                               config: SolarSystemConfig,
+                               load,
+                               tariff: Any,
+                               weather: Optional[WeatherData] = None,
+                               battery: Optional[Any] = None,
+                               strategy: str = 'self_consumption') -> BillSavings:
+        """
+        Annual bill savings of a design under a TOU / demand / feed-in tariff
+        (Tariff or preset name), optionally with a battery (BatterySpec or
+        preset name). With strategy='tou_arbitrage' the battery also charges
+        from the grid in the tariff's cheapest hours when that pays after
+        round-trip losses (see CompiledTariff.arbitrage_hours).
+        
+        ``value_per_kwh`` is the tariff-aware replacement for a flat
+        financial_params['electricity_rate'].
+        """
+        generation = await self.hourly_generation(config, weather)
+        compiled = compile_tariff(tariff, weather.year if weather is not None else None, len(generation))
+        if battery is None:
+            return bill_savings(compiled, load, generation)
+            
+        columns = battery_columns([battery])
+        grid_charge_hours, discharge_hours = (
+            compiled.arbitrage_hours(float(columns['round_trip_efficiency'][0])) if strategy == 'tou_arbitrage'
+            else (None, None)
+        )
+        dispatch = simulate_dispatch(generation, load, strategy=strategy,
+                                     grid_charge_hours=grid_charge_hours, discharge_hours=discharge_hours,
+                                     keep_hourly=True, **columns)
+        return bill_savings(compiled, load, generation,
+                            grid_import=dispatch.hourly['grid_import'],
+                            grid_export=dispatch.hourly['grid_export'])
+        
+    async def start_job_queue(self, path: str = 'genesis_jobs.sqlite', max_workers: int = 2):
+        """
+        Background submit/poll/cancel for long runs (fleet, Monte Carlo,
+        sensitivity, batches) with results persisted in SQLite; see jobs.JobQueue
+        """
+        from .jobs import JobQueue
+        return await JobQueue(self, path, max_workers=max_workers).start()
+        
+    async def run_clipping_sweep(self,
+                                 config: SolarSystemConfig,
+                                 dc_ac_ratios=DEFAULT_DC_AC_RATIOS,
+                                 weather: Optional[WeatherData] = None,
+                                 financial_params: Optional[Dict] = None) -> ClippingSweep:
+        """
+        Energy-versus-DC/AC-ratio curve for one design from a single hourly
+        simulation (see clipping.clipping_sweep); with financial_params, each
+        ratio's energy also goes through the vectorized cash-flow model
+        (installed cost is per DC watt, so inverter size does not change it)
+        """
+        dc = await self._hourly_dc(config, weather) * (1 - config.losses / 100)
+        sweep = clipping_sweep(dc, config.system_capacity, dc_ac_ratios, inv_eff=config.inv_eff)
+        if financial_params:
+            sweep.finance = evaluate_cash_flows(sweep.annual_energy, config.system_capacity, financial_params)
+        return sweep
+        
+    async def optimize_design(self,
+                              base_config: SolarSystemConfig,
+                              objective: str = 'energy',
+                              weather: Optional[WeatherData] = None,
+                              financial_params: Optional[Dict] = None,
+                              bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+                              max_evaluations: int = 60) -> OptimizationResult:
+        """
+        Find the tilt, azimuth, DC/AC ratio and ground coverage ratio that
+        maximise annual energy (objective='energy') or minimise real LCOE
+        (objective='lcoe'); see DesignOptimizer.
+        """
+        optimizer = DesignOptimizer(self, objective=objective, bounds=bounds, max_evaluations=max_evaluations)
+        return await optimizer.optimize(base_config, weather, financial_params)
+
+# Global physics engine, created on first use so importing this module stays cheap
+_physics_engine: Optional[PhysicsEngine] = None
+
+def _global_engine() -> PhysicsEngine:
+    global _physics_engine
+    if _physics_engine is None:
+        started = time.perf_counter()
+        _physics_engine = PhysicsEngine()
+        _physics_engine.startup_timings['engine_init'] = time.perf_counter() - started
+    return _physics_engine
 
-# Global physics engine instance
-physics_engine = PhysicsEngine()
+def __getattr__(name: str):
+    # Keeps ``from solar_engine import physics_engine`` working without an import-time engine
+    if name == 'physics_engine':
+        return _global_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 async def get_physics_engine() -> PhysicsEngine:
     """Get the global physics engine instance"""
-    return physics_engine
\ No newline at end of file
+    return _global_engine()
@@ -0,0 +1,153 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Weather Station Index
+Grid-bucketed nearest-station lookup over an on-disk weather library
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from .result_cache import LRUCache
+from .weather_files import WEATHER_FILE_SUFFIXES, read_weather_file, weather_file_location
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+STATIONS_PER_CELL = 2.0  # target occupancy when the cell size is chosen automatically
+
+@dataclass
+class Station:
+    station_id: str
+    lat: float
+    lon: float
+    path: str
+
+@dataclass
+class StationMatch:
+    station: Station
+    distance_km: float
+
+def unit_vectors(lat, lon) -> np.ndarray:
+    """(n, 3) points on the unit sphere"""
+    phi, lam = np.radians(lat), np.radians(lon)
+    return np.stack([np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)], axis=-1)
+
+class StationIndex:
+    """
+    Nearest weather station by great-circle distance
+
+    Stations are bucketed into a uniform grid over their 3-D unit vectors, so
+    chord distance stands in for great-circle distance with no special cases
+    at the poles or the dateline. A query scans shells of cells outward from
+    the site's cell (each shell is one vectorized lookup into the sorted cell
+    keys) and stops once the next shell is farther than the best match, so a
+    lookup touches a handful of stations regardless of library size. Matched
+    stations' WeatherData are loaded through read_weather_file (memory-mapped
+    sidecars) and kept in an LRU of ``max_loaded`` stations.
+    """
+
+    def __init__(self,
+                 stations: Sequence[Station],
+                 cell_size: Optional[float] = None,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 max_loaded: int = 256):
+        self.stations = list(stations)
+        self.cache_dir = cache_dir
+        self.lats = np.array([s.lat for s in self.stations], dtype=np.float64)
+        self.lons = np.array([s.lon for s in self.stations], dtype=np.float64)
+        self.points = unit_vectors(self.lats, self.lons).reshape(-1, 3)
+
+        n = max(len(self.stations), 1)
+        # Sphere area 4*pi spread over cells of cell_size^2 holding ~STATIONS_PER_CELL each
+        self.cell_size = cell_size or float(np.clip(np.sqrt(4 * np.pi * STATIONS_PER_CELL / n), 1e-3, 0.5))
+        self._cells_per_axis = int(np.ceil(2 / self.cell_size)) + 1
+        # Keys are offset by a full grid width so shell offsets never wrap into another cell
+        self._stride = 3 * self._cells_per_axis
+
+        keys = self._keys(self._cell(self.points))
+        self._order = np.argsort(keys, kind='stable')
+        self._cell_keys, starts = np.unique(keys[self._order], return_index=True)
+        self._starts = starts
+        self._ends = np.append(starts[1:], len(keys))
+        self._shells: List[np.ndarray] = []
+        self._loaded = LRUCache(max_loaded)
+
+    @classmethod
+    def from_directory(cls, directory: Union[str, Path], **kwargs) -> 'StationIndex':
+        """Index every TMY3/NSRDB CSV and EPW file in a directory (reads only header lines)"""
+        stations = []
+        for path in sorted(Path(directory).iterdir()):
+            if path.suffix.lower() not in WEATHER_FILE_SUFFIXES:
+                continue
+            try:
+                lat, lon = weather_file_location(path)
+            except Exception as e:
+                logger.warning(f"Skipping weather file {path}: {e}")
+                continue
+            stations.append(Station(station_id=path.stem, lat=lat, lon=lon, path=str(path)))
+        logger.info(f"Indexed {len(stations)} weather stations from {directory}")
+        return cls(stations, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def _cell(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points + 1) / self.cell_size).astype(np.int64) + self._cells_per_axis
+
+    def _keys(self, cells: np.ndarray) -> np.ndarray:
+        return (cells[..., 0] * self._stride + cells[..., 1]) * self._stride + cells[..., 2]
+
+    def _shell(self, radius: int) -> np.ndarray:
+        """Key offsets of the cells at Chebyshev distance ``radius``"""
+        while len(self._shells) <= radius:
+            r = len(self._shells)
+            span = np.arange(-r, r + 1)
+            offsets = np.stack(np.meshgrid(span, span, span, indexing='ij'), axis=-1).reshape(-1, 3)
+            offsets = offsets[np.abs(offsets).max(axis=1) == r]
+            self._shells.append((offsets[:, 0] * self._stride + offsets[:, 1]) * self._stride + offsets[:, 2])
+        return self._shells[radius]
+
+    def nearest(self, lat: float, lon: float) -> Optional[StationMatch]:
+        """Closest station to (lat, lon), or None for an empty index"""
+        if not self.stations:
+            return None
+        point = unit_vectors(lat, lon)
+        center = self._keys(self._cell(point))
+        best_index, best_chord = -1, np.inf
+
+        for radius in range(self._cells_per_axis + 1):
+            # Every point in this shell is at least (radius - 1) cells away along some axis
+            if (radius - 1) * self.cell_size > best_chord:
+                break
+            keys = center + self._shell(radius)
+            slots = np.searchsorted(self._cell_keys, keys)
+            slots = slots[slots < len(self._cell_keys)]
+            slots = slots[np.isin(self._cell_keys[slots], keys)]
+            if not len(slots):
+                continue
+            candidates = self._order[np.concatenate([np.arange(self._starts[i], self._ends[i]) for i in slots])]
+            chords = np.linalg.norm(self.points[candidates] - point, axis=1)
+            i = int(np.argmin(chords))
+            if chords[i] < best_chord:
+                best_index, best_chord = int(candidates[i]), float(chords[i])
+
+        distance = 2 * EARTH_RADIUS_KM * np.arcsin(min(best_chord / 2, 1.0))
+        return StationMatch(station=self.stations[best_index], distance_km=float(distance))
+
+    def weather(self, station: Station):
+        """WeatherData for a station, loaded once and kept in the LRU"""
+        weather = self._loaded.get(station.station_id)
+        if weather is None:
+            weather = read_weather_file(station.path, cache_dir=self.cache_dir)
+            self._loaded.put(station.station_id, weather)
+        return weather
+
+    def nearest_weather(self, lat: float, lon: float, max_distance_km: Optional[float] = None):
+        """WeatherData of the closest station, or None if none lies within max_distance_km"""
+        match = self.nearest(lat, lon)
+        if match is None or (max_distance_km is not None and match.distance_km > max_distance_km):
+            return None
+        return self.weather(match.station)
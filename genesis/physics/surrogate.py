@@ -0,0 +1,229 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Surrogate Model
+Regression stand-in for the energy simulation, trained on accumulated results and bounded by its training envelope
+"""
+
+import importlib
+import logging
+import threading
+from dataclasses import dataclass
+from itertools import combinations_with_replacement
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .result_cache import weather_digest
+
+logger = logging.getLogger(__name__)
+
+SURROGATE_FEATURES = ('tilt', 'azimuth', 'ground_coverage_ratio', 'dc_ac_ratio', 'inv_eff', 'losses')
+SURROGATE_KINDS = ('polynomial', 'gbt')
+SURROGATE_MESSAGE = "Surrogate estimate - fitted to previous simulations at this location"
+GBT_MIN_SAMPLES = 50
+GBT_CV_FOLDS = 5
+NEIGHBOURS = 8  # training samples whose held-out error bounds a polynomial prediction
+
+@dataclass
+class SurrogateEstimate:
+    monthly_energy: np.ndarray  # (12,) kWh
+    poa_monthly: np.ndarray     # (12,) kWh/m²
+    error: float                # estimated relative error of annual energy
+
+def polynomial_terms(n_features: int, degree: int) -> np.ndarray:
+    """
+    (terms, degree) feature indices of every monomial up to ``degree``; index
+    ``n_features`` stands for a constant 1 (so the all-padding row is the intercept)
+    """
+    terms = [combo + (n_features,) * (degree - d)
+             for d in range(degree + 1) for combo in combinations_with_replacement(range(n_features), d)]
+    return np.array(terms, dtype=np.intp).reshape(len(terms), degree)
+
+def polynomial_features(x: np.ndarray, terms: np.ndarray) -> np.ndarray:
+    """(n, terms) monomials of the (n, features) rows of x"""
+    padded = np.concatenate([x, np.ones((len(x), 1))], axis=1)
+    return np.prod(padded[:, terms], axis=2)
+
+class _SurrogateGroup:
+    """Training samples and fitted model for one (mode, weather, module_type, array_type)"""
+
+    def __init__(self, kind: str, degree: int, max_samples: int):
+        self.kind = kind
+        self.max_samples = max_samples
+        self.terms = polynomial_terms(len(SURROGATE_FEATURES), degree)
+        self.x: List[np.ndarray] = []
+        self.y: List[np.ndarray] = []  # [specific monthly energy (12), poa monthly (12)]
+        self.fitted_at = 0             # samples seen at the last fit
+        self.seen = 0
+
+    @property
+    def min_samples(self) -> int:
+        return 2 * len(self.terms) if self.kind == 'polynomial' else GBT_MIN_SAMPLES
+
+    def add(self, x: np.ndarray, y: np.ndarray):
+        self.x.append(x)
+        self.y.append(y)
+        self.seen += 1
+        if len(self.x) > self.max_samples:
+            del self.x[0], self.y[0]
+
+    def fit(self):
+        x, y = np.array(self.x), np.array(self.y)
+        self.low, self.high = x.min(axis=0), x.max(axis=0)
+        self.center = (self.low + self.high) / 2
+        self.scale = np.where(self.high > self.low, (self.high - self.low) / 2, 1.0)
+        z = (x - self.center) / self.scale
+        annual = y[:, :12].sum(axis=1)
+
+        if self.kind == 'polynomial':
+            a = polynomial_features(z, self.terms)
+            pinv = np.linalg.pinv(a)
+            self.coef = pinv @ y
+            self.gram_inv = pinv @ pinv.T
+            # Exact leave-one-out residuals of the annual yield: e_i / (1 - h_ii)
+            leverage = np.sum(a * pinv.T, axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                loo = (annual - a @ self.coef[:, :12].sum(axis=1)) / (1 - leverage) / annual
+            self.loo = np.where(np.isfinite(loo), np.abs(loo), np.inf)
+            self.error = float(np.sqrt(np.mean(self.loo ** 2)))
+            self.z = z
+        else:
+            ensemble = importlib.import_module('sklearn.ensemble')
+            model_selection = importlib.import_module('sklearn.model_selection')
+            model = ensemble.GradientBoostingRegressor()
+            folds = min(GBT_CV_FOLDS, len(annual))
+            predicted = model_selection.cross_val_predict(model, z, annual, cv=folds)
+            self.error = float(np.sqrt(np.mean(((predicted - annual) / annual) ** 2)))
+            self.model = model.fit(z, annual)
+            self.z, self.profiles = z, y
+        if not np.isfinite(self.error):
+            self.error = np.inf
+        self.fitted_at = self.seen
+
+    def predict(self, x: np.ndarray, margin: float) -> Optional[Tuple[np.ndarray, float]]:
+        """(targets, relative error) or None outside the training envelope"""
+        pad = (self.high - self.low) * margin
+        if np.any(x < self.low - pad) or np.any(x > self.high + pad):
+            return None
+        z = ((x - self.center) / self.scale)[None, :]
+        if self.kind == 'polynomial':
+            a = polynomial_features(z, self.terms)[0]
+            leverage = float(a @ self.gram_inv @ a)
+            # Fit quality varies across the envelope: use the worst held-out error among the nearest samples
+            distance = np.sum((self.z - z) ** 2, axis=1)
+            nearest = np.argpartition(distance, min(NEIGHBOURS, len(distance)) - 1)[:NEIGHBOURS]
+            return a @ self.coef, float(self.loo[nearest].max()) * np.sqrt(1 + leverage)
+
+        annual = float(self.model.predict(z)[0])
+        # Monthly shape and irradiance from the closest trained design
+        nearest = int(np.argmin(np.sum((self.z - z) ** 2, axis=1)))
+        profile = self.profiles[nearest].copy()
+        profile[:12] *= annual / profile[:12].sum()
+        return profile, self.error
+
+class SurrogateModel:
+    """
+    Per-location regression of monthly energy on the continuous design
+    parameters (tilt, azimuth, GCR, DC/AC ratio, inverter efficiency, losses)
+
+    Samples are grouped by simulation mode, weather and the discrete module and
+    array types. 'polynomial' is a least-squares polynomial fit of specific
+    yield (kWh/kW) whose error is the largest exact leave-one-out residual among
+    the query's nearest training designs, scaled by the query's leverage; 'gbt' is scikit-learn gradient boosting with a
+    cross-validated error (optional dependency; falls back to 'polynomial').
+
+    predict() answers only inside the training envelope (per-feature bounds
+    widened by ``envelope_margin``) and when the estimated relative error is at
+    most ``tolerance``; anything else returns None so the caller simulates and
+    observe()s the result.
+    """
+
+    def __init__(self,
+                 kind: str = 'polynomial',
+                 degree: int = 2,
+                 tolerance: float = 0.02,
+                 envelope_margin: float = 0.0,
+                 refit_every: Optional[int] = None,
+                 max_samples: int = 5000):
+        if kind not in SURROGATE_KINDS:
+            raise ValueError(f"Unknown surrogate kind '{kind}', expected one of {SURROGATE_KINDS}")
+        if kind == 'gbt':
+            try:
+                importlib.import_module('sklearn.ensemble')
+            except ImportError:
+                logger.warning("scikit-learn not available - using the polynomial surrogate")
+                kind = 'polynomial'
+        self.kind = kind
+        self.degree = degree
+        self.tolerance = tolerance
+        self.envelope_margin = envelope_margin
+        # Polynomial fits are cheap enough to refresh on every new sample
+        self.refit_every = refit_every or (1 if kind == 'polynomial' else 25)
+        self.max_samples = max_samples
+        self.groups: Dict[tuple, _SurrogateGroup] = {}
+        # Job-queue workers simulate on compute threads that share one engine
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'untrained': 0, 'outside_envelope': 0, 'low_confidence': 0,
+                      'observations': 0, 'fits': 0}
+
+    def _key(self, config, weather, mode: str) -> tuple:
+        location = weather_digest(weather) if weather is not None else 'default'
+        return (mode, location, int(config.module_type), int(config.array_type))
+
+    @staticmethod
+    def _features(config) -> np.ndarray:
+        return np.array([getattr(config, name) for name in SURROGATE_FEATURES], dtype=np.float64)
+
+    def observe(self, config, weather, results, mode: str = ''):
+        """Add a simulated result to the training set"""
+        if not results.success or config.system_capacity <= 0:
+            return
+        key = self._key(config, weather, mode)
+        target = np.concatenate([np.asarray(results.monthly_energy, dtype=np.float64) / config.system_capacity,
+                                 np.asarray(results.poa_monthly, dtype=np.float64)])
+        with self._lock:
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = _SurrogateGroup(self.kind, self.degree, self.max_samples)
+            group.add(self._features(config), target)
+            self.stats['observations'] += 1
+
+    def predict(self, config, weather, mode: str = '') -> Optional[SurrogateEstimate]:
+        """Estimate for a design, or None when it should be simulated"""
+        key = self._key(config, weather, mode)
+        with self._lock:
+            prediction = self._predict(self.groups.get(key), config)
+        if prediction is None:
+            return None
+        target, error = prediction
+        return SurrogateEstimate(
+            monthly_energy=np.maximum(target[:12], 0.0) * config.system_capacity,
+            poa_monthly=np.maximum(target[12:], 0.0),
+            error=float(error)
+        )
+
+    def _predict(self, group: Optional[_SurrogateGroup], config) -> Optional[Tuple[np.ndarray, float]]:
+        if group is None or len(group.x) < group.min_samples:
+            self.stats['untrained'] += 1
+            return None
+        if group.fitted_at == 0 or group.seen - group.fitted_at >= self.refit_every:
+            group.fit()
+            self.stats['fits'] += 1
+
+        prediction = group.predict(self._features(config), self.envelope_margin)
+        if prediction is None:
+            self.stats['outside_envelope'] += 1
+            return None
+        if prediction[1] > self.tolerance:
+            self.stats['low_confidence'] += 1
+            return None
+        self.stats['hits'] += 1
+        return prediction
+
+    def clear(self):
+        with self._lock:
+            self.groups.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, 'groups': len(self.groups),
+                    'samples': sum(len(group.x) for group in self.groups.values())}
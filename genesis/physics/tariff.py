@@ -0,0 +1,312 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Tariff Engine
+Time-of-use, demand and feed-in tariffs applied to hourly load/generation with compiled hour masks
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .irradiance import hourly_index, month_of_hour
+from .result_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARIFF_YEAR = 2023  # calendar used for weekdays when weather has no year (TMY)
+HOURS_PER_YEAR = 8760
+BILL_CHUNK_SIZE = 4096      # sites per demand-charge block
+
+DAY_TYPES = ('all', 'weekdays', 'weekends')
+
+@dataclass(frozen=True)
+class TariffPeriod:
+    """
+    One time-of-use window: hours [start, end) of the day (wrapping past
+    midnight when start > end), on 'all' days, 'weekdays' or 'weekends',
+    optionally limited to some months (seasonal rates)
+    """
+    name: str
+    rate: float                              # $/kWh imported
+    hours: Tuple[Tuple[int, int], ...]
+    days: str = 'all'
+    months: Optional[Tuple[int, ...]] = None
+    feed_in_rate: Optional[float] = None     # $/kWh exported, overrides Tariff.feed_in_rate
+
+@dataclass(frozen=True)
+class Tariff:
+    """
+    Retail tariff; periods are matched in order and unmatched hours pay
+    ``base_rate``. Demand is charged on each month's highest hourly import
+    inside ``demand_hours`` / ``demand_days``.
+    """
+    name: str
+    base_rate: float                         # $/kWh
+    periods: Tuple[TariffPeriod, ...] = ()
+    feed_in_rate: float = 0.0                # $/kWh
+    daily_supply_charge: float = 0.0         # $/day
+    demand_charge: float = 0.0               # $/kW-month
+    demand_hours: Tuple[Tuple[int, int], ...] = ((0, 24),)
+    demand_days: str = 'all'
+
+    @classmethod
+    def flat(cls, rate: float, feed_in_rate: float = 0.0, daily_supply_charge: float = 0.0) -> 'Tariff':
+        return cls(name='flat', base_rate=rate, feed_in_rate=feed_in_rate, daily_supply_charge=daily_supply_charge)
+
+# Representative Australian residential retail offers (GST inclusive); check current rates before quoting
+TARIFF_PRESETS: Dict[str, Tariff] = {
+    'ausgrid_tou': Tariff(
+        name='Ausgrid TOU (NSW)',
+        base_rate=0.32,
+        periods=(
+            TariffPeriod('peak', 0.58, ((15, 21),)),
+            TariffPeriod('off_peak', 0.24, ((22, 7),)),
+        ),
+        feed_in_rate=0.05,
+        daily_supply_charge=1.15
+    ),
+    'energex_tou': Tariff(
+        name='Energex TOU (QLD)',
+        base_rate=0.30,
+        periods=(
+            TariffPeriod('peak', 0.45, ((16, 21),)),
+            TariffPeriod('off_peak', 0.22, ((11, 16),)),
+        ),
+        feed_in_rate=0.05,
+        daily_supply_charge=1.05
+    ),
+    'victoria_tou': Tariff(
+        name='Victoria TOU',
+        base_rate=0.26,
+        periods=(
+            TariffPeriod('peak', 0.38, ((15, 21),), feed_in_rate=0.07),
+            TariffPeriod('overnight', 0.22, ((0, 7),)),
+        ),
+        feed_in_rate=0.033,
+        daily_supply_charge=1.10
+    ),
+    'sapn_tou': Tariff(
+        name='SA Power Networks TOU (SA)',
+        base_rate=0.45,
+        periods=(
+            TariffPeriod('peak', 0.55, ((17, 21),)),
+            TariffPeriod('solar_sponge', 0.25, ((10, 15),)),
+        ),
+        feed_in_rate=0.04,
+        daily_supply_charge=1.20
+    ),
+    'ausgrid_demand': Tariff(
+        name='Ausgrid TOU + demand (NSW)',
+        base_rate=0.26,
+        periods=(
+            TariffPeriod('peak', 0.36, ((15, 21),), days='weekdays'),
+            TariffPeriod('off_peak', 0.20, ((22, 7),)),
+        ),
+        feed_in_rate=0.05,
+        daily_supply_charge=1.05,
+        demand_charge=9.10,
+        demand_hours=((15, 21),),
+        demand_days='weekdays'
+    ),
+}
+
+@dataclass
+class CompiledTariff:
+    """A tariff resolved onto one hourly year: per-hour rates and masks"""
+    tariff: Tariff
+    year: int
+    import_rate: np.ndarray       # (hours,) $/kWh
+    export_rate: np.ndarray       # (hours,) $/kWh
+    period: np.ndarray            # (hours,) index into tariff.periods, -1 for the base rate
+    import_weights: np.ndarray    # (hours, 12) import_rate spread into month columns
+    export_weights: np.ndarray    # (hours, 12)
+    demand_hours: np.ndarray      # indices of hours inside the demand window
+    demand_month_starts: np.ndarray  # offsets into demand_hours where each month begins
+    demand_months: np.ndarray     # month (1-12) of each demand_month_starts entry
+    days_per_month: np.ndarray    # (12,)
+
+    def arbitrage_hours(self, round_trip_efficiency: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (grid_charge_hours, discharge_hours) masks for battery TOU dispatch
+
+        The battery charges from the grid in the cheapest hours only when that
+        pays: the dearest rate must beat the cheapest one after round-trip
+        losses, and the cheapest rate must be below every feed-in rate, since
+        grid-charged energy takes battery room that PV surplus (otherwise
+        exported) would fill. It discharges in every other hour.
+        """
+        cheapest_rate = self.import_rate.min()
+        pays = (self.import_rate.max() * round_trip_efficiency > cheapest_rate
+                and cheapest_rate < self.export_rate.min())
+        grid_charge = (self.import_rate <= cheapest_rate + 1e-9) if pays else np.zeros(len(self.import_rate), dtype=bool)
+        return grid_charge, ~grid_charge
+
+def _window_mask(hour: np.ndarray, windows: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+    mask = np.zeros(len(hour), dtype=bool)
+    for start, end in windows:
+        mask |= ((hour >= start) & (hour < end)) if start <= end else ((hour >= start) | (hour < end))
+    return mask
+
+def _day_mask(weekday: np.ndarray, days: str) -> np.ndarray:
+    if days not in DAY_TYPES:
+        raise ValueError(f"Unknown day type '{days}', expected one of {DAY_TYPES}")
+    if days == 'weekdays':
+        return weekday < 5
+    if days == 'weekends':
+        return weekday >= 5
+    return np.ones(len(weekday), dtype=bool)
+
+def _month_weights(rate: np.ndarray, month: np.ndarray) -> np.ndarray:
+    weights = np.zeros((len(rate), 12))
+    weights[np.arange(len(rate)), month - 1] = rate
+    return weights
+
+def _compile(tariff: Tariff, year: int, n_hours: int) -> CompiledTariff:
+    day, hour = hourly_index(n_hours)
+    month = month_of_hour(n_hours)
+    # Monday = 0; 1970-01-01 was a Thursday
+    jan1 = int(np.datetime64(f'{year:04d}-01-01', 'D').astype(np.int64))
+    weekday = (jan1 + day - 1 + 3) % 7
+
+    import_rate = np.full(n_hours, float(tariff.base_rate))
+    export_rate = np.full(n_hours, float(tariff.feed_in_rate))
+    period = np.full(n_hours, -1, dtype=np.int16)
+    unassigned = np.ones(n_hours, dtype=bool)
+    for i, p in enumerate(tariff.periods):
+        mask = unassigned & _window_mask(hour, p.hours) & _day_mask(weekday, p.days)
+        if p.months is not None:
+            mask &= np.isin(month, p.months)
+        import_rate[mask] = p.rate
+        if p.feed_in_rate is not None:
+            export_rate[mask] = p.feed_in_rate
+        period[mask] = i
+        unassigned &= ~mask
+
+    demand_hours = np.flatnonzero(_window_mask(hour, tariff.demand_hours) & _day_mask(weekday, tariff.demand_days))
+    demand_month = month[demand_hours]
+    starts = np.flatnonzero(np.r_[True, demand_month[1:] != demand_month[:-1]]) if len(demand_hours) else np.zeros(0, dtype=np.int64)
+
+    return CompiledTariff(
+        tariff=tariff,
+        year=year,
+        import_rate=import_rate,
+        export_rate=export_rate,
+        period=period,
+        import_weights=_month_weights(import_rate, month),
+        export_weights=_month_weights(export_rate, month),
+        demand_hours=demand_hours,
+        demand_month_starts=starts,
+        demand_months=demand_month[starts] if len(starts) else starts,
+        days_per_month=np.bincount(month, minlength=13)[1:] / 24.0
+    )
+
+_compiled_tariffs = LRUCache(128)
+
+def compile_tariff(tariff: Union[Tariff, str], year: Optional[int] = None, n_hours: int = HOURS_PER_YEAR) -> CompiledTariff:
+    """Hourly rates and masks for a tariff (or preset name), memoized per (tariff, year, hours)"""
+    if isinstance(tariff, str):
+        tariff = TARIFF_PRESETS[tariff]
+    year = int(year or DEFAULT_TARIFF_YEAR)
+    key = (tariff, year, int(n_hours))
+    compiled = _compiled_tariffs.get(key)
+    if compiled is None:
+        compiled = _compile(tariff, year, int(n_hours))
+        _compiled_tariffs.put(key, compiled)
+    return compiled
+
+@dataclass
+class BillResults:
+    """Monthly bill components per site, shape (sites, 12) in $"""
+    energy: np.ndarray
+    feed_in_credit: np.ndarray
+    demand: np.ndarray
+    supply: np.ndarray
+
+    @property
+    def monthly(self) -> np.ndarray:
+        return self.energy - self.feed_in_credit + self.demand + self.supply
+
+    @property
+    def annual(self) -> np.ndarray:
+        """(sites,) yearly bill"""
+        return self.monthly.sum(axis=1)
+
+@dataclass
+class BillSavings:
+    """Bills without and with solar (and storage) for each site"""
+    before: BillResults
+    after: BillResults
+    savings: np.ndarray           # (sites,) $/yr
+    value_per_kwh: np.ndarray     # (sites,) savings per kWh generated (NaN without generation)
+
+def _site_rows(values, hours: int) -> np.ndarray:
+    return np.atleast_2d(np.asarray(values, dtype=np.float64)).reshape(-1, hours)
+
+def evaluate_bills(tariff: Union[Tariff, str, CompiledTariff],
+                   grid_import,
+                   grid_export=None,
+                   year: Optional[int] = None,
+                   chunk_size: int = BILL_CHUNK_SIZE) -> BillResults:
+    """
+    Bills for hourly grid import/export in kWh, (hours,) or (sites, hours)
+
+    Energy and feed-in charges are one matrix product with the compiled
+    (hours, 12) monthly rate weights; demand is a per-month maximum over the
+    demand-window hours, computed in blocks of ``chunk_size`` sites.
+    """
+    grid_import = _site_rows(grid_import, np.shape(grid_import)[-1])
+    n, hours = grid_import.shape
+    compiled = tariff if isinstance(tariff, CompiledTariff) else compile_tariff(tariff, year, hours)
+
+    energy = grid_import @ compiled.import_weights
+    if grid_export is None:
+        credit = np.zeros((n, 12))
+    else:
+        credit = np.broadcast_to(_site_rows(grid_export, hours), (n, hours)) @ compiled.export_weights
+
+    demand = np.zeros((n, 12))
+    if compiled.tariff.demand_charge and len(compiled.demand_hours):
+        for start in range(0, n, chunk_size):
+            rows = slice(start, min(start + chunk_size, n))
+            window = grid_import[rows][:, compiled.demand_hours]
+            peaks = np.maximum.reduceat(window, compiled.demand_month_starts, axis=1)
+            demand[rows, compiled.demand_months - 1] = np.maximum(peaks, 0.0) * compiled.tariff.demand_charge
+
+    supply = np.broadcast_to(compiled.days_per_month * compiled.tariff.daily_supply_charge, (n, 12))
+    return BillResults(energy=energy, feed_in_credit=credit, demand=demand, supply=supply)
+
+def bill_savings(tariff: Union[Tariff, str, CompiledTariff],
+                 load,
+                 generation=None,
+                 grid_import=None,
+                 grid_export=None,
+                 year: Optional[int] = None) -> BillSavings:
+    """
+    Bill on ``load`` alone versus with on-site generation
+
+    ``generation`` is netted against load hour by hour unless the
+    ``grid_import``/``grid_export`` of a battery dispatch (kept hourly) are
+    given to price a PV + storage system. Arrays are (hours,) or (sites, hours).
+    """
+    load = _site_rows(load, np.shape(load)[-1])
+    hours = load.shape[1]
+    compiled = tariff if isinstance(tariff, CompiledTariff) else compile_tariff(tariff, year, hours)
+
+    if grid_import is None:
+        if generation is None:
+            raise ValueError("bill_savings needs generation or grid_import/grid_export")
+        net = load - _site_rows(generation, hours)
+        grid_import, grid_export = np.maximum(net, 0.0), np.maximum(-net, 0.0)
+
+    before = evaluate_bills(compiled, load)
+    after = evaluate_bills(compiled, grid_import, grid_export)
+    savings = before.annual - after.annual
+
+    if generation is None:
+        value = np.full(len(savings), np.nan)
+    else:
+        generated = _site_rows(generation, hours).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = np.where(generated > 0, savings / generated, np.nan)
+    return BillSavings(before=before, after=after, savings=savings, value_per_kwh=value)
@@ -0,0 +1,115 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Design Validation
+Vectorized physical-limit checks returning per-design error/warning bitmasks
+"""
+
+import logging
+from dataclasses import dataclass
+from enum import IntFlag
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAX_SYSTEM_CAPACITY = 10000.0  # kW, 10 MW limit for this model
+MODULE_TYPES = (0, 1, 2)
+ARRAY_TYPES = (0, 1, 2, 3, 4)
+
+class DesignError(IntFlag):
+    CAPACITY = 1 << 0
+    TILT = 1 << 1
+    AZIMUTH = 1 << 2
+    INV_EFF = 1 << 3
+
+class DesignWarning(IntFlag):
+    LARGE_SYSTEM = 1 << 0
+    LOW_DC_AC = 1 << 1
+    HIGH_DC_AC = 1 << 2
+    NON_FINITE = 1 << 3
+    GROUND_COVERAGE = 1 << 4
+    LOSSES = 1 << 5
+    MODULE_TYPE = 1 << 6
+    ARRAY_TYPE = 1 << 7
+
+Rule = Tuple[IntFlag, str, Callable[[Dict[str, np.ndarray]], np.ndarray]]
+
+# Evaluated in order; messages match PhysicsEngine.validate_system_design. Range rules
+# are written as ~(in range) so NaN, which compares false, fails them too
+ERROR_RULES: List[Rule] = [
+    (DesignError.CAPACITY, "System capacity must be positive",
+     lambda a: ~(a['system_capacity'] > 0)),
+    (DesignError.TILT, "Tilt must be between 0 and 90 degrees",
+     lambda a: ~((a['tilt'] >= 0) & (a['tilt'] <= 90))),
+    (DesignError.AZIMUTH, "Azimuth must be between 0 and 360 degrees",
+     lambda a: ~((a['azimuth'] >= 0) & (a['azimuth'] < 360))),
+    (DesignError.INV_EFF, "Inverter efficiency must be between 0 and 100%",
+     lambda a: ~((a['inv_eff'] > 0) & (a['inv_eff'] <= 100))),
+]
+
+# Advisory only, so every design validate_system_design used to accept still passes
+WARNING_RULES: List[Rule] = [
+    (DesignWarning.LARGE_SYSTEM, "Large system size - consider utility-scale model",
+     lambda a: a['system_capacity'] > MAX_SYSTEM_CAPACITY),
+    (DesignWarning.LOW_DC_AC, "DC/AC ratio below 1.0 may indicate undersized DC array",
+     lambda a: a['dc_ac_ratio'] < 1.0),
+    (DesignWarning.HIGH_DC_AC, "High DC/AC ratio may cause clipping losses",
+     lambda a: a['dc_ac_ratio'] > 2.0),
+    (DesignWarning.NON_FINITE, "Design parameters should be finite numbers",
+     lambda a: ~np.all([np.isfinite(column) for column in a.values()], axis=0)),
+    (DesignWarning.GROUND_COVERAGE, "Ground coverage ratio should be between 0 and 1",
+     lambda a: ~((a['ground_coverage_ratio'] > 0) & (a['ground_coverage_ratio'] <= 1))),
+    (DesignWarning.LOSSES, "System losses should be between 0 and 100%",
+     lambda a: ~((a['losses'] >= 0) & (a['losses'] < 100))),
+    (DesignWarning.MODULE_TYPE, "Module type should be 0 (standard), 1 (premium) or 2 (thin film)",
+     lambda a: ~np.isin(a['module_type'], MODULE_TYPES)),
+    (DesignWarning.ARRAY_TYPE, "Array type should be between 0 and 4",
+     lambda a: ~np.isin(a['array_type'], ARRAY_TYPES)),
+]
+
+@dataclass
+class DesignValidation:
+    """Per-design bitmasks of DesignError / DesignWarning flags"""
+    errors: np.ndarray    # (n,) uint32
+    warnings: np.ndarray  # (n,) uint32
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """(n,) True where a design has no errors"""
+        return self.errors == 0
+
+    def counts(self) -> Dict[str, int]:
+        """Number of designs raising each flag"""
+        counts = {}
+        for flag, _, _ in ERROR_RULES:
+            counts[flag.name] = int(np.count_nonzero(self.errors & flag))
+        for flag, _, _ in WARNING_RULES:
+            counts[flag.name] = int(np.count_nonzero(self.warnings & flag))
+        return counts
+
+    def describe(self, index: int) -> Dict[str, Any]:
+        """validate_system_design-style report for one design"""
+        errors = [message for flag, message, _ in ERROR_RULES if self.errors[index] & flag]
+        warnings = [message for flag, message, _ in WARNING_RULES if self.warnings[index] & flag]
+        return {'valid': not errors, 'warnings': warnings, 'errors': errors}
+
+def _bitmask(rules: List[Rule], arrays: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    mask = np.zeros(n, dtype=np.uint32)
+    with np.errstate(invalid='ignore'):
+        for flag, _, check in rules:
+            mask |= np.where(check(arrays), np.uint32(flag), np.uint32(0))
+    return mask
+
+def validate_designs(arrays: Dict[str, np.ndarray]) -> DesignValidation:
+    """
+    Check packed config columns (see solar_engine.pack_configs) against physical
+    limits in one pass; NaN fails every range check and warns NON_FINITE
+    """
+    n = len(next(iter(arrays.values())))
+    return DesignValidation(
+        errors=_bitmask(ERROR_RULES, arrays, n),
+        warnings=_bitmask(WARNING_RULES, arrays, n)
+    )
@@ -0,0 +1,189 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Weather File Readers
+TMY3 / NSRDB CSV and EPW parsing into NumPy-backed WeatherData, with memory-mappable binary sidecars
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .weather_store import load_weather, save_weather
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = '.gwx'
+WEATHER_FILE_SUFFIXES = ('.csv', '.epw')
+
+# Source column name -> WeatherData series
+TMY3_COLUMNS = {
+    'GHI (W/m^2)': 'gh',
+    'DNI (W/m^2)': 'dn',
+    'DHI (W/m^2)': 'df',
+    'Dry-bulb (C)': 'tdry',
+    'Wspd (m/s)': 'wspd'
+}
+NSRDB_COLUMNS = {
+    'Month': 'month',
+    'Hour': 'hour',
+    'GHI': 'gh',
+    'DNI': 'dn',
+    'DHI': 'df',
+    'Temperature': 'tdry',
+    'Wind Speed': 'wspd'
+}
+# EPW data field positions (0-based)
+EPW_COLUMNS = {
+    1: 'month',
+    3: 'hour',
+    6: 'tdry',
+    13: 'gh',
+    14: 'dn',
+    15: 'df',
+    21: 'wspd'
+}
+EPW_HEADER_LINES = 8
+
+def _split(line: str) -> List[str]:
+    return [field.strip().strip('"') for field in line.split(',')]
+
+def _numeric_columns(lines: List[str], positions: List[int]) -> np.ndarray:
+    """Parse the given comma-separated fields of every data line in one C-level pass"""
+    return np.loadtxt(lines, delimiter=',', usecols=positions, dtype=np.float64, ndmin=2)
+
+def _positions(header: List[str], names: Dict[str, str], path) -> Dict[str, int]:
+    missing = [name for name in names if name not in header]
+    if missing:
+        raise ValueError(f"{path}: missing weather columns {missing}")
+    return {names[name]: header.index(name) for name in names}
+
+def _weather(lat, lon, tz, elev, year, series: Dict[str, np.ndarray]):
+    from .solar_engine import WeatherData
+    return WeatherData.from_arrays(lat=float(lat), lon=float(lon), tz=float(tz),
+                                   elev=float(elev), year=int(year), **series)
+
+def parse_tmy3(path: Union[str, Path]):
+    """
+    Read a TMY3 CSV (station metadata line, column header, hour-ending rows) or
+    an NSRDB/SAM CSV (metadata key line, value line, column header)
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        lines = f.read().splitlines()
+    first = _split(lines[0])
+
+    if first[0] == 'Source':
+        # NSRDB / SAM CSV: metadata names and values, then Year,Month,Day,Hour,... rows
+        meta = dict(zip(first, _split(lines[1])))
+        header = _split(lines[2])
+        data = [line for line in lines[3:] if line.strip()]
+        positions = _positions(header, NSRDB_COLUMNS, path)
+        values = _numeric_columns(data, list(positions.values()))
+        series = {name: values[:, i] for i, name in enumerate(positions)}
+        year = int(float(data[0].split(',')[header.index('Year')])) if 'Year' in header else 0
+        return _weather(meta['Latitude'], meta['Longitude'], meta['Time Zone'],
+                        meta.get('Elevation', 0.0), year, series)
+
+    # TMY3: USAF,Name,State,TZ,latitude,longitude,altitude
+    tz, lat, lon, elev = (float(v) for v in first[3:7])
+    header = _split(lines[1])
+    data = [line for line in lines[2:] if line.strip()]
+    positions = _positions(header, TMY3_COLUMNS, path)
+    values = _numeric_columns(data, list(positions.values()))
+    series = {name: values[:, i] for i, name in enumerate(positions)}
+
+    # Date (MM/DD/YYYY) and hour-ending Time (HH:MM, 01:00-24:00)
+    stamps = np.loadtxt(data, delimiter=',', usecols=(0, 1), dtype=str, ndmin=2)
+    series['month'] = np.char.partition(stamps[:, 0], '/')[:, 0].astype(np.float64)
+    series['hour'] = np.char.partition(stamps[:, 1], ':')[:, 0].astype(np.float64) - 1
+    year = int(stamps[0, 0].rsplit('/', 1)[-1])
+    return _weather(lat, lon, tz, elev, year, series)
+
+def parse_epw(path: Union[str, Path]):
+    """Read an EnergyPlus weather file (8 header lines, hour-ending data rows)"""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        lines = f.read().splitlines()
+    location = _split(lines[0])
+    if location[0].upper() != 'LOCATION':
+        raise ValueError(f"{path} is not an EPW file")
+    lat, lon, tz, elev = (float(v) for v in location[6:10])
+
+    data = [line for line in lines[EPW_HEADER_LINES:] if line.strip()]
+    values = _numeric_columns(data, list(EPW_COLUMNS))
+    series = {name: values[:, i] for i, name in enumerate(EPW_COLUMNS.values())}
+    series['hour'] = series['hour'] - 1
+    year = int(float(data[0].split(',', 1)[0]))
+    return _weather(lat, lon, tz, elev, year, series)
+
+def parse_weather_file(path: Union[str, Path]):
+    """Parse a .csv (TMY3 / NSRDB) or .epw file into a WeatherData"""
+    path = Path(path)
+    if path.suffix.lower() == '.epw':
+        return parse_epw(path)
+    if path.suffix.lower() == '.csv':
+        return parse_tmy3(path)
+    raise ValueError(f"Unsupported weather file type '{path.suffix}' ({path})")
+
+def weather_file_location(path: Union[str, Path]) -> Tuple[float, float]:
+    """Station (lat, lon) from a weather file's header lines, without parsing the hourly data"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        first = _split(f.readline())
+        if path.suffix.lower() == '.epw':
+            return float(first[6]), float(first[7])
+        if first[0] == 'Source':
+            meta = dict(zip(first, _split(f.readline())))
+            return float(meta['Latitude']), float(meta['Longitude'])
+        return float(first[4]), float(first[5])
+
+def sidecar_path(path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """Binary sidecar location: next to the source, or in cache_dir under a path-hashed name"""
+    path = Path(path)
+    if cache_dir is None:
+        return path.with_name(path.name + SIDECAR_SUFFIX)
+    digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"{path.stem}-{digest}{SIDECAR_SUFFIX}"
+
+def read_weather_file(path: Union[str, Path],
+                      cache_dir: Optional[Union[str, Path]] = None,
+                      mmap: bool = True):
+    """
+    Load a TMY3/NSRDB CSV or EPW file as a float32 WeatherData
+
+    The first read parses the text and writes a binary sidecar (weather_store
+    format); later reads memory-map the sidecar as long as it is newer than the
+    source, skipping text parsing entirely. A sidecar that cannot be written
+    (e.g. read-only library) is skipped with a warning; pass ``cache_dir`` to
+    keep sidecars elsewhere.
+    """
+    path = Path(path)
+    sidecar = sidecar_path(path, cache_dir)
+    if sidecar.exists() and sidecar.stat().st_mtime >= path.stat().st_mtime:
+        try:
+            return load_weather(sidecar, mmap=mmap)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable weather sidecar {sidecar}: {e}")
+
+    weather = parse_weather_file(path)
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        save_weather(weather, sidecar)
+    except OSError as e:
+        logger.warning(f"Could not write weather sidecar {sidecar}: {e}")
+        return weather
+    return load_weather(sidecar, mmap=mmap) if mmap else weather
+
+def load_weather_library(directory: Union[str, Path],
+                         cache_dir: Optional[Union[str, Path]] = None,
+                         mmap: bool = True) -> Dict[str, object]:
+    """Every weather file in a directory keyed by file stem (sidecars make repeat loads near-instant)"""
+    library = {}
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix.lower() not in WEATHER_FILE_SUFFIXES:
+            continue
+        try:
+            library[path.stem] = read_weather_file(path, cache_dir=cache_dir, mmap=mmap)
+        except Exception as e:
+            logger.warning(f"Skipping weather file {path}: {e}")
+    return library
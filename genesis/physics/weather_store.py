@@ -0,0 +1,102 @@
+"""
+PROJECT SOLAR: GENESIS OMEGA - Columnar Weather Store
+Compact binary WeatherData files that load as read-only memory maps
+"""
+
+import json
+import logging
+import struct
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WEATHER_COLUMNS = ('month', 'hour', 'dn', 'df', 'gh', 'wspd', 'tdry')
+WEATHER_MAGIC = b'GWXB\x00\x01\x00\x00'
+DATA_ALIGNMENT = 64
+
+def weather_columns(weather, dtype=np.float32) -> Dict[str, np.ndarray]:
+    """Hourly series of a WeatherData as NumPy arrays (no copy when already that dtype)"""
+    return {name: np.asarray(getattr(weather, name), dtype=dtype) for name in WEATHER_COLUMNS}
+
+def save_weather(weather, path: Union[str, Path], dtype: str = 'float32') -> Path:
+    """
+    Write a WeatherData as one binary file: magic, JSON header, then a
+    (columns x hours) block aligned for memory mapping
+    """
+    path = Path(path)
+    columns = weather_columns(weather, dtype=np.dtype(dtype))
+    n_hours = len(columns['gh'])
+    for name, column in columns.items():
+        if len(column) != n_hours:
+            raise ValueError(f"Weather column '{name}' has {len(column)} values, expected {n_hours}")
+
+    header = json.dumps({
+        'lat': float(weather.lat),
+        'lon': float(weather.lon),
+        'tz': float(weather.tz),
+        'elev': float(weather.elev),
+        'year': int(weather.year),
+        'n_hours': n_hours,
+        'columns': list(WEATHER_COLUMNS),
+        'dtype': np.dtype(dtype).str
+    }).encode()
+
+    prefix = len(WEATHER_MAGIC) + 4 + len(header)
+    padding = (-prefix) % DATA_ALIGNMENT
+    block = np.stack([columns[name] for name in WEATHER_COLUMNS])
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(WEATHER_MAGIC)
+        f.write(struct.pack('<I', len(header) + padding))
+        f.write(header + b' ' * padding)
+        f.write(np.ascontiguousarray(block).tobytes())
+    tmp_path.replace(path)
+    return path
+
+def read_weather_header(path: Union[str, Path]):
+    """Read the JSON header and data offset of a weather file"""
+    with open(path, 'rb') as f:
+        if f.read(len(WEATHER_MAGIC)) != WEATHER_MAGIC:
+            raise ValueError(f"{path} is not a GENESIS weather file")
+        (header_len,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_len))
+    return header, len(WEATHER_MAGIC) + 4 + header_len
+
+def load_weather(path: Union[str, Path], mmap: bool = True):
+    """
+    Load a weather file written by save_weather
+
+    With ``mmap=True`` every hourly series is a read-only view into one shared
+    memory map: nothing is copied into the process, and other processes that
+    map the same file share the same page-cache pages. Pickling the result
+    (e.g. to send it to a pool worker) sends only the path.
+    """
+    from .solar_engine import WeatherData
+
+    path = Path(path)
+    header, offset = read_weather_header(path)
+    shape = (len(header['columns']), header['n_hours'])
+    dtype = np.dtype(header['dtype'])
+
+    if mmap:
+        block = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+    else:
+        block = np.fromfile(path, dtype=dtype, count=shape[0] * shape[1], offset=offset).reshape(shape)
+        block.flags.writeable = False
+
+    series = {name: block[i] for i, name in enumerate(header['columns'])}
+    weather = WeatherData(
+        lat=header['lat'],
+        lon=header['lon'],
+        tz=header['tz'],
+        elev=header['elev'],
+        year=header['year'],
+        **series
+    )
+    if mmap:
+        weather._mmap_source = str(path.resolve())
+    return weather
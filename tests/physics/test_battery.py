@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from genesis.physics.battery import battery_columns, simulate_dispatch
+from genesis.physics.irradiance import hourly_index
+
+HOURS = 8760
+DAY, HOUR = hourly_index(HOURS)
+PV = np.clip(np.sin((HOUR - 6) / 12 * np.pi), 0, None) * 5.0
+LOAD = 0.4 + 1.2 * ((HOUR >= 17) & (HOUR < 22)) + 0.5 * ((HOUR >= 6) & (HOUR < 9))
+BATTERIES = ['tesla_powerwall_2', 'tesla_powerwall_2*2', 'enphase_iq_battery_5p']
+OVERNIGHT = (HOUR >= 22) | (HOUR < 6)
+
+
+def _dispatch(**kwargs):
+    columns = battery_columns(BATTERIES)
+    columns['reserve'] = np.array([0.0, 0.2, 0.1])
+    return simulate_dispatch(PV, LOAD, keep_hourly=True, **columns, **kwargs), columns
+
+
+@pytest.mark.parametrize('strategy', ['self_consumption', 'tou_arbitrage'])
+def test_energy_balance_and_soc_bounds(strategy):
+    result, columns = _dispatch(strategy=strategy, grid_charge_hours=OVERNIGHT)
+    eta = np.sqrt(columns['round_trip_efficiency'])
+
+    # AC side: everything that comes in goes out
+    supplied = PV.sum() + result.grid_import + result.battery_discharge
+    used = LOAD.sum() + result.grid_export + result.battery_charge
+    np.testing.assert_allclose(supplied, used)
+    # Battery side: stored energy is charge after losses less discharge before losses (starting at the reserve)
+    floor = columns['capacity_kwh'] * columns['reserve']
+    stored = result.hourly['soc'][:, -1] - floor
+    np.testing.assert_allclose(stored, result.battery_charge * eta - result.battery_discharge / eta, atol=1e-3)
+
+    soc = result.hourly['soc']
+    assert np.all(soc >= floor[:, None] - 1e-3)
+    assert np.all(soc <= columns['capacity_kwh'][:, None] + 1e-3)
+    assert np.all(result.hourly['grid_import'] >= -1e-6)
+    assert np.all(result.hourly['grid_export'] >= -1e-6)
+
+
+def test_self_consumption_never_imports_to_charge():
+    result, _ = _dispatch(strategy='self_consumption', grid_charge_hours=OVERNIGHT)
+    deficit = np.maximum(LOAD - PV, 0.0)
+    assert np.all(result.hourly['grid_import'] <= deficit + 1e-5)
+    assert np.all(result.self_consumption <= 1.0)
+    assert np.all(result.self_sufficiency <= 1.0)
+
+
+def test_grid_charge_hours_without_discharge_hours_do_not_discharge_while_charging():
+    result, _ = _dispatch(strategy='tou_arbitrage', grid_charge_hours=OVERNIGHT)
+    # Once the batteries are full, the small hours import exactly the load instead of cycling it through them
+    small_hours = (HOUR >= 2) & (HOUR < 6) & (DAY > 1)
+    deficit = np.maximum(LOAD - PV, 0.0)[small_hours]
+    np.testing.assert_allclose(result.hourly['grid_import'][:, small_hours], np.tile(deficit, (3, 1)), rtol=1e-5)
+    # The charged energy is spent outside the grid-charge window
+    assert np.all(result.battery_discharge > 0)
+
+
+def test_explicit_discharge_hours_are_respected():
+    peak = (HOUR >= 17) & (HOUR < 22)
+    result, _ = _dispatch(strategy='tou_arbitrage', grid_charge_hours=OVERNIGHT, discharge_hours=peak)
+    falling = np.diff(result.hourly['soc'], axis=1) < -1e-5
+    assert not falling[:, ~peak[1:]].any()
+
+
+def test_tou_arbitrage_needs_grid_charge_hours():
+    with pytest.raises(ValueError):
+        simulate_dispatch(PV, LOAD, capacity_kwh=10.0, power_kw=5.0, strategy='tou_arbitrage')
@@ -0,0 +1,65 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from genesis.physics.clipping import DEFAULT_DC_AC_RATIOS, clipping_sweep
+from genesis.physics.solar_engine import PhysicsEngine, SolarSystemConfig
+
+
+def _config(**overrides):
+    values = dict(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                  ground_coverage_ratio=0.4, dc_ac_ratio=1.9, inv_eff=96.0, losses=14.0)
+    values.update(overrides)
+    return SolarSystemConfig(**values)
+
+
+def _assert_recovers_clipping(sweep, design_ratio):
+    # A larger inverter (lower ratio) never loses energy...
+    order = np.argsort(sweep.dc_ac_ratio)
+    assert np.all(np.diff(sweep.annual_energy[order]) <= 1e-9)
+    # ...and below the design ratio it recovers what the design clips
+    design = np.argmin(np.abs(sweep.dc_ac_ratio - design_ratio))
+    assert sweep.clipped_energy[design] > 0
+    assert sweep.annual_energy[order[0]] > sweep.annual_energy[design]
+    assert sweep.clipped_energy[order[0]] < sweep.clipped_energy[design]
+
+
+def test_sweep_is_monotonic_in_ratio():
+    dc = np.concatenate([np.linspace(0.0, 8.0, 4000), np.zeros(4760)])
+    sweep = clipping_sweep(dc, system_capacity=6.6, inv_eff=96.0)
+    _assert_recovers_clipping(sweep, 1.5)
+    lowest = np.argmin(sweep.dc_ac_ratio)
+    assert sweep.annual_energy[lowest] + sweep.clipped_energy[lowest] == pytest.approx(dc.sum() * 0.96)
+
+
+def test_engine_sweep_recovers_clipped_energy_fallback():
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+    config = _config()
+
+    async def run():
+        results = await engine.run_solar_simulation(config)
+        return results, await engine.run_clipping_sweep(config)
+
+    results, sweep = asyncio.run(run())
+    _assert_recovers_clipping(sweep, config.dc_ac_ratio)
+    design = np.argmin(np.abs(sweep.dc_ac_ratio - config.dc_ac_ratio))
+    assert sweep.annual_energy[design] == pytest.approx(results.annual_energy, rel=1e-6)
+
+
+def test_engine_sweep_recovers_clipped_energy_pysam():
+    pytest.importorskip('PySAM')
+    engine = PhysicsEngine()
+    if engine.fallback_mode:
+        pytest.skip('PySAM not usable')
+    config = _config()
+
+    async def run():
+        results = await engine.run_solar_simulation(config)
+        return results, await engine.run_clipping_sweep(config, DEFAULT_DC_AC_RATIOS)
+
+    results, sweep = asyncio.run(run())
+    _assert_recovers_clipping(sweep, config.dc_ac_ratio)
+    design = np.argmin(np.abs(sweep.dc_ac_ratio - config.dc_ac_ratio))
+    assert sweep.annual_energy[design] == pytest.approx(results.annual_energy, rel=0.03)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from genesis.physics.ephemeris import EPHEMERIS_FIELDS, EphemerisCache
+
+HOURS = 48
+
+
+class _Compute:
+    """Stand-in position model that records the (snapped) locations it is asked for"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, lat, lon, tz):
+        self.calls.append((lat, lon, tz))
+        return {name: np.full(HOURS, lat + lon + tz + i, dtype=np.float64) for i, name in enumerate(EPHEMERIS_FIELDS)}
+
+
+def test_nearby_locations_share_one_snapped_entry():
+    cache, compute = EphemerisCache(grid=0.01), _Compute()
+    first = cache.get(-33.8712, 151.2068, 10.0, 2021, HOURS, compute)
+    second = cache.get(-33.8698, 151.2051, 10.0, 2021, HOURS, compute)
+
+    assert second is first
+    assert len(compute.calls) == 1
+    lat, lon, tz = compute.calls[0]
+    assert (lat, lon, tz) == (pytest.approx(-33.87), pytest.approx(151.21), 10.0)
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_grid_cells_timezones_and_years_stay_apart():
+    cache, compute = EphemerisCache(grid=0.01), _Compute()
+    cache.get(-33.87, 151.21, 10.0, 2021, HOURS, compute)
+    cache.get(-33.86, 151.21, 10.0, 2021, HOURS, compute)
+    cache.get(-33.87, 151.21, 11.0, 2021, HOURS, compute)
+    cache.get(-33.87, 151.21, 10.0, 2022, HOURS, compute)
+    assert len(compute.calls) == 4
+
+    coarse, coarse_compute = EphemerisCache(grid=0.5), _Compute()
+    coarse.get(-33.87, 151.21, 10.0, 2021, HOURS, coarse_compute)
+    coarse.get(-34.1, 150.9, 10.0, 2021, HOURS, coarse_compute)
+    assert coarse_compute.calls == [(-34.0, 151.0, 10.0)]
+
+
+def test_arrays_are_read_only_float32():
+    arrays = EphemerisCache().get(0.0, 0.0, 0.0, None, HOURS, _Compute())
+    assert set(arrays) == set(EPHEMERIS_FIELDS)
+    for array in arrays.values():
+        assert array.dtype == np.float32
+        assert not array.flags.writeable
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    compute = _Compute()
+    written = EphemerisCache(disk_dir=tmp_path).get(-33.87, 151.21, 10.0, 2021, HOURS, compute)
+
+    reopened = EphemerisCache(disk_dir=tmp_path)
+    restored = reopened.get(-33.87, 151.21, 10.0, 2021, HOURS, compute)
+    assert len(compute.calls) == 1
+    assert reopened.stats['disk_hits'] == 1
+    for name in EPHEMERIS_FIELDS:
+        np.testing.assert_array_equal(restored[name], written[name])
+        assert not restored[name].flags.writeable
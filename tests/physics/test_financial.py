@@ -0,0 +1,55 @@
+import numpy as np
+
+from genesis.physics.financial import IRR_BRACKET, irr
+
+
+def _bisection_irr(cash_flows, iterations=200):
+    """The previous solver: bisection on the NPV sign change over IRR_BRACKET"""
+    years = np.arange(cash_flows.shape[1])
+
+    def npv_at(rate):
+        return (cash_flows * (1 + rate)[:, None] ** -years).sum(axis=1)
+
+    lo = np.full(len(cash_flows), IRR_BRACKET[0])
+    hi = np.full(len(cash_flows), IRR_BRACKET[1])
+    f_lo = npv_at(lo)
+    valid = np.sign(f_lo) != np.sign(npv_at(hi))
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        f_mid = npv_at(mid)
+        same = np.sign(f_mid) == np.sign(f_lo)
+        lo, f_lo = np.where(same, mid, lo), np.where(same, f_mid, f_lo)
+        hi = np.where(same, hi, mid)
+    return np.where(valid, (lo + hi) / 2 * 100, np.nan)
+
+
+def _cash_flows():
+    rng = np.random.default_rng(11)
+    years = 26
+    # Solar-like: up-front cost, then degrading savings
+    cost = rng.uniform(5_000, 40_000, 200)
+    savings = rng.uniform(200, 8_000, 200)[:, None] * 0.995 ** np.arange(years - 1)
+    typical = np.concatenate([-cost[:, None], savings], axis=1)
+    edge_cases = np.array([
+        [-1000.0, 50.0] + [0.0] * (years - 2),  # IRR near the lower bracket
+        [-1000.0] + [990.0] * (years - 1),   # IRR near the upper bracket
+        [-1000.0] + [40.0] * (years - 1),    # IRR near zero
+        [1000.0] + [-80.0] * (years - 1),    # borrowing: sign-reversed flows
+        [100.0] * years,                     # no sign change
+        [-100.0] * years,                    # no sign change
+        [0.0] * years,                       # no cash flows at all
+    ])
+    return np.concatenate([typical, edge_cases])
+
+
+def test_irr_matches_bisection():
+    flows = _cash_flows()
+    expected = _bisection_irr(flows)
+    result = irr(flows)
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+    np.testing.assert_allclose(result[~np.isnan(expected)], expected[~np.isnan(expected)], atol=1e-6)
+
+
+def test_irr_is_nan_without_sign_change():
+    flows = np.array([[100.0] * 10, [-100.0] * 10, [0.0] * 10])
+    assert np.isnan(irr(flows)).all()
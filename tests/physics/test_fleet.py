@@ -0,0 +1,91 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+
+from genesis.physics.fleet import MANIFEST_NAME, FleetSimulator, read_fleet_results
+from genesis.physics.solar_engine import PhysicsEngine
+
+SITE = dict(system_capacity=6.6, module_type=0, array_type=0, azimuth=180.0, ground_coverage_ratio=0.4,
+            dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)
+
+
+def _sites(count, fail_after=None):
+    for i in range(count):
+        if fail_after is not None and i == fail_after:
+            raise RuntimeError("input interrupted")
+        yield {**SITE, 'site_id': f"site-{i}", 'tilt': 10.0 + i % 30}
+
+
+def _engine():
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+    return engine
+
+
+def test_chunks_are_written_as_npz_parts(tmp_path):
+    simulator = FleetSimulator(_engine(), tmp_path, chunk_size=40, output_format='npz')
+    manifest = asyncio.run(simulator.run(_sites(100)))
+
+    assert manifest['rows'] == 100
+    assert [part['rows'] for part in manifest['parts']] == [40, 40, 20]
+    assert sorted(p.name for p in tmp_path.glob('part-*.npz')) == [part['file'] for part in manifest['parts']]
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text()) == manifest
+
+    results = read_fleet_results(tmp_path)
+    assert list(results['site_id']) == [f"site-{i}" for i in range(100)]
+    expected = _engine().simulate_batch(
+        [simulator._site_config(site) for site in _sites(100)])
+    np.testing.assert_allclose(results['annual_energy'], expected.annual_energy)
+    np.testing.assert_allclose(results['monthly_energy_01'], expected.monthly_energy[:, 0])
+
+
+def test_resume_skips_committed_chunks(tmp_path):
+    engine = _engine()
+    with pytest.raises(RuntimeError):
+        asyncio.run(FleetSimulator(engine, tmp_path, chunk_size=40, output_format='npz').run(_sites(100, fail_after=90)))
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest['rows'] == 80 and len(manifest['parts']) == 2
+
+    simulated = []
+    simulator = FleetSimulator(engine, tmp_path, chunk_size=40, output_format='npz')
+    original = simulator._simulate_batch_chunk
+    simulator._simulate_batch_chunk = lambda chunk, weather: simulated.append(len(chunk)) or original(chunk, weather)
+    manifest = asyncio.run(simulator.run(_sites(100)))
+
+    assert simulated == [20]
+    assert manifest['rows'] == 100
+    assert list(read_fleet_results(tmp_path)['site_id']) == [f"site-{i}" for i in range(100)]
+
+
+def test_resume_rejects_a_different_chunk_size(tmp_path):
+    asyncio.run(FleetSimulator(_engine(), tmp_path, chunk_size=40, output_format='npz').run(_sites(50)))
+    with pytest.raises(ValueError):
+        asyncio.run(FleetSimulator(_engine(), tmp_path, chunk_size=25, output_format='npz').run(_sites(50)))
+
+
+def test_parquet_parts_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    asyncio.run(FleetSimulator(_engine(), tmp_path, chunk_size=40, output_format='parquet').run(_sites(60)))
+    results = read_fleet_results(tmp_path)
+    assert len(results['annual_energy']) == 60
+    assert sorted(p.suffix for p in tmp_path.glob('part-*')) == ['.parquet', '.parquet']
+
+
+def test_batch_chunks_run_off_the_event_loop(tmp_path):
+    simulator = FleetSimulator(_engine(), tmp_path, chunk_size=2000, output_format='npz')
+
+    async def run():
+        task = asyncio.create_task(simulator.run(_sites(4000)))
+        worst, last = 0.0, time.perf_counter()
+        while not task.done():
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            worst, last = max(worst, now - last), now
+        return await task, worst
+
+    manifest, worst = asyncio.run(run())
+    assert manifest['rows'] == 4000
+    assert worst < 0.2
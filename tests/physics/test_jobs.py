@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, replace
+
+import numpy as np
+
+from genesis.physics.jobs import JobQueue, JobStore
+from genesis.physics.solar_engine import PhysicsEngine, SolarSystemConfig
+
+MAX_LOOP_STALL = 0.2  # seconds
+
+
+def _configs(count):
+    base = SolarSystemConfig(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                             ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)
+    return [replace(base, tilt=10.0 + (i % 400) * 0.1) for i in range(count)]
+
+
+async def _max_stall_while(queue, job_id):
+    """Longest gap between event-loop ticks while the job runs"""
+    worst = 0.0
+    last = time.perf_counter()
+    while not queue.poll(job_id).done:
+        await asyncio.sleep(0.005)
+        now = time.perf_counter()
+        worst = max(worst, now - last)
+        last = now
+    return worst
+
+
+def test_batch_job_keeps_event_loop_responsive(tmp_path):
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+    configs = _configs(6000)
+
+    async def run():
+        queue = await JobQueue(engine, tmp_path / 'jobs.sqlite', max_workers=1).start()
+        try:
+            job_id = queue.submit('batch', configs=configs, chunk_size=2000)
+            stall = await _max_stall_while(queue, job_id)
+            return stall, queue.result(job_id), queue.poll(job_id)
+        finally:
+            await queue.shutdown()
+
+    stall, result, status = asyncio.run(run())
+    assert status.status == 'completed'
+    assert status.chunks_done == status.chunks_total == 3
+    assert stall < MAX_LOOP_STALL
+    expected = engine.simulate_batch(configs)
+    np.testing.assert_allclose(result.annual_energy, expected.annual_energy)
+
+
+def test_monte_carlo_job_keeps_event_loop_responsive(tmp_path):
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+
+    async def run():
+        queue = await JobQueue(engine, tmp_path / 'jobs.sqlite', max_workers=1).start()
+        try:
+            job_id = queue.submit('monte_carlo', config=_configs(1)[0], samples=1_000_000, seed=7)
+            stall = await _max_stall_while(queue, job_id)
+            return stall, queue.result(job_id)
+        finally:
+            await queue.shutdown()
+
+    stall, result = asyncio.run(run())
+    assert stall < MAX_LOOP_STALL
+    expected = asyncio.run(engine.run_monte_carlo(_configs(1)[0], samples=1_000_000, seed=7))
+    assert result.year_one == expected.year_one
+
+
+def test_fleet_job_keeps_event_loop_responsive(tmp_path):
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+    source = tmp_path / 'sites.ndjson'
+    source.write_text(''.join(
+        json.dumps({**asdict(config), 'site_id': f"site-{i}"}) + '\n' for i, config in enumerate(_configs(600))
+    ))
+
+    async def run():
+        queue = await JobQueue(engine, tmp_path / 'jobs.sqlite', max_workers=1).start()
+        try:
+            job_id = queue.submit('fleet', source=str(source), output_dir=str(tmp_path / 'fleet'),
+                                  chunk_size=300, output_format='npz', mode='simulate')
+            stall = await _max_stall_while(queue, job_id)
+            return stall, queue.result(job_id), queue.poll(job_id)
+        finally:
+            await queue.shutdown()
+
+    stall, manifest, status = asyncio.run(run())
+    assert status.status == 'completed', status.error
+    assert manifest['rows'] == 600
+    assert stall < MAX_LOOP_STALL
+
+
+def test_claim_hands_each_job_to_one_worker(tmp_path):
+    path = tmp_path / 'jobs.sqlite'
+    store = JobStore(path)
+    submitted = [store.add('simulate', {'n': i}, priority=0) for i in range(40)]
+    store.close()
+
+    def drain(_):
+        # One connection per worker, as separate processes sharing the database would have
+        worker = JobStore(path)
+        claimed = []
+        while (job := worker.claim()) is not None:
+            claimed.append(job[0])
+        worker.close()
+        return claimed
+
+    with ThreadPoolExecutor(4) as pool:
+        claimed = [job_id for jobs in pool.map(drain, range(4)) for job_id in jobs]
+    assert sorted(claimed) == sorted(submitted)
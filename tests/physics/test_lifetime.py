@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from genesis.physics.financial import evaluate_cash_flows
+from genesis.physics.solar_engine import BatchSimulationResults, SolarResults
+
+MONTHLY = [420.0, 480.0, 610.0, 720.0, 830.0, 880.0, 900.0, 860.0, 740.0, 600.0, 470.0, 410.0]
+PARAMS = {'degradation': 0.7, 'inverter_lifetime': 12, 'inverter_degradation': 0.3,
+          'inverter_replacement_downtime': 10.0, 'availability': 98.0}
+
+
+def _results():
+    return SolarResults(annual_energy=sum(MONTHLY), monthly_energy=list(MONTHLY), capacity_factor=15.0,
+                        lcoe_real=0.0, npv=0.0, payback_period=0.0, irr=0.0, ac_monthly=list(MONTHLY),
+                        poa_monthly=[0.0] * 12, success=True, messages=[])
+
+
+def test_scalar_lifetime_energy_feeds_evaluate_cash_flows():
+    lifetime = _results().lifetime_energy(PARAMS)
+    assert lifetime.shape == (1, 25, 12)
+    from_lifetime = evaluate_cash_flows(lifetime, 6.6, PARAMS)
+    from_year_one = evaluate_cash_flows(sum(MONTHLY), 6.6, PARAMS)
+    assert from_lifetime.npv.shape == (1,)
+    np.testing.assert_allclose(from_lifetime.npv, from_year_one.npv)
+    np.testing.assert_allclose(from_lifetime.lcoe_real, from_year_one.lcoe_real)
+
+
+def test_batch_lifetime_energy_matches_year_one_path():
+    monthly = np.array([MONTHLY, np.multiply(MONTHLY, 1.3)])
+    batch = BatchSimulationResults(
+        annual_energy=monthly.sum(axis=1), monthly_energy=monthly, capacity_factor=np.zeros(2),
+        lcoe_real=np.zeros(2), npv=np.zeros(2), payback_period=np.zeros(2), irr=np.zeros(2),
+        poa_monthly=np.zeros((2, 12)), messages=[])
+    lifetime = batch.lifetime_energy(PARAMS)
+    assert lifetime.shape == (2, 25, 12)
+    np.testing.assert_allclose(evaluate_cash_flows(lifetime, [6.6, 8.0], PARAMS).npv,
+                               evaluate_cash_flows(batch.annual_energy, [6.6, 8.0], PARAMS).npv)
+
+
+def test_first_year_is_year_one_energy_times_availability():
+    lifetime = _results().lifetime_energy({'availability': 98.0})
+    assert lifetime[0, 0].sum() == pytest.approx(sum(MONTHLY) * 0.98)
+    assert np.all(np.diff(lifetime[0].sum(axis=1)) < 0)
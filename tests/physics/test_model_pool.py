@@ -0,0 +1,43 @@
+import asyncio
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from genesis.physics.shading import SiteShading
+from genesis.physics.solar_engine import SHADING_SKIPPED_MESSAGE, PhysicsEngine, SolarSystemConfig
+
+pytest.importorskip('PySAM')
+
+BASE = SolarSystemConfig(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                         ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)
+
+
+def test_released_model_carries_no_outputs():
+    engine = PhysicsEngine()
+    asyncio.run(engine.run_solar_simulation(BASE))
+
+    with engine.model_pool.model(replace(BASE, tilt=40.0)) as model:
+        assert engine.model_pool.stats['reused'] == 1
+        assert model.Outputs.export() == {}
+        with pytest.raises(Exception):
+            model.Outputs.gen
+
+
+def test_reused_model_matches_a_fresh_one():
+    engine = PhysicsEngine()
+    first = asyncio.run(engine.run_solar_simulation(BASE))
+    second = asyncio.run(engine.run_solar_simulation(replace(BASE, tilt=40.0, azimuth=200.0)))
+    fresh = asyncio.run(PhysicsEngine().run_solar_simulation(replace(BASE, tilt=40.0, azimuth=200.0)))
+
+    assert engine.model_pool.stats['reused'] == 1
+    assert second.annual_energy != first.annual_energy
+    np.testing.assert_allclose(second.monthly_energy, fresh.monthly_energy)
+
+
+def test_shading_without_site_weather_is_skipped_with_a_message():
+    engine = PhysicsEngine()
+    shaded = asyncio.run(engine.run_solar_simulation(BASE, shading=SiteShading.from_horizon({0: 30.0, 180: 30.0})))
+    unshaded = asyncio.run(engine.run_solar_simulation(BASE))
+    assert SHADING_SKIPPED_MESSAGE in shaded.messages
+    assert shaded.annual_energy == pytest.approx(unshaded.annual_energy)
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from genesis.physics.solar_engine import PhysicsEngine, SolarSystemConfig
+
+NO_UNCERTAINTY = {'irradiance': 0.0, 'losses': 0.0, 'inv_eff': 0.0, 'degradation': 0.0}
+
+
+def _config(**overrides):
+    values = dict(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                  ground_coverage_ratio=0.4, dc_ac_ratio=1.9, inv_eff=96.0, losses=14.0)
+    values.update(overrides)
+    return SolarSystemConfig(**values)
+
+
+def test_simulator_gets_unclipped_dc():
+    engine = PhysicsEngine()
+    config = _config()
+    simulator = asyncio.run(engine.monte_carlo_simulator(config))
+    # A profile rebuilt from clipped AC would never reach above the inverter limit
+    peak_ac = simulator.dc_sorted[-1] * (1 - config.losses / 100) * (config.inv_eff / 100)
+    assert peak_ac > simulator.ac_rating
+
+
+def test_zero_uncertainty_reproduces_the_simulation():
+    engine = PhysicsEngine()
+    config = _config()
+
+    async def run():
+        results = await engine.run_solar_simulation(config)
+        return results, await engine.run_monte_carlo(config, samples=100, seed=1, uncertainty=NO_UNCERTAINTY)
+
+    results, monte_carlo = asyncio.run(run())
+    rel = 1e-6 if engine.fallback_mode else 0.03
+    assert monte_carlo.year_one['P50'] == pytest.approx(results.annual_energy, rel=rel)
+    assert monte_carlo.year_one['P99'] == pytest.approx(monte_carlo.year_one['P50'])
@@ -0,0 +1,41 @@
+import asyncio
+
+from genesis.physics.irradiance import synthetic_weather
+from genesis.physics.optimizer import DesignOptimizer, equator_facing_azimuth_bounds
+from genesis.physics.solar_engine import PhysicsEngine, SolarSystemConfig
+
+
+def _config(**overrides):
+    values = dict(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                  ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)
+    values.update(overrides)
+    return SolarSystemConfig(**values)
+
+
+def test_equator_facing_azimuth_bounds():
+    assert equator_facing_azimuth_bounds(35.0) == (90.0, 270.0)
+    assert equator_facing_azimuth_bounds(-33.86) == (-90.0, 90.0)
+
+
+def test_southern_hemisphere_optimum_faces_north():
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+    sydney = synthetic_weather(-33.86, 151.21, 10.0)
+
+    async def run():
+        north_facing = await engine.run_solar_simulation(_config(azimuth=0.0), sydney)
+        result = await engine.optimize_design(_config(), weather=sydney)
+        return north_facing, result
+
+    north_facing, result = asyncio.run(run())
+    azimuth = result.best_config.azimuth
+    assert 0.0 <= azimuth < 360.0
+    assert min(azimuth, 360.0 - azimuth) < 45.0
+    assert result.best_config.tilt > 10.0
+    assert result.best_results.annual_energy >= north_facing.annual_energy
+
+
+def test_explicit_bounds_are_kept():
+    optimizer = DesignOptimizer(PhysicsEngine(), bounds={'azimuth': (150.0, 210.0)})
+    sydney = synthetic_weather(-33.86, 151.21, 10.0)
+    assert optimizer.site_bounds(sydney) == {'azimuth': (150.0, 210.0)}
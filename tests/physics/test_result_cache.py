@@ -0,0 +1,70 @@
+from dataclasses import replace
+
+import numpy as np
+
+from genesis.physics.result_cache import LRUCache, SimulationResultCache, simulation_cache_key
+from genesis.physics.solar_engine import SolarResults, SolarSystemConfig
+
+CONFIG = SolarSystemConfig(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                           ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)
+
+
+def _results(annual=9000.0):
+    monthly = [annual / 12] * 12
+    return SolarResults(annual_energy=annual, monthly_energy=monthly, capacity_factor=15.6, lcoe_real=0.08,
+                        npv=np.float64(1234.5), payback_period=7.5, irr=0.11, ac_monthly=list(monthly),
+                        poa_monthly=[150.0] * 12, success=True, messages=['ok'])
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the oldest
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.get('b') is None
+    assert cache.stats == {'hits': 3, 'misses': 1, 'evictions': 1}
+
+
+def test_cache_key_ignores_int_float_spelling_and_tracks_the_design():
+    assert simulation_cache_key(CONFIG) == simulation_cache_key(replace(CONFIG, tilt=25))
+    assert simulation_cache_key(CONFIG) != simulation_cache_key(replace(CONFIG, tilt=26.0))
+    assert simulation_cache_key(CONFIG, mode='pysam') != simulation_cache_key(CONFIG, mode='fallback')
+    assert simulation_cache_key(CONFIG, financial_params={'a': 1}) != simulation_cache_key(CONFIG)
+
+
+def test_memory_hits_are_copies():
+    cache = SimulationResultCache(max_entries=4)
+    cache.put('k', _results())
+    first = cache.get('k')
+    first.monthly_energy[0] = -1.0
+    assert cache.get('k').monthly_energy[0] == 750.0
+
+
+def test_disk_tier_round_trips_after_memory_eviction(tmp_path):
+    cache = SimulationResultCache(max_entries=1, disk_dir=tmp_path)
+    cache.put('aa01', _results(9000.0))
+    cache.put('bb02', _results(8000.0))
+    assert cache.get_stats()['evictions'] == 1
+
+    restored = cache.get('aa01')
+    assert restored == _results(9000.0)
+    assert cache.stats['disk_hits'] == 1
+
+    # A fresh process sees the same entries
+    reopened = SimulationResultCache(max_entries=1, disk_dir=tmp_path)
+    assert reopened.get('bb02') == _results(8000.0)
+    assert reopened.get('cc03') is None
+
+
+def test_failed_results_and_unreadable_entries_are_skipped(tmp_path):
+    cache = SimulationResultCache(disk_dir=tmp_path)
+    cache.put('dd04', replace(_results(), success=False))
+    assert cache.get('dd04') is None
+
+    path = tmp_path / 'ee' / 'ee05.json'
+    path.parent.mkdir()
+    path.write_text('{not json')
+    assert cache.get('ee05') is None
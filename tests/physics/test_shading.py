@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from genesis.physics.shading import (SiteShading, ShadingCache, compute_shade_mask, horizon_sky_view,
+                                     row_diffuse_loss, row_shaded_fraction)
+
+
+def test_row_shading_matches_the_profile_angle_formula():
+    # Sun due south of a south-facing row: profile angle equals the elevation
+    shaded = row_shaded_fraction(np.array([20.0]), np.array([180.0]), tilt=30.0, azimuth=180.0, gcr=0.5)
+    expected = 1 - np.sin(np.radians(20)) / (0.5 * np.sin(np.radians(50)))
+    assert shaded[0] == pytest.approx(expected)
+    assert shaded[0] == pytest.approx(0.1070, abs=1e-4)
+
+
+def test_row_shading_edges():
+    elevation = np.array([-5.0, 1.0, 45.0, 89.0, 30.0])
+    azimuth = np.array([180.0, 180.0, 180.0, 180.0, 0.0])
+    shaded = row_shaded_fraction(elevation, azimuth, tilt=30.0, azimuth=180.0, gcr=0.5)
+    assert shaded[0] == 0.0      # below the horizon
+    assert shaded[1] > 0.9       # sun just up: almost the whole row is shaded
+    assert shaded[2] == 0.0      # high sun clears the row in front
+    assert shaded[3] == 0.0
+    assert shaded[4] == 0.0      # sun behind the array
+    assert np.all((shaded >= 0) & (shaded <= 1))
+
+    # Denser rows shade more; flat modules and zero GCR never shade
+    sparse = row_shaded_fraction(np.array([15.0]), np.array([180.0]), 30.0, 180.0, 0.3)
+    dense = row_shaded_fraction(np.array([15.0]), np.array([180.0]), 30.0, 180.0, 0.7)
+    assert dense[0] > sparse[0]
+    assert row_shaded_fraction(np.array([10.0]), np.array([180.0]), 0.0, 180.0, 0.5)[0] == 0.0
+    assert row_shaded_fraction(np.array([10.0]), np.array([180.0]), 30.0, 180.0, 0.0)[0] == 0.0
+
+
+def test_row_diffuse_loss_sanity_values():
+    assert row_diffuse_loss(0.0, 0.5) == 0.0
+    # Masking reaches 17 degrees at the bottom edge; the slant-height mean of sin^2(psi / 2) is ~0.6%
+    assert row_diffuse_loss(30.0, 0.4) == pytest.approx(0.0060, abs=2e-4)
+    assert 0 < row_diffuse_loss(30.0, 0.3) < row_diffuse_loss(30.0, 0.6) < row_diffuse_loss(60.0, 0.6) < 0.25
+
+
+def test_horizon_sky_view_sanity_values():
+    assert horizon_sky_view(SiteShading()) == 1.0
+    uniform = SiteShading.from_horizon({0: 10.0, 180: 10.0})
+    assert horizon_sky_view(uniform) == pytest.approx(1 - np.sin(np.radians(10)) ** 2)
+    # A ridge over half the sky blocks half as much
+    half = SiteShading.from_horizon({a: (20.0 if 90 <= a <= 270 else 0.0) for a in range(0, 360, 1)})
+    assert 1 - horizon_sky_view(half) == pytest.approx((np.sin(np.radians(20)) ** 2) / 2, rel=0.02)
+
+
+def test_horizon_interpolates_around_north():
+    shading = SiteShading.from_horizon({350: 20.0, 10: 0.0, 180: 0.0})
+    assert shading.horizon_at(np.array([0.0]))[0] == pytest.approx(10.0)
+    assert shading.horizon_at(np.array([355.0]))[0] == pytest.approx(15.0)
+
+
+def test_shade_mask_combines_horizon_and_rows():
+    position = SimpleNamespace(zenith=np.array([95.0, 85.0, 70.0, 40.0]), azimuth=np.array([180.0] * 4))
+    horizon = SiteShading.from_horizon({0: 0.0, 180: 10.0}, row_shading=False)
+    mask = compute_shade_mask(position, horizon, tilt=30.0, azimuth=180.0, gcr=0.5, array_type=0)
+    np.testing.assert_array_equal(mask.beam, [0.0, 0.0, 1.0, 1.0])
+    assert not mask.beam.flags.writeable
+
+    rows = SiteShading(row_shading=True)
+    fixed = compute_shade_mask(position, rows, tilt=30.0, azimuth=180.0, gcr=0.5, array_type=0)
+    tracker = compute_shade_mask(position, rows, tilt=30.0, azimuth=180.0, gcr=0.5, array_type=2)
+    assert fixed.beam[2] == pytest.approx(1 - row_shaded_fraction(np.array([20.0]), np.array([180.0]), 30, 180, 0.5)[0])
+    assert fixed.diffuse == pytest.approx(1 - row_diffuse_loss(30.0, 0.5))
+    np.testing.assert_array_equal(tracker.beam, [0.0, 1.0, 1.0, 1.0])
+    assert tracker.diffuse == 1.0
+
+
+def test_cache_reuses_masks_for_repeat_designs():
+    position = SimpleNamespace(zenith=np.array([70.0, 40.0]), azimuth=np.array([150.0, 200.0]))
+    cache = ShadingCache()
+    arrays = {'tilt': np.array([30.0, 30.0, 20.0]), 'azimuth': np.array([180.0] * 3),
+              'ground_coverage_ratio': np.array([0.5] * 3), 'array_type': np.array([0, 0, 0])}
+    beam, diffuse = cache.masks('site', position, SiteShading(), arrays)
+    assert beam.shape == (3, 2) and diffuse.shape == (3, 1)
+    np.testing.assert_array_equal(beam[0], beam[1])
+    assert cache.get_stats()['entries'] == 2
+    cache.masks('site', position, SiteShading(), arrays)
+    assert cache.get_stats()['hits'] == 2
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from genesis.physics.station_index import EARTH_RADIUS_KM, Station, StationIndex
+
+NSRDB = """Source,Location ID,City,State,Country,Latitude,Longitude,Time Zone,Elevation
+NSRDB,1,-,-,-,{lat},{lon},10,0
+Year,Month,Day,Hour,Minute,DNI,DHI,GHI,Wind Speed,Temperature
+2019,1,1,0,30,0,0,{gh},3.2,21.5
+"""
+
+
+def _haversine_km(lat, lon, lats, lons):
+    phi1, phi2 = np.radians(lat), np.radians(lats)
+    dphi, dlam = phi2 - phi1, np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _random_stations(count, seed):
+    rng = np.random.default_rng(seed)
+    # Uniform on the sphere, plus stations sitting on the poles and either side of the dateline
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+    lons = rng.uniform(-180, 180, count)
+    lats = np.r_[lats, 90.0, -90.0, 10.0, 10.0]
+    lons = np.r_[lons, 0.0, 0.0, 179.99, -179.99]
+    return [Station(f"s{i}", float(lat), float(lon), '') for i, (lat, lon) in enumerate(zip(lats, lons))]
+
+
+@pytest.mark.parametrize('cell_size', [None, 0.02, 0.5])
+def test_nearest_matches_brute_force(cell_size):
+    stations = _random_stations(3000, seed=11)
+    index = StationIndex(stations, cell_size=cell_size)
+    lats = np.array([s.lat for s in stations])
+    lons = np.array([s.lon for s in stations])
+
+    rng = np.random.default_rng(12)
+    queries = np.c_[np.degrees(np.arcsin(rng.uniform(-1, 1, 300))), rng.uniform(-180, 180, 300)]
+    queries = np.r_[queries, [[89.9, 45.0], [-89.95, -120.0], [10.0, 180.0], [10.0, -180.0], [0.0, 0.0]]]
+    for lat, lon in queries:
+        match = index.nearest(lat, lon)
+        distances = _haversine_km(lat, lon, lats, lons)
+        assert match.distance_km == pytest.approx(distances.min(), abs=1e-6), (lat, lon)
+        assert distances[int(match.station.station_id[1:])] == pytest.approx(distances.min(), abs=1e-6)
+
+
+def test_sparse_library_still_finds_a_far_station():
+    index = StationIndex([Station('perth', -31.95, 115.86, ''), Station('hobart', -42.88, 147.33, '')],
+                         cell_size=0.05)
+    match = index.nearest(51.5, -0.13)
+    assert match.station.station_id == 'perth'
+    assert match.distance_km == pytest.approx(_haversine_km(51.5, -0.13, -31.95, 115.86), rel=1e-9)
+
+
+def test_empty_index():
+    assert StationIndex([]).nearest(0.0, 0.0) is None
+
+
+def test_nearest_weather_from_a_directory(tmp_path):
+    for name, lat, lon, gh in (('sydney', -33.87, 151.21, 111), ('melbourne', -37.82, 144.98, 222)):
+        (tmp_path / f'{name}.csv').write_text(NSRDB.format(lat=lat, lon=lon, gh=gh))
+    (tmp_path / 'readme.txt').write_text('not a station')
+
+    index = StationIndex.from_directory(tmp_path, cache_dir=tmp_path / 'cache')
+    assert len(index) == 2
+    weather = index.nearest_weather(-34.4, 150.9)
+    assert weather.gh[0] == 111
+    assert index.nearest_weather(-34.4, 150.9) is weather
+    assert index.nearest_weather(-34.4, 150.9, max_distance_km=10.0) is None
@@ -0,0 +1,131 @@
+import asyncio
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from genesis.physics.result_cache import weather_digest
+from genesis.physics.solar_engine import PhysicsEngine, SolarResults, SolarSystemConfig, WeatherData
+from genesis.physics.surrogate import SURROGATE_MESSAGE, _SurrogateGroup, polynomial_features
+
+BASE = SolarSystemConfig(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                         ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)
+
+
+def _training_group(samples=80, noise=0.0, seed=3):
+    """Group of designs whose specific yield is an exact quadratic (plus optional noise)"""
+    rng = np.random.default_rng(seed)
+    group = _SurrogateGroup('polynomial', degree=2, max_samples=1000)
+    for _ in range(samples):
+        x = np.array([rng.uniform(10, 40), rng.uniform(150, 210), 0.4, rng.uniform(1.1, 1.3), 96.0, 14.0])
+        specific = 1500 - 0.2 * (x[0] - 28) ** 2 - 0.05 * (x[1] - 180) ** 2 + 30 * x[3]
+        specific *= 1 + noise * rng.standard_normal()
+        group.add(x, np.concatenate([np.full(12, specific / 12), np.full(12, 150.0)]))
+    return group
+
+
+def _engine():
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+    return engine
+
+
+def _designs(count, seed=1):
+    rng = np.random.default_rng(seed)
+    return [replace(BASE, tilt=float(rng.uniform(10, 40)), azimuth=float(rng.uniform(150, 210)),
+                    dc_ac_ratio=float(rng.uniform(1.1, 1.3))) for _ in range(count)]
+
+
+def test_polynomial_fit_recovers_an_exact_quadratic():
+    group = _training_group()
+    group.fit()
+    target, error = group.predict(np.array([30.0, 190.0, 0.4, 1.25, 96.0, 14.0]), margin=0.0)
+    assert target[:12].sum() == pytest.approx(1500 - 0.2 * 4 - 0.05 * 100 + 30 * 1.25)
+    assert error < 1e-8
+
+
+def test_leave_one_out_error_matches_refitting_without_each_sample():
+    group = _training_group(noise=0.01)
+    group.fit()
+    x, y = np.array(group.x), np.array(group.y)
+    z = (x - group.center) / group.scale
+    a = polynomial_features(z, group.terms)
+    annual = y[:, :12].sum(axis=1)
+    for i in (0, 17, 42):
+        keep = np.arange(len(x)) != i
+        coef = np.linalg.pinv(a[keep]) @ annual[keep]
+        assert group.loo[i] == pytest.approx(abs(annual[i] - a[i] @ coef) / annual[i], rel=1e-6)
+
+
+def test_hits_inside_the_envelope_and_simulates_outside():
+    engine = _engine()
+    surrogate = engine.enable_surrogate()
+
+    async def run():
+        for config in _designs(80):
+            await engine.run_solar_simulation(config)
+        inside = replace(BASE, tilt=27.3, azimuth=175.1)
+        return await engine.run_solar_simulation(inside), await engine.run_solar_simulation(replace(BASE, tilt=60.0))
+
+    hit, miss = asyncio.run(run())
+    assert hit.messages[0].startswith(SURROGATE_MESSAGE)
+    simulated = asyncio.run(_engine().run_solar_simulation(replace(BASE, tilt=27.3, azimuth=175.1)))
+    assert hit.annual_energy == pytest.approx(simulated.annual_energy, rel=0.02)
+    assert not any(SURROGATE_MESSAGE in message for message in miss.messages)
+    stats = surrogate.get_stats()
+    assert stats['outside_envelope'] >= 1
+    assert stats['samples'] == stats['observations']
+
+
+def _weather():
+    hours = 8760
+    return WeatherData.from_arrays(
+        -33.9, 151.2, 10.0, 50.0, 2020,
+        month=np.repeat(np.arange(1, 13), 730), hour=np.tile(np.arange(24), 365),
+        dn=np.full(hours, 500.0), df=np.full(hours, 100.0), gh=np.full(hours, 400.0),
+        wspd=np.full(hours, 2.0), tdry=np.full(hours, 20.0)
+    )
+
+
+def test_weather_digest_is_memoized_until_a_series_is_replaced():
+    weather = _weather()
+    digest = weather_digest(weather)
+    assert weather_digest(weather) == digest
+    original = weather.gh
+    weather.gh = original * 1.1
+    assert weather_digest(weather) != digest
+    weather.gh = original.copy()
+    assert weather_digest(weather) == digest
+
+
+def test_surrogate_is_keyed_by_weather():
+    engine = _engine()
+    engine.enable_surrogate()
+    weather = _weather()
+
+    async def run():
+        for config in _designs(80):
+            await engine.run_solar_simulation(config)
+        return await engine.run_solar_simulation(replace(BASE, tilt=27.3), weather)
+
+    result = asyncio.run(run())
+    assert not any(SURROGATE_MESSAGE in message for message in result.messages)
+
+
+def test_pysam_financial_requests_are_always_simulated():
+    pytest.importorskip('PySAM')
+    engine = PhysicsEngine()
+    surrogate = engine.enable_surrogate()
+    for config in _designs(80):
+        annual = 1400.0 * config.system_capacity
+        surrogate.observe(config, None, SolarResults(
+            annual_energy=annual, monthly_energy=[annual / 12] * 12, capacity_factor=0.0, lcoe_real=0.0,
+            npv=0.0, payback_period=0.0, irr=0.0, ac_monthly=[annual / 12] * 12, poa_monthly=[150.0] * 12,
+            success=True, messages=[]
+        ), 'pysam')
+
+    energy_only = asyncio.run(engine.run_solar_simulation(replace(BASE, tilt=27.3)))
+    financed = asyncio.run(engine.run_solar_simulation(replace(BASE, tilt=27.3),
+                                                       financial_params={'analysis_period': 25}))
+    assert energy_only.messages[0].startswith(SURROGATE_MESSAGE)
+    assert not any(SURROGATE_MESSAGE in message for message in financed.messages)
@@ -0,0 +1,121 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from genesis.physics.irradiance import hourly_index, month_of_hour
+from genesis.physics.solar_engine import PhysicsEngine, SolarSystemConfig
+from genesis.physics.tariff import (TARIFF_PRESETS, Tariff, TariffPeriod, bill_savings, compile_tariff,
+                                    evaluate_bills)
+
+HOURS = 8760
+DAY, HOUR = hourly_index(HOURS)
+# 2023-01-01 was a Sunday
+WEEKDAY = (DAY - 1 + 6) % 7
+CONFIG = SolarSystemConfig(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                           ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)
+LOAD = 0.4 + 1.2 * ((HOUR >= 17) & (HOUR < 22)) + 0.5 * ((HOUR >= 6) & (HOUR < 9))
+
+
+def test_tou_periods_wrap_midnight_and_respect_day_types():
+    tariff = Tariff('test', base_rate=0.30, periods=(
+        TariffPeriod('peak', 0.50, ((15, 21),), days='weekdays'),
+        TariffPeriod('overnight', 0.20, ((22, 7),)),
+    ))
+    compiled = compile_tariff(tariff, 2023)
+    peak = (HOUR >= 15) & (HOUR < 21) & (WEEKDAY < 5)
+    overnight = (HOUR >= 22) | (HOUR < 7)
+    np.testing.assert_array_equal(compiled.import_rate[peak], 0.50)
+    np.testing.assert_array_equal(compiled.import_rate[overnight], 0.20)
+    np.testing.assert_array_equal(compiled.import_rate[~peak & ~overnight], 0.30)
+    np.testing.assert_array_equal(compiled.period[peak], 0)
+
+    bills = evaluate_bills(compiled, np.ones(HOURS))
+    assert bills.annual[0] == pytest.approx(compiled.import_rate.sum())
+
+
+def test_seasonal_period_and_feed_in_override():
+    tariff = Tariff('test', base_rate=0.30, feed_in_rate=0.05, periods=(
+        TariffPeriod('summer_peak', 0.60, ((14, 20),), months=(12, 1, 2), feed_in_rate=0.10),
+    ))
+    compiled = compile_tariff(tariff, 2023)
+    summer_peak = (HOUR >= 14) & (HOUR < 20) & np.isin(month_of_hour(HOURS), (12, 1, 2))
+    np.testing.assert_array_equal(compiled.export_rate[summer_peak], 0.10)
+    np.testing.assert_array_equal(compiled.export_rate[~summer_peak], 0.05)
+
+    bills = evaluate_bills(compiled, np.zeros(HOURS), grid_export=np.ones(HOURS))
+    assert bills.feed_in_credit.sum() == pytest.approx(0.10 * summer_peak.sum() + 0.05 * (~summer_peak).sum())
+
+
+def test_demand_charge_bills_each_months_peak_in_the_window():
+    tariff = Tariff('test', base_rate=0.0, demand_charge=10.0, demand_hours=((15, 21),), demand_days='weekdays')
+    grid_import = np.ones(HOURS)
+    window = (HOUR >= 15) & (HOUR < 21) & (WEEKDAY < 5)
+    # A 9 kW spike outside the window must not count; a 4 kW one inside sets March's peak
+    grid_import[np.flatnonzero(~window & (month_of_hour(HOURS) == 3))[0]] = 9.0
+    grid_import[np.flatnonzero(window & (month_of_hour(HOURS) == 3))[5]] = 4.0
+
+    demand = evaluate_bills(tariff, grid_import, year=2023).demand[0]
+    expected = np.full(12, 10.0)
+    expected[2] = 40.0
+    np.testing.assert_allclose(demand, expected)
+
+
+def test_supply_charge_and_flat_tariff():
+    bills = evaluate_bills(Tariff.flat(0.25, daily_supply_charge=1.0), np.full(HOURS, 0.5))
+    assert bills.energy.sum() == pytest.approx(0.25 * 0.5 * HOURS)
+    assert bills.supply.sum() == pytest.approx(365.0)
+
+
+@pytest.mark.parametrize('name', sorted(TARIFF_PRESETS))
+def test_au_presets_compile_to_their_periods(name):
+    tariff = TARIFF_PRESETS[name]
+    compiled = compile_tariff(name, 2023)
+    rates = {tariff.base_rate} | {period.rate for period in tariff.periods}
+    assert set(np.unique(compiled.import_rate)) == rates
+    peak = tariff.periods[0]
+    assert peak.name == 'peak'
+    assert compiled.import_rate.max() == peak.rate
+    start, end = peak.hours[0]
+    hours = (HOUR >= start) & (HOUR < end)
+    if peak.days == 'weekdays':
+        hours &= WEEKDAY < 5
+    np.testing.assert_array_equal(compiled.import_rate[hours], peak.rate)
+    assert 0 < compiled.export_rate.max() < compiled.import_rate.min()
+
+
+def test_value_per_kwh_is_nan_without_generation():
+    savings = bill_savings('ausgrid_tou', LOAD, generation=np.zeros(HOURS))
+    assert savings.savings[0] == 0.0
+    assert np.isnan(savings.value_per_kwh[0])
+    savings = bill_savings('ausgrid_tou', LOAD, grid_import=LOAD, grid_export=np.zeros(HOURS))
+    assert np.isnan(savings.value_per_kwh[0])
+
+
+def test_arbitrage_skips_grid_charging_that_does_not_pay():
+    for name in TARIFF_PRESETS:
+        grid_charge, discharge = compile_tariff(name).arbitrage_hours(0.9)
+        assert not grid_charge.any(), name
+        assert discharge.all(), name
+
+    free_overnight = Tariff('free overnight', base_rate=0.30, feed_in_rate=0.05,
+                            periods=(TariffPeriod('free', 0.0, ((0, 6),)),))
+    grid_charge, discharge = compile_tariff(free_overnight).arbitrage_hours(0.9)
+    np.testing.assert_array_equal(grid_charge, HOUR < 6)
+    np.testing.assert_array_equal(discharge, HOUR >= 6)
+
+
+def test_tou_arbitrage_never_trails_self_consumption_on_presets():
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+
+    async def savings(tariff, strategy):
+        result = await engine.run_bill_savings(CONFIG, LOAD, tariff, battery='tesla_powerwall_2', strategy=strategy)
+        return float(result.savings[0])
+
+    for name in ('ausgrid_tou', 'victoria_tou'):
+        assert asyncio.run(savings(name, 'tou_arbitrage')) == pytest.approx(asyncio.run(savings(name, 'self_consumption')))
+
+    free_overnight = Tariff('free overnight', base_rate=0.30, feed_in_rate=0.05,
+                            periods=(TariffPeriod('free', 0.0, ((0, 6),)),))
+    assert asyncio.run(savings(free_overnight, 'tou_arbitrage')) > asyncio.run(savings(free_overnight, 'self_consumption'))
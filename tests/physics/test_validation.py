@@ -0,0 +1,65 @@
+import asyncio
+
+import numpy as np
+
+from genesis.physics.solar_engine import PhysicsEngine, SolarSystemConfig, pack_configs
+from genesis.physics.validation import DesignError, DesignWarning, validate_designs
+
+RANGE_FLAGS = {
+    'tilt': DesignError.TILT,
+    'azimuth': DesignError.AZIMUTH,
+    'inv_eff': DesignError.INV_EFF,
+}
+REFERENCE = dict(system_capacity=6.6, module_type=0, array_type=0, tilt=25.0, azimuth=180.0,
+                 ground_coverage_ratio=0.4, dc_ac_ratio=1.2, inv_eff=96.0, losses=14.0)
+
+
+def _arrays(**overrides):
+    return pack_configs([SolarSystemConfig(**{**REFERENCE, **overrides})])
+
+
+def test_reference_design_is_valid():
+    validation = validate_designs(_arrays())
+    assert validation.valid.all()
+    assert validation.warnings[0] == 0
+
+
+def test_nan_fails_its_range_check_and_warns_non_finite():
+    for field, flag in RANGE_FLAGS.items():
+        validation = validate_designs(_arrays(**{field: np.nan}))
+        assert validation.errors[0] == flag, field
+        assert validation.warnings[0] == DesignWarning.NON_FINITE, field
+
+
+def test_range_bounds():
+    for field, flag in RANGE_FLAGS.items():
+        assert validate_designs(_arrays(**{field: -1.0})).errors[0] == flag, field
+    assert validate_designs(_arrays(azimuth=360.0)).errors[0] == DesignError.AZIMUTH
+    assert validate_designs(_arrays(tilt=90.0)).errors[0] == 0
+
+
+def test_checks_beyond_the_original_rules_only_warn():
+    cases = [(DesignWarning.GROUND_COVERAGE, dict(ground_coverage_ratio=0.0)),
+             (DesignWarning.LOSSES, dict(losses=100.0)),
+             (DesignWarning.MODULE_TYPE, dict(module_type=3)),
+             (DesignWarning.ARRAY_TYPE, dict(array_type=5))]
+    for flag, overrides in cases:
+        validation = validate_designs(_arrays(**overrides))
+        assert validation.valid[0], overrides
+        assert validation.warnings[0] == flag, overrides
+
+    report = asyncio.run(PhysicsEngine().validate_system_design(SolarSystemConfig(**{**REFERENCE, 'losses': 100.0})))
+    assert report['valid']
+    assert report['warnings'] == ["System losses should be between 0 and 100%"]
+
+
+def test_sensitivity_reports_pruned_points():
+    engine = PhysicsEngine()
+    engine.fallback_mode = True
+    result = asyncio.run(engine.run_sensitivity_analysis(
+        SolarSystemConfig(**REFERENCE), {'tilt': (-30.0, 90.0)}, max_refinements=0
+    ))
+    assert [point['parameter_value'] for point in result['pruned']['tilt']] == [-30.0]
+    assert result['pruned']['tilt'][0]['errors'] == ["Tilt must be between 0 and 90 degrees"]
+    assert [point['parameter_value'] for point in result['sensitivities']['tilt']] == [0.0, 30.0, 60.0, 90.0]
+    assert result['evaluations']['pruned'] == 1
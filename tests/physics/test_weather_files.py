@@ -0,0 +1,119 @@
+import os
+
+import numpy as np
+import pytest
+
+from genesis.physics.weather_files import (load_weather_library, parse_weather_file, read_weather_file,
+                                           sidecar_path, weather_file_location)
+
+TMY3 = """722950,"LOS ANGELES INTL ARPT",CA,-8.0,33.933,-118.400,32
+Date (MM/DD/YYYY),Time (HH:MM),ETR (W/m^2),GHI (W/m^2),DNI (W/m^2),DHI (W/m^2),Dry-bulb (C),Wspd (m/s)
+01/01/1999,01:00,0,0,0,0,11.1,2.1
+01/01/1999,12:00,1100,540,810,95,19.4,3.6
+02/01/1999,24:00,0,0,0,0,9.8,1.0
+"""
+
+NSRDB = """Source,Location ID,City,State,Country,Latitude,Longitude,Time Zone,Elevation
+NSRDB,123456,-,-,-,-33.87,151.21,10,39
+Year,Month,Day,Hour,Minute,DNI,DHI,GHI,Wind Speed,Temperature
+2019,1,1,0,30,0,0,0,3.2,21.5
+2019,1,1,12,30,880,120,1010,4.1,28.0
+2019,12,31,23,30,0,0,0,2.5,22.0
+"""
+
+
+def _epw_row(year, month, day, hour, tdry, gh, dn, df, wspd):
+    fields = [str(year), str(month), str(day), str(hour), '60', 'flags'] + ['0'] * 29
+    fields[6], fields[13], fields[14], fields[15], fields[21] = str(tdry), str(gh), str(dn), str(df), str(wspd)
+    return ','.join(fields)
+
+
+EPW = '\n'.join(
+    ['LOCATION,Melbourne,VIC,AUS,RMY,948680,-37.82,144.98,10.0,31.0']
+    + [f'HEADER LINE {i}' for i in range(2, 9)]
+    + [_epw_row(2005, 1, 1, 1, 18.2, 0, 0, 0, 4.0),
+       _epw_row(2005, 1, 1, 13, 27.5, 980, 850, 140, 5.5),
+       _epw_row(2005, 12, 31, 24, 16.0, 0, 0, 0, 2.0)]
+) + '\n'
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_tmy3_columns_hours_and_station(tmp_path):
+    weather = parse_weather_file(_write(tmp_path, 'lax.csv', TMY3))
+    assert (weather.lat, weather.lon, weather.tz, weather.elev, weather.year) == (33.933, -118.4, -8.0, 32.0, 1999)
+    np.testing.assert_array_equal(weather.month, [1, 1, 2])
+    # Hour-ending 01:00-24:00 becomes hour-of-day 0-23
+    np.testing.assert_array_equal(weather.hour, [0, 11, 23])
+    np.testing.assert_allclose(weather.gh, [0, 540, 0])
+    np.testing.assert_allclose(weather.dn, [0, 810, 0])
+    np.testing.assert_allclose(weather.df, [0, 95, 0])
+    np.testing.assert_allclose(weather.tdry, [11.1, 19.4, 9.8], rtol=1e-6)
+    np.testing.assert_allclose(weather.wspd, [2.1, 3.6, 1.0], rtol=1e-6)
+    assert weather.gh.dtype == np.float32
+
+
+def test_nsrdb_metadata_and_reordered_columns(tmp_path):
+    weather = parse_weather_file(_write(tmp_path, 'sydney.csv', NSRDB))
+    assert (weather.lat, weather.lon, weather.tz, weather.elev, weather.year) == (-33.87, 151.21, 10.0, 39.0, 2019)
+    np.testing.assert_array_equal(weather.month, [1, 1, 12])
+    np.testing.assert_array_equal(weather.hour, [0, 12, 23])
+    np.testing.assert_allclose(weather.gh, [0, 1010, 0])
+    np.testing.assert_allclose(weather.dn, [0, 880, 0])
+    np.testing.assert_allclose(weather.tdry, [21.5, 28.0, 22.0])
+
+
+def test_epw_fields_and_hours(tmp_path):
+    weather = parse_weather_file(_write(tmp_path, 'melbourne.epw', EPW))
+    assert (weather.lat, weather.lon, weather.tz, weather.elev, weather.year) == (-37.82, 144.98, 10.0, 31.0, 2005)
+    np.testing.assert_array_equal(weather.month, [1, 1, 12])
+    np.testing.assert_array_equal(weather.hour, [0, 12, 23])
+    np.testing.assert_allclose(weather.gh, [0, 980, 0])
+    np.testing.assert_allclose(weather.dn, [0, 850, 0])
+    np.testing.assert_allclose(weather.df, [0, 140, 0])
+    np.testing.assert_allclose(weather.wspd, [4.0, 5.5, 2.0])
+
+
+def test_location_is_read_from_the_header_only(tmp_path):
+    assert weather_file_location(_write(tmp_path, 'lax.csv', TMY3)) == (33.933, -118.4)
+    assert weather_file_location(_write(tmp_path, 'sydney.csv', NSRDB)) == (-33.87, 151.21)
+    assert weather_file_location(_write(tmp_path, 'melbourne.epw', EPW)) == (-37.82, 144.98)
+
+
+def test_missing_columns_and_unknown_types_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match='missing weather columns'):
+        parse_weather_file(_write(tmp_path, 'broken.csv', TMY3.replace('Wspd (m/s)', 'Wind')))
+    with pytest.raises(ValueError):
+        parse_weather_file(_write(tmp_path, 'site.txt', TMY3))
+    with pytest.raises(ValueError):
+        parse_weather_file(_write(tmp_path, 'site.epw', NSRDB))
+
+
+def test_sidecar_is_reused_until_the_source_changes(tmp_path):
+    source = _write(tmp_path, 'sydney.csv', NSRDB)
+    first = read_weather_file(source)
+    sidecar = sidecar_path(source)
+    assert sidecar.exists()
+    assert first._mmap_source == str(sidecar.resolve())
+
+    second = read_weather_file(source)
+    np.testing.assert_array_equal(second.gh, first.gh)
+
+    source.write_text(NSRDB.replace('1010', '990'))
+    os.utime(source, (sidecar.stat().st_mtime + 10,) * 2)
+    assert read_weather_file(source).gh[1] == 990
+
+
+def test_library_keys_files_by_stem_and_skips_bad_ones(tmp_path):
+    _write(tmp_path, 'sydney.csv', NSRDB)
+    _write(tmp_path, 'melbourne.epw', EPW)
+    _write(tmp_path, 'broken.csv', 'nonsense\n')
+    _write(tmp_path, 'notes.txt', 'ignored')
+    library = load_weather_library(tmp_path, cache_dir=tmp_path / 'cache')
+    assert sorted(library) == ['melbourne', 'sydney']
+    assert len(list((tmp_path / 'cache').glob('*.gwx'))) == 2
+    assert not list(tmp_path.glob('*.gwx'))
@@ -0,0 +1,72 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from genesis.physics.solar_engine import WeatherData
+from genesis.physics.weather_store import (DATA_ALIGNMENT, WEATHER_COLUMNS, load_weather, read_weather_header,
+                                           save_weather)
+
+HOURS = 8760
+
+
+def _weather():
+    rng = np.random.default_rng(5)
+    return WeatherData.from_arrays(
+        -33.9, 151.2, 10.0, 50.0, 2021,
+        month=np.repeat(np.arange(1, 13), 730), hour=np.tile(np.arange(24), 365),
+        dn=rng.uniform(0, 900, HOURS), df=rng.uniform(0, 300, HOURS), gh=rng.uniform(0, 1000, HOURS),
+        wspd=rng.uniform(0, 10, HOURS), tdry=rng.uniform(-5, 40, HOURS)
+    )
+
+
+def test_memmap_load_matches_and_is_read_only(tmp_path):
+    weather = _weather()
+    path = save_weather(weather, tmp_path / 'site.gwx')
+    _, offset = read_weather_header(path)
+    assert offset % DATA_ALIGNMENT == 0
+
+    loaded = load_weather(path)
+    assert (loaded.lat, loaded.lon, loaded.tz, loaded.elev, loaded.year) == (-33.9, 151.2, 10.0, 50.0, 2021)
+    for name in WEATHER_COLUMNS:
+        series = getattr(loaded, name)
+        np.testing.assert_array_equal(series, getattr(weather, name))
+        assert isinstance(series.base, np.memmap)
+        assert not series.flags.writeable
+    with pytest.raises(ValueError):
+        loaded.gh[0] = 1.0
+
+
+def test_pickle_sends_the_path_and_reopens_the_map(tmp_path):
+    path = save_weather(_weather(), tmp_path / 'site.gwx')
+    loaded = load_weather(path)
+
+    payload = pickle.dumps(loaded)
+    assert len(payload) < 1024
+    assert str(path.resolve()).encode() in payload
+
+    restored = pickle.loads(payload)
+    assert restored._mmap_source == loaded._mmap_source
+    np.testing.assert_array_equal(restored.gh, loaded.gh)
+    assert isinstance(restored.gh.base, np.memmap)
+
+
+def test_in_memory_load_pickles_its_data(tmp_path):
+    path = save_weather(_weather(), tmp_path / 'site.gwx', dtype='float64')
+    loaded = load_weather(path, mmap=False)
+    assert loaded.gh.dtype == np.float64
+    assert not loaded.gh.flags.writeable
+    assert not hasattr(loaded, '_mmap_source')
+    assert len(pickle.dumps(loaded)) > HOURS * 8
+
+
+def test_rejects_foreign_files_and_ragged_columns(tmp_path):
+    foreign = tmp_path / 'foreign.gwx'
+    foreign.write_bytes(b'not a weather file')
+    with pytest.raises(ValueError):
+        load_weather(foreign)
+
+    weather = _weather()
+    weather.tdry = weather.tdry[:-1]
+    with pytest.raises(ValueError):
+        save_weather(weather, tmp_path / 'ragged.gwx')